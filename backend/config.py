@@ -117,6 +117,8 @@ class Settings(BaseSettings):
     claude_parsing_model: str = "gemini-3-pro-preview"
     parsing_cache_enabled: bool = True
     parsing_fallback_to_regex: bool = True
+    parsing_max_concurrent_llm: int = Field(default=4, ge=1, le=32)  # Parser LLM calls in flight at once
+    parsing_llm_timeout_s: float = Field(default=8.0, gt=0)  # Past this, fall back to regex parsing
     
     # Dynamic model selection
     enable_dynamic_models: bool = False  # Use OpenRouter to select best models
@@ -135,6 +137,7 @@ class Settings(BaseSettings):
     # Monitoring
     log_level: str = "INFO"
     structured_logging: bool = True
+    log_order_events: bool = True  # Disable to skip per-order info logs in high-frequency mode
     
     # Email notifications (optional)
     enable_email_notifications: bool = False
@@ -771,16 +771,36 @@ Be constructive and specific. Your critique helps improve overall decision quali
                 round_number=self.total_rounds,
                 include_previous_rounds=True,
             )
-            tasks.append(self._get_agent_vote(agent, market_context, discussion_text))
+            tasks.append(self._get_agent_vote_content(agent, market_context, discussion_text))
         
-        results = await asyncio.gather(*tasks, return_exceptions=True)
+        contents = await asyncio.gather(*tasks, return_exceptions=True)
+        
+        # Parse all votes with a single parser request
+        voted = [
+            (content, agent.name)
+            for agent, content in zip(self.agents, contents)
+            if not isinstance(content, Exception)
+        ]
+        if self.decision_parser is None:
+            self.decision_parser = await get_decision_parser()
+        
+        try:
+            parsed_votes = iter(await self.decision_parser.parse_agent_votes_batch(voted))
+        except Exception as e:
+            logger.error("agent_votes_parse_error", error=str(e))
+            parsed_votes = iter([e] * len(voted))
+        
+        results = [
+            content if isinstance(content, Exception) else next(parsed_votes)
+            for content in contents
+        ]
         
         # Process votes
         for agent, result in zip(self.agents, results):
             if isinstance(result, Exception):
                 logger.error("agent_vote_error", agent=agent.name, error=str(result))
                 # Default vote: hold
-                result = {"action": "hold", "confidence": 50}
+                result = {"action": "hold", "confidence": 50, "reasoning": f"Error: {str(result)}"}
             
             vote_action = VoteAction(result.get("action", "hold"))
             
@@ -893,13 +913,13 @@ Be respectful but express your true analysis. Provide your response and updated
             logger.error("agent_response_error", agent=agent.name, error=str(e))
             return {"content": f"Error: {str(e)}", "action": "hold", "message_type": "POSITION"}
     
-    async def _get_agent_vote(
+    async def _get_agent_vote_content(
         self,
         agent: Any,
         market_context: Dict[str, Any],
         discussion_history: str,
-    ) -> Dict[str, Any]:
-        """Get final vote from an agent."""
+    ) -> str:
+        """Get the raw final vote text from an agent (parsed in batch by the caller)."""
         prompt = f"""
 {agent._build_system_prompt()}
 
@@ -919,25 +939,13 @@ Confidence: [0-100]%
 Reasoning: [brief explanation]
 """
         
-        try:
-            response = await self.llm_client.call_agent(
-                model=agent.model,
-                messages=[{"role": "user", "content": prompt}],
-                temperature=0.5,
-            )
-            
-            content = self.llm_client.get_message_content(response)
-            
-            # Use intelligent parser for robust extraction
-            if self.decision_parser is None:
-                self.decision_parser = await get_decision_parser()
-            
-            parsed = await self.decision_parser.parse_agent_vote(content, agent.name)
-            
-            return parsed
-        except Exception as e:
-            logger.error("agent_vote_error", agent=agent.name, error=str(e))
-            return {"action": "hold", "confidence": 50, "reasoning": f"Error: {str(e)}"}
+        response = await self.llm_client.call_agent(
+            model=agent.model,
+            messages=[{"role": "user", "content": prompt}],
+            temperature=0.5,
+        )
+        
+        return self.llm_client.get_message_content(response)
     
     async def _invoke_mediator(
         self,
@@ -5,7 +5,9 @@ from sqlalchemy import create_engine, event, text
 from sqlalchemy.orm import sessionmaker, Session
 from sqlalchemy.exc import OperationalError
 from contextlib import contextmanager
+from decimal import Decimal
 from config import get_settings
+import orjson
 import structlog
 import time
 
@@ -18,6 +20,29 @@ MAX_OVERFLOW = 20
 POOL_TIMEOUT = 30
 POOL_RECYCLE = 3600  # Recycle connections after 1 hour
 
+def _json_default(value):
+    """Values orjson won't encode natively: Decimal and numpy objects it rejects."""
+    if isinstance(value, Decimal):
+        return float(value)
+    if hasattr(value, "tolist"):
+        return value.tolist()  # e.g. non-contiguous or float16 numpy arrays
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+
+def _json_serializer(value) -> str:
+    """
+    Encode JSON columns with orjson (str keys required by stdlib are coerced).
+    
+    Indicator and score payloads carry numpy scalars and arrays, so those are
+    serialized natively; the stdlib encoder accepted np.float64 as a float.
+    """
+    return orjson.dumps(
+        value,
+        default=_json_default,
+        option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY,
+    ).decode()
+
+
 # Create engine with connection pooling and retry logic
 engine = create_engine(
     settings.database_url,
@@ -27,6 +52,8 @@ engine = create_engine(
     pool_timeout=POOL_TIMEOUT,
     pool_recycle=POOL_RECYCLE,
     echo=settings.log_level == "DEBUG",
+    json_serializer=_json_serializer,
+    json_deserializer=orjson.loads,
     connect_args={
         "connect_timeout": 10,
         "options": "-c statement_timeout=30000"  # 30 second query timeout
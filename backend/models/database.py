@@ -73,8 +73,16 @@ class Trade(Base):
     decision_id = Column(Integer, ForeignKey("decisions.id"), nullable=True)
     
     __table_args__ = (
-        Index("idx_agent_created", "agent_name", "created_at"),
+        # Covers the per-agent 7-day window queries (context awareness groups by
+        # symbol and joins outcomes on id) so Postgres can answer from the index
+        Index("idx_agent_created", "agent_name", "created_at", postgresql_include=["symbol", "id"]),
         Index("idx_symbol_created", "symbol", "created_at"),
+        # Bayesian success stats: per agent/action executed trades in a date window.
+        # Covering: symbol (filter/group) and id (outcome join) come from the index too
+        Index(
+            "idx_agent_action_status_created", "agent_name", "action", "status", "created_at",
+            postgresql_include=["symbol", "id"],
+        ),
     )
 
 
@@ -2,15 +2,87 @@
 Alpaca Markets connector for live and paper trading.
 100% Free API - No subscription fees required.
 """
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, List, Tuple
 import asyncio
+import operator
+import time
 from config import get_settings
 import structlog
-from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception_type
+from tenacity import retry, stop_after_attempt, wait_random_exponential, retry_if_exception_type
 
 logger = structlog.get_logger()
 settings = get_settings()
 
+# Resolved once: skip building log kwargs (and float parsing) when filtered out
+_LOG_INFO = settings.log_level in ("DEBUG", "INFO")
+_LOG_ORDER_EVENTS = _LOG_INFO and settings.log_order_events
+
+# Response shaping: fields are pulled with precompiled itemgetters so the bulk
+# list comprehensions do one C-level tuple get per row instead of N lookups
+_POSITION_FLOAT_KEYS = (
+    "qty", "market_value", "cost_basis", "unrealized_pl",
+    "unrealized_plpc", "current_price", "avg_entry_price",
+)
+_position_floats = operator.itemgetter(*_POSITION_FLOAT_KEYS)
+
+_ASSET_KEYS = (
+    "symbol", "name", "exchange", "tradable",
+    "marginable", "shortable", "easy_to_borrow",
+)
+_asset_fields = operator.itemgetter(*_ASSET_KEYS)
+
+# Map period to Alpaca timeframe and bar limit
+_PERIOD_MAP: Dict[str, Tuple[str, int]] = {
+    "1d": ("1Day", 1),
+    "1w": ("1Day", 7),
+    "1m": ("1Day", 30),
+    "3m": ("1Day", 90),
+}
+_DEFAULT_PERIOD = _PERIOD_MAP["1m"]
+
+_BAR_PRICE_KEYS = ("open", "high", "low", "close")
+_bar_prices = operator.itemgetter("o", "h", "l", "c")
+
+
+def _shape_position(pos: Dict[str, Any]) -> Dict[str, Any]:
+    """Convert a raw Alpaca position JSON object to our position dict."""
+    shaped = dict(zip(_POSITION_FLOAT_KEYS, map(float, _position_floats(pos))))
+    shaped["symbol"] = pos["symbol"]
+    shaped["side"] = pos["side"]
+    return shaped
+
+
+def _shape_asset(asset: Dict[str, Any], asset_class: str) -> Dict[str, Any]:
+    """Convert a raw Alpaca asset JSON object to our asset dict."""
+    shaped = dict(zip(_ASSET_KEYS, _asset_fields(asset)))
+    shaped["asset_class"] = asset.get("class", asset_class)
+    return shaped
+
+
+def _shape_bar(bar: Dict[str, Any]) -> Dict[str, Any]:
+    """Convert a raw Alpaca bar JSON object to an OHLCV dict."""
+    shaped = dict(zip(_BAR_PRICE_KEYS, map(float, _bar_prices(bar))))
+    shaped["date"] = bar["t"][:10]
+    shaped["volume"] = int(bar["v"])
+    return shaped
+
+
+def _is_transient(error: Exception) -> bool:
+    """
+    Whether a connection error may heal on retry.
+    
+    Network failures and 5xx/429 responses qualify; bad credentials and other
+    4xx answers won't change on a retry.
+    """
+    status_code = getattr(error, "status_code", None)
+    if status_code is None:
+        # requests.HTTPError carries the status on its response
+        status_code = getattr(getattr(error, "response", None), "status_code", None)
+    if status_code is not None:
+        return status_code >= 500 or status_code == 429
+    # requests' ConnectionError/Timeout and socket errors are all OSErrors
+    return isinstance(error, OSError)
+
 
 class AlpacaConnectionError(Exception):
     """Raised when connection to Alpaca fails."""
@@ -28,33 +100,72 @@ class AlpacaConnector:
     MAX_RETRIES = 3
     RETRY_MIN_WAIT = 1
     RETRY_MAX_WAIT = 10
+    SNAPSHOT_BATCH_SIZE = 100  # Max symbols per /v2/stocks/snapshots request
+    ACCOUNT_CACHE_TTL = 2.0  # Seconds to reuse account/positions snapshots
+    ORDER_FILL_TIMEOUT = 30  # Seconds to wait for a market order to close
+    ORDER_POLL_INTERVAL = 1.0  # Seconds between closed-order polls
+    ORDER_POLL_LIMIT = 500  # Max closed orders returned per poll (Alpaca cap)
+    CLOSED_ORDER_STATUSES = frozenset({"filled", "canceled", "expired", "rejected", "replaced"})
+    HTTP_POOL_CONNECTIONS = 4  # Distinct hosts kept pooled (trading + data API)
+    HTTP_POOL_MAXSIZE = 32  # Keep-alive connections per host
     
     def __init__(self):
         self.api_key = settings.alpaca_api_key
         self.api_secret = settings.alpaca_api_secret
         self.base_url = settings.alpaca_base_url
+        self.is_paper = settings.is_paper_trading()  # Resolved once; mode can't change at runtime
         self.connected = False
         self.api = None
         self._connection_attempts = 0
+        # Serializes connect() so concurrent callers share a single REST client
+        self._connect_lock = asyncio.Lock()
+        # Short-lived cache for account/positions reads: key -> (expires_at, value)
+        self._cache: Dict[str, Tuple[float, Any]] = {}
+        # Order completion: one poller feeds closed orders into a queue and one
+        # dispatcher resolves the waiting place_order() futures
+        self._pending_orders: Dict[str, asyncio.Future] = {}
+        self._fill_events: asyncio.Queue = asyncio.Queue(maxsize=10000)
+        self._order_poller: Optional[asyncio.Task] = None
+        self._order_dispatcher: Optional[asyncio.Task] = None
+    
+    async def connect(self) -> bool:
+        """
+        Establish connection to Alpaca API.
+        
+        Idempotent: returns immediately when already connected, and concurrent
+        callers wait for the in-flight attempt instead of opening their own client.
+        """
+        if self.connected and self.api is not None:
+            return True
         
+        async with self._connect_lock:
+            # Another coroutine may have connected while we waited for the lock
+            if self.connected and self.api is not None:
+                return True
+            return await self._connect()
+    
+    # Jittered backoff so self-healing callers don't retry in lockstep;
+    # only transient failures are wrapped as AlpacaConnectionError and retried
     @retry(
-        stop=stop_after_attempt(3),
-        wait=wait_exponential(multiplier=1, min=1, max=10),
+        stop=stop_after_attempt(MAX_RETRIES),
+        wait=wait_random_exponential(multiplier=RETRY_MIN_WAIT, max=RETRY_MAX_WAIT),
+        retry=retry_if_exception_type((AlpacaConnectionError, asyncio.TimeoutError)),
         reraise=True
     )
-    async def connect(self) -> bool:
-        """Establish connection to Alpaca API with retry logic."""
-        if settings.is_paper_trading():
+    async def _connect(self) -> bool:
+        """Create the REST client and verify it, with retry logic."""
+        if self.is_paper:
             logger.info("alpaca_paper_trading_mode", message="Connecting to Alpaca Paper API")
         
+        from alpaca_trade_api import REST
+        
         try:
-            from alpaca_trade_api import REST
-            
             self.api = REST(
                 key_id=self.api_key,
                 secret_key=self.api_secret,
                 base_url=self.base_url,
             )
+            self._configure_http_pool()
             
             # Test connection by getting account info
             account = self.api.get_account()
@@ -62,14 +173,15 @@ class AlpacaConnector:
             self.connected = True
             self._connection_attempts = 0
             
-            logger.info(
-                "alpaca_connected",
-                base_url=self.base_url,
-                account_id=account.id,
-                status=account.status,
-                cash=float(account.cash),
-                portfolio_value=float(account.portfolio_value),
-            )
+            if _LOG_INFO:
+                logger.info(
+                    "alpaca_connected",
+                    base_url=self.base_url,
+                    account_id=account.id,
+                    status=account.status,
+                    cash=float(account.cash),
+                    portfolio_value=float(account.portfolio_value),
+                )
             return True
             
         except Exception as e:
@@ -80,14 +192,115 @@ class AlpacaConnector:
                 attempt=self._connection_attempts
             )
             self.connected = False
+            if not _is_transient(e):
+                raise  # Bad credentials, 4xx, programming errors: no retry
             raise AlpacaConnectionError(f"Failed to connect to Alpaca: {str(e)}")
     
     async def disconnect(self):
         """Disconnect from Alpaca API."""
         self.api = None
         self.connected = False
+        self._cache.clear()
+        for task in (self._order_poller, self._order_dispatcher):
+            if task and not task.done():
+                task.cancel()
+        self._order_poller = None
+        self._order_dispatcher = None
         logger.info("alpaca_disconnected")
     
+    def _configure_http_pool(self) -> None:
+        """
+        Size the REST client's keep-alive pool for concurrent requests.
+        
+        The client reuses one requests.Session, but its default adapter keeps
+        only 10 connections per host; snapshot fan-out and the order poller run
+        on worker threads and would otherwise re-handshake TLS on overflow.
+        """
+        session = getattr(self.api, "_session", None)
+        if session is None:
+            return
+        
+        from requests.adapters import HTTPAdapter
+        
+        adapter = HTTPAdapter(
+            pool_connections=self.HTTP_POOL_CONNECTIONS,
+            pool_maxsize=self.HTTP_POOL_MAXSIZE,
+        )
+        session.mount("https://", adapter)
+    
+    def _get_cached(self, key: str) -> Optional[Any]:
+        """Return a cached value if it has not expired."""
+        entry = self._cache.get(key)
+        if entry and entry[0] > time.monotonic():
+            return entry[1]
+        return None
+    
+    def _set_cached(self, key: str, value: Any) -> None:
+        """Cache a value for ACCOUNT_CACHE_TTL seconds."""
+        self._cache[key] = (time.monotonic() + self.ACCOUNT_CACHE_TTL, value)
+    
+    def _invalidate_account_cache(self) -> None:
+        """Drop cached account/positions so the next read hits the API."""
+        self._cache.pop("account", None)
+        self._cache.pop("positions", None)
+    
+    def _ensure_order_watchers(self) -> None:
+        """Start the shared order poller and dispatcher tasks if not running."""
+        if self._order_dispatcher is None or self._order_dispatcher.done():
+            self._order_dispatcher = asyncio.create_task(self._dispatch_order_updates())
+        if self._order_poller is None or self._order_poller.done():
+            self._order_poller = asyncio.create_task(self._poll_order_updates())
+    
+    async def _poll_order_updates(self) -> None:
+        """
+        Poll closed orders once per interval for all pending orders together.
+        
+        Replaces one get_order() request per pending order per second with a
+        single list_orders() request; exits once nothing is pending. When the
+        page comes back full, older closes may lie past it, so orders still
+        pending after the page are checked with get_order() instead.
+        """
+        while self._pending_orders:
+            await asyncio.sleep(self.ORDER_POLL_INTERVAL)
+            try:
+                orders = await asyncio.to_thread(
+                    self.api.list_orders,
+                    status='closed',
+                    limit=self.ORDER_POLL_LIMIT,
+                )
+            except Exception as e:
+                logger.warning("alpaca_order_poll_error", error=str(e))
+                continue
+            
+            closed = [order for order in orders if order.id in self._pending_orders]
+            
+            if len(orders) >= self.ORDER_POLL_LIMIT:
+                seen = {order.id for order in closed}
+                missing = [order_id for order_id in self._pending_orders if order_id not in seen]
+                fetched = await asyncio.gather(
+                    *(asyncio.to_thread(self.api.get_order, order_id) for order_id in missing),
+                    return_exceptions=True,
+                )
+                for order in fetched:
+                    if isinstance(order, Exception):
+                        logger.warning("alpaca_order_lookup_error", error=str(order))
+                    elif order.status in self.CLOSED_ORDER_STATUSES:
+                        closed.append(order)
+            
+            for order in closed:
+                try:
+                    self._fill_events.put_nowait(order)
+                except asyncio.QueueFull:
+                    break  # Remaining orders are picked up on the next poll
+    
+    async def _dispatch_order_updates(self) -> None:
+        """Drain closed-order events and complete the matching futures."""
+        while True:
+            order = await self._fill_events.get()
+            future = self._pending_orders.pop(order.id, None)
+            if future is not None and not future.done():
+                future.set_result(order)
+    
     async def place_order(
         self,
         symbol: str,
@@ -121,23 +334,40 @@ class AlpacaConnector:
                 time_in_force='day'
             )
             
-            logger.info(
-                "alpaca_order_submitted",
-                symbol=symbol,
-                action=action,
-                quantity=quantity,
-                order_id=order.id,
-                status=order.status,
-            )
+            # Balances and positions change as soon as the order is accepted
+            self._invalidate_account_cache()
+            
+            if _LOG_ORDER_EVENTS:
+                logger.info(
+                    "alpaca_order_submitted",
+                    symbol=symbol,
+                    action=action,
+                    quantity=quantity,
+                    order_id=order.id,
+                    status=order.status,
+                )
+            
+            # Wait for the shared watcher to report the order as closed
+            future = asyncio.get_running_loop().create_future()
+            self._pending_orders[order.id] = future
+            self._ensure_order_watchers()
+            
+            try:
+                order = await asyncio.wait_for(future, timeout=self.ORDER_FILL_TIMEOUT)
+            except asyncio.TimeoutError:
+                return {
+                    "status": "timeout",
+                    "error": f"Order did not fill within {self.ORDER_FILL_TIMEOUT} seconds",
+                    "order_id": order.id,
+                }
+            finally:
+                self._pending_orders.pop(order.id, None)
             
-            # Wait for order to fill (timeout after 30s)
-            for _ in range(30):
-                await asyncio.sleep(1)
-                order = self.api.get_order(order.id)
+            if order.status == 'filled':
+                self._invalidate_account_cache()
+                fill_price = float(order.filled_avg_price)
                 
-                if order.status == 'filled':
-                    fill_price = float(order.filled_avg_price)
-                    
+                if _LOG_ORDER_EVENTS:
                     logger.info(
                         "alpaca_order_filled",
                         symbol=symbol,
@@ -146,28 +376,20 @@ class AlpacaConnector:
                         price=fill_price,
                         order_id=order.id,
                     )
-                    
-                    return {
-                        "status": "filled",
-                        "symbol": symbol,
-                        "action": action,
-                        "quantity": float(order.filled_qty),
-                        "price": fill_price,
-                        "order_id": order.id,
-                        "is_paper": settings.is_paper_trading(),
-                    }
                 
-                elif order.status in ['canceled', 'rejected', 'expired']:
-                    return {
-                        "status": "error",
-                        "error": f"Order {order.status}",
-                        "order_id": order.id,
-                    }
+                return {
+                    "status": "filled",
+                    "symbol": symbol,
+                    "action": action,
+                    "quantity": float(order.filled_qty),
+                    "price": fill_price,
+                    "order_id": order.id,
+                    "is_paper": self.is_paper,
+                }
             
-            # Timeout
             return {
-                "status": "timeout",
-                "error": "Order did not fill within 30 seconds",
+                "status": "error",
+                "error": f"Order {order.status}",
                 "order_id": order.id,
             }
             
@@ -185,49 +407,81 @@ class AlpacaConnector:
     
     async def get_stock_price(self, symbol: str) -> Optional[Dict[str, Any]]:
         """Get real-time stock price from Alpaca."""
+        prices = await self.get_stock_prices([symbol])
+        return prices.get(symbol)
+    
+    async def get_stock_prices(self, symbols: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Get real-time prices for many stocks in as few requests as possible.
+        
+        Uses Alpaca's snapshot endpoint, which returns latest trade, latest quote
+        and previous daily bar for up to SNAPSHOT_BATCH_SIZE symbols per request.
+        
+        Args:
+            symbols: Stock symbols
+            
+        Returns:
+            Mapping of symbol to price data; symbols that failed are omitted
+        """
+        if not symbols:
+            return {}
+        
         try:
             if not self.connected:
                 await self.connect()
             
-            # Get latest trade
-            trade = self.api.get_latest_trade(symbol)
-            
-            # Get latest quote for additional info
-            quote = self.api.get_latest_quote(symbol)
-            
-            # Get previous close for change calculation
-            bars = self.api.get_bars(
-                symbol,
-                '1Day',
-                limit=2
-            ).df
-            
-            prev_close = float(bars['close'].iloc[-2]) if len(bars) >= 2 else float(trade.price)
-            current_price = float(trade.price)
+            chunks = [
+                symbols[i:i + self.SNAPSHOT_BATCH_SIZE]
+                for i in range(0, len(symbols), self.SNAPSHOT_BATCH_SIZE)
+            ]
             
-            return {
-                "symbol": symbol,
-                "price": current_price,
-                "change": current_price - prev_close,
-                "change_percent": ((current_price - prev_close) / prev_close) * 100,
-                "bid": float(quote.bid_price),
-                "ask": float(quote.ask_price),
-                "volume": int(trade.size),
-            }
+            # The REST client is blocking, so fan the chunks out on worker threads
+            responses = await asyncio.gather(
+                *[asyncio.to_thread(self.api.get_snapshots, chunk) for chunk in chunks]
+            )
             
         except Exception as e:
-            logger.error("alpaca_price_fetch_error", symbol=symbol, error=str(e))
-            return None
+            logger.error("alpaca_price_fetch_error", symbols=symbols, error=str(e))
+            return {}
+        
+        result = {}
+        for snapshots in responses:
+            for symbol, snapshot in snapshots.items():
+                try:
+                    trade = snapshot.latest_trade
+                    quote = snapshot.latest_quote
+                    prev_bar = snapshot.prev_daily_bar
+                    
+                    current_price = float(trade.price)
+                    prev_close = float(prev_bar.close) if prev_bar else current_price
+                    
+                    result[symbol] = {
+                        "symbol": symbol,
+                        "price": current_price,
+                        "change": current_price - prev_close,
+                        "change_percent": ((current_price - prev_close) / prev_close) * 100,
+                        "bid": float(quote.bid_price),
+                        "ask": float(quote.ask_price),
+                        "volume": int(trade.size),
+                    }
+                except Exception as e:
+                    logger.error("alpaca_price_fetch_error", symbol=symbol, error=str(e))
+        
+        return result
     
     async def get_account_info(self) -> Optional[Dict[str, Any]]:
-        """Get account information."""
+        """Get account information (cached for ACCOUNT_CACHE_TTL seconds)."""
+        cached = self._get_cached("account")
+        if cached is not None:
+            return cached
+        
         try:
             if not self.connected:
                 await self.connect()
             
             account = self.api.get_account()
             
-            return {
+            account_info = {
                 "account_id": account.id,
                 "status": account.status,
                 "cash": float(account.cash),
@@ -237,33 +491,29 @@ class AlpacaConnector:
                 "last_equity": float(account.last_equity),
                 "pattern_day_trader": account.pattern_day_trader,
             }
+            self._set_cached("account", account_info)
+            return account_info
             
         except Exception as e:
             logger.error("alpaca_account_fetch_error", error=str(e))
             return None
     
     async def get_positions(self) -> list:
-        """Get all open positions."""
+        """Get all open positions (cached for ACCOUNT_CACHE_TTL seconds)."""
+        cached = self._get_cached("positions")
+        if cached is not None:
+            return cached
+        
         try:
             if not self.connected:
                 await self.connect()
             
-            positions = self.api.list_positions()
+            # Raw JSON avoids wrapping every row in a Position entity
+            positions = self.api.get('/positions')
             
-            return [
-                {
-                    "symbol": pos.symbol,
-                    "qty": float(pos.qty),
-                    "side": pos.side,
-                    "market_value": float(pos.market_value),
-                    "cost_basis": float(pos.cost_basis),
-                    "unrealized_pl": float(pos.unrealized_pl),
-                    "unrealized_plpc": float(pos.unrealized_plpc),
-                    "current_price": float(pos.current_price),
-                    "avg_entry_price": float(pos.avg_entry_price),
-                }
-                for pos in positions
-            ]
+            result = [_shape_position(pos) for pos in positions]
+            self._set_cached("positions", result)
+            return result
             
         except Exception as e:
             logger.error("alpaca_positions_fetch_error", error=str(e))
@@ -300,24 +550,21 @@ class AlpacaConnector:
             if not self.connected:
                 await self.connect()
             
-            assets = self.api.list_assets(
-                status=status,
-                asset_class=asset_class
+            # Raw JSON skips Entity wrapping per row; tradable/fractionable are
+            # filtered below (`attributes` doesn't accept "fractionable")
+            assets = self.api.get(
+                '/assets',
+                {
+                    "status": status,
+                    "asset_class": asset_class,
+                },
             )
             
-            result = []
-            for asset in assets:
-                if asset.tradable and asset.fractionable:
-                    result.append({
-                        "symbol": asset.symbol,
-                        "name": asset.name,
-                        "exchange": asset.exchange,
-                        "asset_class": getattr(asset, 'asset_class', asset_class),
-                        "tradable": asset.tradable,
-                        "marginable": asset.marginable,
-                        "shortable": asset.shortable,
-                        "easy_to_borrow": asset.easy_to_borrow,
-                    })
+            result = [
+                _shape_asset(asset, asset_class)
+                for asset in assets
+                if asset["tradable"] and asset["fractionable"]
+            ]
             
             logger.info(
                 "alpaca_assets_fetched",
@@ -350,39 +597,23 @@ class AlpacaConnector:
             if not self.connected:
                 await self.connect()
             
-            # Map period to Alpaca timeframe and limit
-            period_map = {
-                "1d": ("1Day", 1),
-                "1w": ("1Day", 7),
-                "1m": ("1Day", 30),
-                "3m": ("1Day", 90),
-            }
+            timeframe, limit = _PERIOD_MAP.get(period, _DEFAULT_PERIOD)
             
-            timeframe, limit = period_map.get(period, ("1Day", 30))
-            
-            # Get bars from Alpaca
-            bars = self.api.get_bars(
+            # Iterate raw bar JSON directly; building a DataFrame via .df only
+            # to flatten it back into dicts dominated the cost for small windows
+            bars = self.api.get_bars_iter(
                 symbol,
                 timeframe,
-                limit=limit
-            ).df
+                limit=limit,
+                raw=True
+            )
+            
+            result = [_shape_bar(bar) for bar in bars]
             
-            if bars.empty:
+            if not result:
                 logger.warning("alpaca_no_historical_data", symbol=symbol, period=period)
                 return []
             
-            # Convert DataFrame to list of dicts
-            result = []
-            for index, row in bars.iterrows():
-                result.append({
-                    "date": index.strftime("%Y-%m-%d"),
-                    "open": float(row['open']),
-                    "high": float(row['high']),
-                    "low": float(row['low']),
-                    "close": float(row['close']),
-                    "volume": int(row['volume']),
-                })
-            
             logger.info(
                 "alpaca_historical_fetched",
                 symbol=symbol,
@@ -407,7 +638,12 @@ _alpaca_connector: Optional[AlpacaConnector] = None
 
 
 def get_alpaca_connector() -> AlpacaConnector:
-    """Get Alpaca connector instance."""
+    """
+    Get Alpaca connector instance.
+    
+    Construction is synchronous, so it cannot interleave with other coroutines;
+    connection races are handled by the lock inside AlpacaConnector.connect().
+    """
     global _alpaca_connector
     if _alpaca_connector is None:
         _alpaca_connector = AlpacaConnector()
@@ -2,15 +2,265 @@
 Binance connector for cryptocurrency spot trading.
 Supports both testnet (paper trading) and production.
 """
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Callable, Awaitable, Tuple
 import asyncio
+from bisect import bisect_left, bisect_right
+import hashlib
+import heapq
+import hmac
+import time
+import uuid
+import httpx
+import numpy as np
+import orjson
 from config import get_settings
+from services.cache_utils import single_flight
 import structlog
 from tenacity import retry, stop_after_attempt, wait_exponential
 
 logger = structlog.get_logger()
 settings = get_settings()
 
+# Stablecoins counted 1:1 as USDT value
+_STABLES = frozenset({"USDT", "BUSD", "USDC", "DAI"})
+
+
+def _summarize_balances(balances: List[Dict[str, str]]) -> tuple:
+    """
+    Parse Binance balances in one vectorized pass.
+    
+    Binance returns an entry for every listed asset (thousands, nearly all
+    zero), so free/locked are converted as arrays rather than per entry.
+    
+    Returns:
+        ([(asset, free, locked, total), ...] for non-zero balances,
+         summed total of _STABLES assets)
+    """
+    if not balances:
+        return [], 0.0
+    
+    free = np.array([b['free'] for b in balances], dtype=np.float64)
+    locked = np.array([b['locked'] for b in balances], dtype=np.float64)
+    total = free + locked
+    
+    holdings = [
+        (balances[i]['asset'], float(free[i]), float(locked[i]), float(total[i]))
+        for i in np.flatnonzero(total > 0)
+    ]
+    stable_total = sum(t for asset, _, _, t in holdings if asset in _STABLES)
+    
+    return holdings, stable_total
+
+
+def _find_walls(
+    levels: np.ndarray,
+    threshold: float,
+    total_volume: float,
+    wall_type: str
+) -> List[Dict[str, Any]]:
+    """Return order-book levels whose volume exceeds threshold, in book order."""
+    walls = levels[levels[:, 1] > threshold]
+    return [
+        {
+            "price": float(price),
+            "volume": float(volume),
+            "percent_of_total": round(float(volume / total_volume) * 100, 2),
+            "type": wall_type,
+        }
+        for price, volume in walls
+    ]
+
+
+# Funding-rate bands, ascending. Each band is closed toward zero, e.g. exactly
+# 0.0005 is still neutral and exactly -0.001 is only "bearish"
+_FUNDING_THRESHOLDS = (-0.001, -0.0005, 0.0005, 0.001)
+_FUNDING_BANDS = (
+    ("extreme_bearish", "caution_shorts", "High negative funding - shorts may be overextended"),
+    ("bearish", "neutral", "Moderate negative funding - slight bearish bias"),
+    ("neutral", "neutral", "Neutral funding - balanced market"),
+    ("bullish", "neutral", "Moderate positive funding - slight bullish bias"),
+    ("extreme_bullish", "caution_longs", "High positive funding - longs may be overextended"),
+)
+
+# Funding settles every 8 hours (3x daily); annualize and express as percent
+_ANNUALIZED_PERCENT_FACTOR = 3 * 365 * 100
+
+
+def _classify_funding(funding_rate: float) -> tuple:
+    """Interpret a funding rate as (sentiment, signal, interpretation)."""
+    search = bisect_left if funding_rate > 0 else bisect_right
+    return _FUNDING_BANDS[search(_FUNDING_THRESHOLDS, funding_rate)]
+
+
+def _build_funding_record(symbol: str, data: Dict[str, Any]) -> Dict[str, Any]:
+    """Build the funding-rate result for one raw premiumIndex entry."""
+    funding_rate = float(data.get("lastFundingRate", 0) or 0)
+    
+    sentiment, signal, interpretation = _classify_funding(funding_rate)
+    
+    return {
+        "symbol": symbol,
+        "funding_rate": funding_rate,
+        "funding_rate_percent": round(funding_rate * 100, 4),
+        "annualized_rate_percent": round(funding_rate * _ANNUALIZED_PERCENT_FACTOR, 2),
+        "mark_price": float(data.get("markPrice", 0)),
+        "index_price": float(data.get("indexPrice", 0)),
+        "next_funding_time": data.get("nextFundingTime", 0),
+        "sentiment": sentiment,
+        "signal": signal,
+        "interpretation": interpretation,
+    }
+
+
+def _depth_weight(limit: int) -> int:
+    """Request weight of GET /api/v3/depth for a given limit."""
+    if limit <= 100:
+        return 5
+    if limit <= 500:
+        return 25
+    if limit <= 1000:
+        return 50
+    return 250
+
+
+def _is_service_failure(error: Exception) -> bool:
+    """
+    Whether an error reflects Binance being unavailable or throttling us.
+    
+    Client errors (bad symbol, insufficient balance, ...) say nothing about
+    service health and must not trip the circuit breaker.
+    """
+    status_code = getattr(error, "status_code", None)
+    if status_code is None:
+        # Exchange rejections (BinanceOrderException) carry a code; bare errors are network-level
+        return not hasattr(error, "code")
+    return status_code >= 500 or status_code in (418, 429)
+
+
+class _TokenBucket:
+    """Async token bucket sized to Binance's per-minute request weight budget."""
+    
+    __slots__ = ("capacity", "rate", "tokens", "updated_at", "lock")
+    
+    def __init__(self, capacity: int, per_seconds: float = 60.0):
+        self.capacity = capacity
+        self.rate = capacity / per_seconds
+        self.tokens = float(capacity)
+        self.updated_at = time.monotonic()
+        self.lock = asyncio.Lock()
+    
+    async def acquire(self, weight: int = 1) -> None:
+        """Wait until `weight` tokens are available, then take them."""
+        async with self.lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+                self.updated_at = now
+                if self.tokens >= weight:
+                    self.tokens -= weight
+                    return
+                # Delay rather than fire-and-fail; holding the lock keeps FIFO order
+                await asyncio.sleep((weight - self.tokens) / self.rate)
+
+
+class _CircuitBreaker:
+    """
+    Closed/open/half-open breaker.
+    
+    Opens after `failure_threshold` consecutive service failures, rejects calls
+    for `reset_timeout` seconds, then lets one trial call through.
+    """
+    
+    __slots__ = ("failure_threshold", "reset_timeout", "failures", "opened_at", "trial_in_flight")
+    
+    def __init__(self, failure_threshold: int, reset_timeout: float):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self.trial_in_flight = False
+    
+    def allow(self) -> Tuple[bool, bool]:
+        """
+        Whether a call may proceed right now, and whether it holds the probe slot.
+        
+        The probe holder (and only it) must call release_trial() when done.
+        """
+        if self.opened_at is None:
+            return True, False
+        if time.monotonic() - self.opened_at < self.reset_timeout or self.trial_in_flight:
+            return False, False
+        self.trial_in_flight = True  # Half-open: one probe call
+        return True, True
+    
+    def record_success(self) -> None:
+        self.failures = 0
+        self.opened_at = None
+    
+    def record_failure(self) -> None:
+        self.failures += 1
+        if self.opened_at is not None or self.failures >= self.failure_threshold:
+            if self.opened_at is None:
+                logger.warning("binance_circuit_opened", failures=self.failures)
+            self.opened_at = time.monotonic()
+    
+    def release_trial(self) -> None:
+        """Free the probe slot once the probe call has finished, however it ended."""
+        self.trial_in_flight = False
+
+
+class _LocalOrderBook:
+    """Order book for one symbol, maintained from the @depth diff stream."""
+    
+    __slots__ = ("symbol", "bids", "asks", "last_update_id", "synced", "task", "snapshot_task")
+    
+    def __init__(self, symbol: str):
+        self.symbol = symbol
+        self.bids: Dict[float, float] = {}
+        self.asks: Dict[float, float] = {}
+        self.last_update_id = 0
+        self.synced = False
+        self.task: Optional[asyncio.Task] = None
+        self.snapshot_task: Optional[asyncio.Future] = None  # REST seed fetch in flight
+    
+    def apply_snapshot(self, snapshot: Dict[str, Any]) -> None:
+        """Replace the book with a REST depth snapshot."""
+        self.bids = {float(price): float(qty) for price, qty in snapshot["bids"]}
+        self.asks = {float(price): float(qty) for price, qty in snapshot["asks"]}
+        self.last_update_id = snapshot["lastUpdateId"]
+    
+    def apply_diff(self, event: Dict[str, Any]) -> bool:
+        """
+        Apply one diff event (U = first update id, u = last update id).
+        
+        Returns False if the event leaves a gap after the last applied update,
+        meaning the book must be resynced.
+        """
+        if event["u"] <= self.last_update_id:
+            return True  # Already covered by the snapshot
+        if event["U"] > self.last_update_id + 1:
+            return False
+        
+        for levels, updates in ((self.bids, event["b"]), (self.asks, event["a"])):
+            for price, qty in updates:
+                qty = float(qty)
+                if qty == 0:
+                    levels.pop(float(price), None)
+                else:
+                    levels[float(price)] = qty
+        
+        self.last_update_id = event["u"]
+        return True
+    
+    def top(self, depth: int) -> tuple:
+        """Best `depth` levels per side as (N, 2) [price, volume] arrays, best first."""
+        bids = heapq.nlargest(depth, self.bids.items())
+        asks = heapq.nsmallest(depth, self.asks.items())
+        return (
+            np.array(bids, dtype=np.float64).reshape(-1, 2),
+            np.array(asks, dtype=np.float64).reshape(-1, 2),
+        )
+
 
 class BinanceConnectionError(Exception):
     """Raised when connection to Binance fails."""
@@ -28,6 +278,36 @@ class BinanceConnector:
     MAX_RETRIES = 3
     RETRY_MIN_WAIT = 1
     RETRY_MAX_WAIT = 10
+    FAPI_BASE_URL = "https://fapi.binance.com"  # Futures data is always Production
+    TICKER_STREAM_URL = "wss://stream.binance.com:9443/ws/!ticker@arr"
+    TICKER_MAX_AGE = 10.0  # Seconds before a streamed ticker falls back to REST
+    STREAM_MAX_BACKOFF = 60  # Max seconds between stream reconnect attempts
+    TICKER_FETCH_CONCURRENCY = 10  # Parallel REST ticker requests (Binance weight limits)
+    WS_API_URL = "wss://ws-api.binance.com:443/ws-api/v3"
+    WS_API_TESTNET_URL = "wss://ws-api.testnet.binance.vision/ws-api/v3"
+    WS_API_TIMEOUT = 10  # Seconds to wait for a WebSocket API response
+    DEPTH_STREAM_BASE_URL = "wss://stream.binance.com:9443/ws"
+    DEPTH_SNAPSHOT_LIMIT = 1000  # Levels in the seeding REST snapshot
+    MAX_DEPTH_STREAMS = 20  # Symbols with live local books; others use REST
+    REQUEST_WEIGHT_PER_MINUTE = 1200  # Conservative share of Binance's REST weight limit
+    BREAKER_FAILURE_THRESHOLD = 5  # Consecutive service failures before opening
+    BREAKER_RESET_TIMEOUT = 30  # Seconds the breaker stays open before a probe
+    HEALTHCHECK_TTL = 5  # Seconds a successful execution-client call vouches for connectivity
+    FUNDING_RATE_TTL = 60  # Seconds; funding only settles every 8 hours
+    ORDER_BOOK_TTL = 2  # Seconds; books move fast but agents re-ask within a turn
+    EXCHANGE_INFO_TTL = 3600  # Seconds; symbol rules change on the order of hours
+    TRADABLE_PAIRS_TTL = 900  # Seconds to reuse the filtered USDT pair list
+    
+    # Fixed attribute set: one long-lived instance, no per-instance __dict__
+    __slots__ = (
+        "api_key", "api_secret", "testnet", "connected", "client", "data_client",
+        "_connection_attempts", "_connect_lock", "_fapi_client",
+        "_ticker_cache", "_ticker_task", "_inflight", "_response_cache",
+        "_ws_api", "_ws_api_task", "_ws_api_lock", "_ws_api_pending",
+        "_exchange_info", "_exchange_info_at", "_symbol_info",
+        "_tradable_pairs", "_tradable_pairs_at", "_order_books",
+        "_rate_limiter", "_breaker", "_last_healthy_ts",
+    )
     
     def __init__(self):
         self.api_key = settings.binance_api_key
@@ -37,14 +317,55 @@ class BinanceConnector:
         self.client = None
         self.data_client = None  # Always Production for reliable data
         self._connection_attempts = 0
+        # Serializes connect() so concurrent callers share one set of clients
+        self._connect_lock = asyncio.Lock()
+        self._fapi_client: Optional[httpx.AsyncClient] = None  # Pooled, created lazily
+        # Live 24h tickers from the all-market stream: symbol -> (received_at, raw event)
+        self._ticker_cache: Dict[str, tuple] = {}
+        self._ticker_task: Optional[asyncio.Task] = None
+        self._inflight: Dict[str, asyncio.Future] = {}  # Single-flight request keys
+        self._response_cache: Dict[str, tuple] = {}  # key -> (expires_at, result)
+        # Persistent WebSocket API session for order placement
+        self._ws_api = None
+        self._ws_api_task: Optional[asyncio.Task] = None
+        self._ws_api_lock = asyncio.Lock()
+        self._ws_api_pending: Dict[str, asyncio.Future] = {}
+        # Exchange metadata caches (see _get_exchange_info_cached)
+        self._exchange_info: Optional[Dict[str, Any]] = None
+        self._exchange_info_at = 0.0
+        self._symbol_info: Dict[str, Dict[str, Any]] = {}
+        self._tradable_pairs: Optional[List[Dict[str, str]]] = None
+        self._tradable_pairs_at = 0.0
+        # Diff-stream-synced order books: symbol -> _LocalOrderBook
+        self._order_books: Dict[str, _LocalOrderBook] = {}
+        # Shared guards for every REST call made through _call()
+        self._rate_limiter = _TokenBucket(self.REQUEST_WEIGHT_PER_MINUTE)
+        self._breaker = _CircuitBreaker(self.BREAKER_FAILURE_THRESHOLD, self.BREAKER_RESET_TIMEOUT)
+        self._last_healthy_ts = 0.0  # Monotonic time of the last successful execution-client call
         
+    async def connect(self) -> bool:
+        """
+        Establish connection to Binance API.
+        
+        Idempotent: returns immediately when already connected, and concurrent
+        callers wait for the in-flight attempt instead of building their own clients.
+        """
+        if self.connected and self.client is not None:
+            return True
+        
+        async with self._connect_lock:
+            # Another coroutine may have connected while we waited for the lock
+            if self.connected and self.client is not None:
+                return True
+            return await self._connect()
+    
     @retry(
         stop=stop_after_attempt(3),
         wait=wait_exponential(multiplier=1, min=1, max=10),
         reraise=True
     )
-    async def connect(self) -> bool:
-        """Establish connection to Binance API with retry logic."""
+    async def _connect(self) -> bool:
+        """Create the execution and data clients and verify them, with retry logic."""
         if self.testnet:
             logger.info("binance_testnet_mode", message="Connecting to Binance Testnet (Execution) + Production (Data)")
         else:
@@ -55,40 +376,36 @@ class BinanceConnector:
             from binance.exceptions import BinanceAPIException
             
             # 1. Create EXECUTION client (Testnet or Prod based on config)
+            # Client() pings the API on construction, so build off the event loop
             if self.testnet:
-                self.client = Client(
+                self.client = await asyncio.to_thread(
+                    Client,
                     self.api_key,
                     self.api_secret,
                     testnet=True
                 )
             else:
-                self.client = Client(
+                self.client = await asyncio.to_thread(
+                    Client,
                     self.api_key,
                     self.api_secret
                 )
             
             # 2. Create DATA client (Always Production for reliable market data)
             # Anonymous client is sufficient for public data
-            self.data_client = Client(None, None)
+            self.data_client = await asyncio.to_thread(Client, None, None)
             
             # Test connection by getting account info (Execution client)
-            account = self.client.get_account()
+            account = await self._call(self.client.get_account, weight=20)
             
             # Test data connection
-            self.data_client.ping()
+            await self._call(self.data_client.ping)
             
             self.connected = True
             
             # Calculate total balance in USDT
-            total_usdt = 0.0
-            for balance in account['balances']:
-                free = float(balance['free'])
-                locked = float(balance['locked'])
-                total = free + locked
-                if total > 0:
-                    # For simplicity, only count USDT and stablecoins directly
-                    if balance['asset'] in ['USDT', 'BUSD', 'USDC']:
-                        total_usdt += total
+            # For simplicity, only count USDT and stablecoins directly
+            _, total_usdt = _summarize_balances(account['balances'])
             
             logger.info(
                 "binance_connected",
@@ -97,6 +414,8 @@ class BinanceConnector:
                 usdt_balance=total_usdt,
             )
             self._connection_attempts = 0
+            self._invalidate_exchange_cache()
+            self._start_ticker_stream()
             return True
             
         except Exception as e:
@@ -113,8 +432,236 @@ class BinanceConnector:
         """Disconnect from Binance API."""
         self.client = None
         self.connected = False
+        self._last_healthy_ts = 0.0
+        if self._fapi_client is not None:
+            await self._fapi_client.aclose()
+            self._fapi_client = None
+        if self._ticker_task is not None:
+            self._ticker_task.cancel()
+            self._ticker_task = None
+        self._ticker_cache.clear()
+        self._response_cache.clear()
+        if self._ws_api_task is not None:
+            self._ws_api_task.cancel()
+            self._ws_api_task = None
+        if self._ws_api is not None:
+            await self._ws_api.close()
+            self._ws_api = None
+        for book in self._order_books.values():
+            if book.task is not None:
+                book.task.cancel()
+            if book.snapshot_task is not None:
+                book.snapshot_task.cancel()
+        self._order_books.clear()
         logger.info("binance_disconnected")
     
+    async def _call(self, fn: Callable[..., Any], *args, weight: int = 1, **kwargs) -> Any:
+        """
+        Run a blocking python-binance call on a worker thread, guarded by the
+        shared rate limiter and circuit breaker.
+        
+        Args:
+            fn: Bound Client method
+            weight: Binance request weight of the endpoint
+        """
+        allowed, probe = self._breaker.allow()
+        if not allowed:
+            raise BinanceConnectionError("Binance circuit open - skipping request")
+        
+        try:
+            await self._rate_limiter.acquire(weight)
+            result = await asyncio.to_thread(fn, *args, **kwargs)
+        except Exception as e:
+            self._last_healthy_ts = 0.0  # Make the next healthcheck really ping
+            if _is_service_failure(e):
+                self._breaker.record_failure()
+            else:
+                # Binance answered (bad params, balance, ...): the service is up
+                self._breaker.record_success()
+            raise
+        finally:
+            # Even a cancelled probe must free the slot, or the breaker stays shut;
+            # calls admitted before the breaker opened never touch it
+            if probe:
+                self._breaker.release_trial()
+        
+        self._breaker.record_success()
+        if getattr(fn, "__self__", None) is self.client:
+            # Only the execution client (ping, signed account/order calls) vouches
+            # for trading health; market data comes from a separate client
+            self._last_healthy_ts = time.monotonic()
+        return result
+    
+    async def _cached_fetch(
+        self,
+        key: str,
+        ttl: float,
+        fetch: Callable[[], Awaitable[Dict[str, Any]]]
+    ) -> Dict[str, Any]:
+        """Serve a recent successful result for key, else single-flight fetch() and cache it."""
+        entry = self._response_cache.get(key)
+        if entry is not None and entry[0] > time.monotonic():
+            return entry[1]
+        
+        result = await single_flight(self._inflight, key, fetch)
+        if result and "error" not in result:
+            self._response_cache[key] = (time.monotonic() + ttl, result)
+        return result
+    
+    def _get_fapi_client(self) -> httpx.AsyncClient:
+        """Get the shared Futures API client, keeping connections alive across calls."""
+        if self._fapi_client is None or self._fapi_client.is_closed:
+            self._fapi_client = httpx.AsyncClient(
+                base_url=self.FAPI_BASE_URL,
+                timeout=15.0,
+                limits=httpx.Limits(max_keepalive_connections=20, max_connections=50),
+            )
+        return self._fapi_client
+    
+    def _start_ticker_stream(self) -> None:
+        """Start the background all-market ticker stream if it is not running."""
+        if self._ticker_task is None or self._ticker_task.done():
+            self._ticker_task = asyncio.create_task(self._run_ticker_stream())
+    
+    async def _run_ticker_stream(self) -> None:
+        """
+        Keep the ticker cache fed from Binance's !ticker@arr stream.
+        
+        Events are stored raw and only parsed when read, since the stream pushes
+        hundreds of tickers per second and most are never requested.
+        """
+        import websockets
+        
+        failures = 0
+        while True:
+            try:
+                async with websockets.connect(self.TICKER_STREAM_URL) as ws:
+                    failures = 0
+                    logger.info("binance_ticker_stream_connected")
+                    async for message in ws:
+                        received_at = time.monotonic()
+                        for ticker in orjson.loads(message):
+                            self._ticker_cache[ticker["s"]] = (received_at, ticker)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                failures += 1
+                delay = min(self.STREAM_MAX_BACKOFF, 2 ** failures)
+                logger.warning("binance_ticker_stream_error", error=str(e), retry_in=delay)
+                await asyncio.sleep(delay)
+    
+    def _get_streamed_ticker(self, symbol: str) -> Optional[Dict[str, Any]]:
+        """Return a fresh ticker from the stream cache, or None if missing/stale."""
+        entry = self._ticker_cache.get(symbol)
+        if entry is None or time.monotonic() - entry[0] > self.TICKER_MAX_AGE:
+            return None
+        
+        ticker = entry[1]
+        return {
+            "symbol": symbol,
+            "price": float(ticker["c"]),
+            "change": float(ticker["p"]),
+            "change_percent": float(ticker["P"]),
+            "bid": float(ticker["b"]),
+            "ask": float(ticker["a"]),
+            "volume": float(ticker["v"]),
+            "high_24h": float(ticker["h"]),
+            "low_24h": float(ticker["l"]),
+        }
+    
+    async def _ensure_ws_api(self):
+        """Open the WebSocket API session and its reader task if not already open."""
+        async with self._ws_api_lock:
+            if self._ws_api is not None and not self._ws_api.closed:
+                return self._ws_api
+            
+            import websockets
+            
+            url = self.WS_API_TESTNET_URL if self.testnet else self.WS_API_URL
+            try:
+                self._ws_api = await websockets.connect(url)
+            except Exception as e:
+                self._ws_api = None
+                raise BinanceConnectionError(f"WebSocket API connect failed: {str(e)}")
+            
+            self._ws_api_task = asyncio.create_task(self._read_ws_api(self._ws_api))
+            logger.info("binance_ws_api_connected", testnet=self.testnet)
+            return self._ws_api
+    
+    async def _read_ws_api(self, ws) -> None:
+        """Dispatch WebSocket API responses to the futures waiting on their ids."""
+        try:
+            async for message in ws:
+                response = orjson.loads(message)
+                future = self._ws_api_pending.pop(response.get("id"), None)
+                if future is None or future.done():
+                    continue
+                
+                if response.get("status") == 200:
+                    future.set_result(response["result"])
+                else:
+                    error = response.get("error", {})
+                    future.set_exception(
+                        BinanceOrderError(f"{error.get('code')}: {error.get('msg')}")
+                    )
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.warning("binance_ws_api_closed", error=str(e))
+        finally:
+            # Anything still waiting will never get a response on this socket
+            for future in self._ws_api_pending.values():
+                if not future.done():
+                    future.set_exception(BinanceOrderError("WebSocket API connection closed"))
+            self._ws_api_pending.clear()
+            if self._ws_api is ws:
+                self._ws_api = None
+    
+    async def _place_market_order_ws(
+        self,
+        symbol: str,
+        side: str,
+        quantity: float
+    ) -> Dict[str, Any]:
+        """
+        Place a market order over the WebSocket Trading API.
+        
+        Reuses a warm authenticated-per-request connection instead of paying a
+        REST handshake per order. Raises BinanceConnectionError only if the
+        request could not be sent, so callers may safely fall back to REST.
+        """
+        params = {
+            "apiKey": self.api_key,
+            "quantity": f"{quantity:.8f}".rstrip("0").rstrip("."),
+            "side": side,
+            "symbol": symbol,
+            "timestamp": int(time.time() * 1000),
+            "type": "MARKET",
+        }
+        payload = "&".join(f"{key}={params[key]}" for key in sorted(params))
+        params["signature"] = hmac.new(
+            self.api_secret.encode(), payload.encode(), hashlib.sha256
+        ).hexdigest()
+        
+        request_id = uuid.uuid4().hex
+        ws = await self._ensure_ws_api()
+        future = asyncio.get_running_loop().create_future()
+        self._ws_api_pending[request_id] = future
+        
+        try:
+            # Decode to str so it goes out as a text frame, which the API requires
+            await ws.send(
+                orjson.dumps({"id": request_id, "method": "order.place", "params": params}).decode()
+            )
+        except Exception as e:
+            self._ws_api_pending.pop(request_id, None)
+            raise BinanceConnectionError(f"WebSocket API send failed: {str(e)}")
+        
+        try:
+            return await asyncio.wait_for(future, timeout=self.WS_API_TIMEOUT)
+        finally:
+            self._ws_api_pending.pop(request_id, None)
+    
     async def place_order(
         self,
         symbol: str,
@@ -149,11 +696,17 @@ class BinanceConnector:
                 quantity=quantity,
             )
             
-            order = self.client.order_market(
-                symbol=symbol,
-                side=side,
-                quantity=quantity
-            )
+            try:
+                order = await self._place_market_order_ws(symbol, side, quantity)
+            except BinanceConnectionError as e:
+                # The request never reached Binance, so REST can't double-fill
+                logger.warning("binance_ws_api_unavailable", symbol=symbol, error=str(e))
+                order = await self._call(
+                    self.client.order_market,
+                    symbol=symbol,
+                    side=side,
+                    quantity=quantity
+                )
             
             logger.info(
                 "binance_order_placed",
@@ -218,12 +771,23 @@ class BinanceConnector:
     
     async def get_crypto_price(self, symbol: str) -> Optional[Dict[str, Any]]:
         """Get real-time cryptocurrency price from Binance."""
+        return await single_flight(
+            self._inflight, f"price:{symbol}", lambda: self._fetch_crypto_price(symbol)
+        )
+    
+    async def _fetch_crypto_price(self, symbol: str) -> Optional[Dict[str, Any]]:
+        """Fetch a ticker from the stream cache, falling back to REST."""
         try:
             if not self.connected:
                 await self.connect()
             
+            # Serve from the live stream when possible; REST only on a miss
+            streamed = self._get_streamed_ticker(symbol)
+            if streamed is not None:
+                return streamed
+            
             # Get current ticker
-            ticker = self.data_client.get_ticker(symbol=symbol)
+            ticker = await self._call(self.data_client.get_ticker, symbol=symbol, weight=2)
             
             # Get 24h price change
             current_price = float(ticker['lastPrice'])
@@ -252,27 +816,19 @@ class BinanceConnector:
             if not self.connected:
                 await self.connect()
             
-            account = self.client.get_account()
+            account = await self._call(self.client.get_account, weight=20)
             
             # Parse balances
-            balances = {}
-            total_usdt_value = 0.0
-            
-            for balance in account['balances']:
-                free = float(balance['free'])
-                locked = float(balance['locked'])
-                total = free + locked
-                
-                if total > 0:
-                    balances[balance['asset']] = {
-                        'free': free,
-                        'locked': locked,
-                        'total': total,
-                    }
-                    
-                    # Simple approximation: count stablecoins as USDT value
-                    if balance['asset'] in ['USDT', 'BUSD', 'USDC', 'DAI']:
-                        total_usdt_value += total
+            # Simple approximation: count stablecoins as USDT value
+            holdings, total_usdt_value = _summarize_balances(account['balances'])
+            balances = {
+                asset: {
+                    'free': free,
+                    'locked': locked,
+                    'total': total,
+                }
+                for asset, free, locked, total in holdings
+            }
             
             return {
                 "can_trade": account['canTrade'],
@@ -293,49 +849,40 @@ class BinanceConnector:
             if not self.connected:
                 await self.connect()
             
-            account = self.client.get_account()
-            positions = []
+            account = await self._call(self.client.get_account, weight=20)
             
-            for balance in account['balances']:
-                free = float(balance['free'])
-                locked = float(balance['locked'])
-                total = free + locked
+            holdings, _ = _summarize_balances(account['balances'])
+            holdings = [h for h in holdings if h[0] != 'USDT']
+            
+            symbols = [f"{asset}USDT" for asset, _, _, _ in holdings]
+            prices = await self._get_usdt_prices(symbols)
+            
+            positions = []
+            for (asset, free, locked, total), symbol in zip(holdings, symbols):
+                current_price = prices.get(symbol)
+                if current_price is None:
+                    # Pair doesn't exist or error fetching price
+                    # Include position without price
+                    positions.append({
+                        "asset": asset,
+                        "symbol": None,
+                        "quantity": total,
+                        "free": free,
+                        "locked": locked,
+                        "current_price": None,
+                        "market_value": None,
+                    })
+                    continue
                 
-                if total > 0 and balance['asset'] != 'USDT':
-                    # Get current price against USDT
-                    symbol = f"{balance['asset']}USDT"
-                    
-                    try:
-                        ticker = self.data_client.get_ticker(symbol=symbol)
-                        current_price = float(ticker['lastPrice'])
-                        market_value = total * current_price
-                        
-                        positions.append({
-                            "asset": balance['asset'],
-                            "symbol": symbol,
-                            "quantity": total,
-                            "free": free,
-                            "locked": locked,
-                            "current_price": current_price,
-                            "market_value": market_value,
-                        })
-                    except Exception as e:
-                        logger.warning(
-                            "binance_position_price_fetch_warning",
-                            asset=balance['asset'],
-                            error=str(e)
-                        )
-                        # Pair doesn't exist or error fetching price
-                        # Include position without price
-                        positions.append({
-                            "asset": balance['asset'],
-                            "symbol": None,
-                            "quantity": total,
-                            "free": free,
-                            "locked": locked,
-                            "current_price": None,
-                            "market_value": None,
-                        })
+                positions.append({
+                    "asset": asset,
+                    "symbol": symbol,
+                    "quantity": total,
+                    "free": free,
+                    "locked": locked,
+                    "current_price": current_price,
+                    "market_value": total * current_price,
+                })
             
             return positions
             
@@ -343,42 +890,127 @@ class BinanceConnector:
             logger.error("binance_positions_fetch_error", error=str(e))
             return []
     
+    async def _get_usdt_prices(self, symbols: List[str]) -> Dict[str, float]:
+        """
+        Resolve last prices for many symbols with as few requests as possible.
+        
+        Order of preference: live ticker stream, one get_all_tickers() batch,
+        then per-symbol REST requests for pairs the batch did not include.
+        """
+        prices: Dict[str, float] = {}
+        for symbol in symbols:
+            streamed = self._get_streamed_ticker(symbol)
+            if streamed is not None:
+                prices[symbol] = streamed["price"]
+        
+        missing = [symbol for symbol in symbols if symbol not in prices]
+        if not missing:
+            return prices
+        
+        try:
+            # Keep prices as strings; only the handful we need get parsed
+            all_tickers = await self._call(self.data_client.get_all_tickers, weight=4)
+            all_prices = {t['symbol']: t['price'] for t in all_tickers}
+            for symbol in missing:
+                if symbol in all_prices:
+                    prices[symbol] = float(all_prices[symbol])
+        except Exception as e:
+            logger.warning("binance_all_tickers_fetch_warning", error=str(e))
+        
+        missing = [symbol for symbol in missing if symbol not in prices]
+        if not missing:
+            return prices
+        
+        semaphore = asyncio.Semaphore(self.TICKER_FETCH_CONCURRENCY)
+        
+        async def fetch_ticker(symbol: str) -> Dict[str, Any]:
+            async with semaphore:
+                return await self._call(self.data_client.get_ticker, symbol=symbol, weight=2)
+        
+        tickers = await asyncio.gather(
+            *[fetch_ticker(symbol) for symbol in missing],
+            return_exceptions=True
+        )
+        for symbol, ticker in zip(missing, tickers):
+            if isinstance(ticker, Exception):
+                logger.warning(
+                    "binance_position_price_fetch_warning",
+                    symbol=symbol,
+                    error=str(ticker)
+                )
+                continue
+            prices[symbol] = float(ticker['lastPrice'])
+        
+        return prices
+    
     async def healthcheck(self) -> bool:
         """Check Binance API connection health."""
         if not self.connected:
             return await self.connect()
         
+        # A recent successful ping or signed call already proves connectivity
+        if time.monotonic() - self._last_healthy_ts < self.HEALTHCHECK_TTL:
+            return True
+        
         try:
-            # Simple check - ping server
-            self.client.ping()
+            # Simple check - ping server (refreshes _last_healthy_ts)
+            await self._call(self.client.ping)
             return True
         except Exception:
             return False
     
+    async def _get_exchange_info_cached(self) -> Dict[str, Any]:
+        """
+        Get full exchange info, refetching at most once per EXCHANGE_INFO_TTL.
+        
+        Also indexes symbols by name so per-symbol lookups don't rescan the
+        multi-thousand-entry list (get_symbol_info refetches and scans it).
+        """
+        now = time.monotonic()
+        if self._exchange_info is None or now - self._exchange_info_at > self.EXCHANGE_INFO_TTL:
+            info = await single_flight(
+                self._inflight, "exchange_info", lambda: self._call(self.data_client.get_exchange_info, weight=20)
+            )
+            self._exchange_info = info
+            self._exchange_info_at = now
+            self._symbol_info = {s['symbol']: s for s in info['symbols']}
+            self._tradable_pairs = None  # Derived from exchange info
+        return self._exchange_info
+    
+    def _invalidate_exchange_cache(self) -> None:
+        """Force the next exchange-info read to hit the API."""
+        self._exchange_info = None
+        self._exchange_info_at = 0.0
+        self._symbol_info = {}
+        self._tradable_pairs = None
+        self._tradable_pairs_at = 0.0
+    
     async def get_exchange_info(self, symbol: Optional[str] = None) -> Optional[Dict]:
-        """Get exchange trading rules and symbol information."""
+        """Get exchange trading rules and symbol information (cached)."""
         try:
             if not self.connected:
                 await self.connect()
             
+            info = await self._get_exchange_info_cached()
             if symbol:
-                info = self.data_client.get_symbol_info(symbol)
-                return info
-            else:
-                info = self.data_client.get_exchange_info()
-                return info
+                return self._symbol_info.get(symbol)
+            return info
             
         except Exception as e:
             logger.error("binance_exchange_info_error", error=str(e))
             return None
     
     async def get_all_tradable_pairs(self) -> list:
-        """Get all tradable USDT pairs from Binance."""
+        """Get all tradable USDT pairs from Binance (cached for TRADABLE_PAIRS_TTL)."""
         try:
             if not self.connected:
                 await self.connect()
             
-            exchange_info = self.data_client.get_exchange_info()
+            exchange_info = await self._get_exchange_info_cached()
+            
+            now = time.monotonic()
+            if self._tradable_pairs is not None and now - self._tradable_pairs_at <= self.TRADABLE_PAIRS_TTL:
+                return list(self._tradable_pairs)
             
             tradable_pairs = []
             for symbol_info in exchange_info['symbols']:
@@ -393,12 +1025,15 @@ class BinanceConnector:
                         'quoteAsset': symbol_info['quoteAsset'],
                     })
             
+            self._tradable_pairs = tradable_pairs
+            self._tradable_pairs_at = now
+            
             logger.info(
                 "binance_tradable_pairs_fetched",
                 count=len(tradable_pairs),
             )
             
-            return tradable_pairs
+            return list(tradable_pairs)
             
         except Exception as e:
             logger.error("binance_tradable_pairs_error", error=str(e))
@@ -413,72 +1048,55 @@ class BinanceConnector:
         Positive = longs pay shorts (bullish overextended)
         Negative = shorts pay longs (bearish overextended)
         """
+        raw_rates = await self._get_raw_funding_rates()
+        if "error" in raw_rates:
+            return raw_rates
+        
+        data = raw_rates.get(symbol)
+        if data is None:
+            return {"error": f"No funding rate for {symbol}"}
+        return _build_funding_record(symbol, data)
+    
+    async def get_all_funding_rates(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Get funding rates for every perpetual symbol in one request.
+        
+        Returns:
+            Mapping of symbol to the same record get_funding_rate returns
+        """
+        raw_rates = await self._get_raw_funding_rates()
+        if "error" in raw_rates:
+            return raw_rates
+        return {
+            symbol: _build_funding_record(symbol, data)
+            for symbol, data in raw_rates.items()
+        }
+    
+    async def _get_raw_funding_rates(self) -> Dict[str, Any]:
+        """Get raw premiumIndex entries by symbol, cached for FUNDING_RATE_TTL."""
+        return await self._cached_fetch(
+            "funding:all",
+            self.FUNDING_RATE_TTL,
+            self._fetch_all_funding_rates
+        )
+    
+    async def _fetch_all_funding_rates(self) -> Dict[str, Any]:
+        """Fetch premiumIndex for all symbols (omitting `symbol` returns the full list)."""
         try:
-            import httpx
-            
             # Use Binance Futures API for funding rates
             # This is a public endpoint, no API key required
             # ALWAYS use Production for data analysis to ensure accurate sentiment
-            base_url = "https://fapi.binance.com"
+            client = self._get_fapi_client()
+            
+            response = await client.get("/fapi/v1/premiumIndex")
+            
+            if response.status_code == 200:
+                return {entry["symbol"]: entry for entry in orjson.loads(response.content)}
+            else:
+                return {"error": f"Failed to fetch funding rate: {response.status_code}"}
             
-            async with httpx.AsyncClient(timeout=15.0) as client:
-                # Get current funding rate
-                response = await client.get(
-                    f"{base_url}/fapi/v1/premiumIndex",
-                    params={"symbol": symbol}
-                )
-                
-                if response.status_code == 200:
-                    data = response.json()
-                    
-                    funding_rate = float(data.get("lastFundingRate", 0))
-                    mark_price = float(data.get("markPrice", 0))
-                    index_price = float(data.get("indexPrice", 0))
-                    next_funding_time = data.get("nextFundingTime", 0)
-                    
-                    # Convert funding rate to annualized (funding every 8 hours = 3x daily)
-                    daily_rate = funding_rate * 3
-                    annualized_rate = daily_rate * 365 * 100  # As percentage
-                    
-                    # Interpret funding rate
-                    if funding_rate > 0.001:  # > 0.1%
-                        sentiment = "extreme_bullish"
-                        signal = "caution_longs"
-                        interpretation = "High positive funding - longs may be overextended"
-                    elif funding_rate > 0.0005:
-                        sentiment = "bullish"
-                        signal = "neutral"
-                        interpretation = "Moderate positive funding - slight bullish bias"
-                    elif funding_rate < -0.001:
-                        sentiment = "extreme_bearish"
-                        signal = "caution_shorts"
-                        interpretation = "High negative funding - shorts may be overextended"
-                    elif funding_rate < -0.0005:
-                        sentiment = "bearish"
-                        signal = "neutral"
-                        interpretation = "Moderate negative funding - slight bearish bias"
-                    else:
-                        sentiment = "neutral"
-                        signal = "neutral"
-                        interpretation = "Neutral funding - balanced market"
-                    
-                    return {
-                        "symbol": symbol,
-                        "funding_rate": funding_rate,
-                        "funding_rate_percent": round(funding_rate * 100, 4),
-                        "annualized_rate_percent": round(annualized_rate, 2),
-                        "mark_price": mark_price,
-                        "index_price": index_price,
-                        "next_funding_time": next_funding_time,
-                        "sentiment": sentiment,
-                        "signal": signal,
-                        "interpretation": interpretation,
-                    }
-                else:
-                    return {"error": f"Failed to fetch funding rate: {response.status_code}"}
-                    
         except Exception as e:
-            logger.error("binance_funding_rate_error", symbol=symbol, error=str(e))
+            logger.error("binance_funding_rate_error", error=str(e))
             return {"error": str(e)}
     
     async def get_historical_klines(
@@ -522,7 +1140,8 @@ class BinanceConnector:
             start_time = end_time - timedelta(days=days)
             
             # Fetch klines (candlestick data)
-            klines = self.data_client.get_historical_klines(
+            klines = await self._call(
+                self.data_client.get_historical_klines,
                 symbol,
                 interval,
                 start_time.strftime("%Y-%m-%d"),
@@ -566,19 +1185,117 @@ class BinanceConnector:
         Analyze order book depth for support/resistance levels.
         Returns bid/ask imbalance and significant order walls.
         """
+        return await self._cached_fetch(
+            f"order_book:{symbol}:{depth}",
+            self.ORDER_BOOK_TTL,
+            lambda: self._fetch_order_book_analysis(symbol, depth)
+        )
+    
+    def _get_local_order_book(self, symbol: str) -> Optional["_LocalOrderBook"]:
+        """
+        Get the streamed order book for symbol, starting its stream on first use.
+        
+        Returns None once MAX_DEPTH_STREAMS books are live; those symbols keep
+        using REST snapshots.
+        """
+        book = self._order_books.get(symbol)
+        if book is not None:
+            if book.task is None or book.task.done():
+                book.task = asyncio.create_task(self._run_depth_stream(book))
+            return book
+        
+        if len(self._order_books) >= self.MAX_DEPTH_STREAMS:
+            return None
+        
+        book = _LocalOrderBook(symbol)
+        book.task = asyncio.create_task(self._run_depth_stream(book))
+        self._order_books[symbol] = book
+        return book
+    
+    async def _run_depth_stream(self, book: "_LocalOrderBook") -> None:
+        """
+        Keep a local order book in sync with the @depth diff stream.
+        
+        Follows Binance's documented procedure: buffer diffs, seed from a REST
+        snapshot, drop diffs already covered by it, then apply the rest in
+        order. Any sequence gap triggers a reconnect and fresh snapshot.
+        """
+        import websockets
+        
+        url = f"{self.DEPTH_STREAM_BASE_URL}/{book.symbol.lower()}@depth@100ms"
+        failures = 0
+        while True:
+            book.synced = False
+            try:
+                async with websockets.connect(url) as ws:
+                    snapshot = book.snapshot_task = asyncio.ensure_future(self._call(
+                        self.data_client.get_order_book,
+                        symbol=book.symbol,
+                        limit=self.DEPTH_SNAPSHOT_LIMIT,
+                        weight=_depth_weight(self.DEPTH_SNAPSHOT_LIMIT),
+                    ))
+                    buffered = []
+                    async for message in ws:
+                        event = orjson.loads(message)
+                        
+                        if not book.synced:
+                            buffered.append(event)
+                            if not snapshot.done():
+                                continue
+                            book.apply_snapshot(snapshot.result())
+                            if not all(book.apply_diff(e) for e in buffered):
+                                raise BinanceConnectionError("depth snapshot older than stream")
+                            buffered.clear()
+                            book.synced = True
+                            failures = 0
+                            continue
+                        
+                        if not book.apply_diff(event):
+                            raise BinanceConnectionError("depth stream sequence gap")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                failures += 1
+                delay = min(self.STREAM_MAX_BACKOFF, 2 ** failures)
+                logger.warning(
+                    "binance_depth_stream_error",
+                    symbol=book.symbol,
+                    error=str(e),
+                    retry_in=delay
+                )
+                await asyncio.sleep(delay)
+            finally:
+                # Don't leave the seed fetch running once its connection is gone
+                if book.snapshot_task is not None:
+                    book.snapshot_task.cancel()
+                    book.snapshot_task = None
+    
+    async def _fetch_order_book_analysis(self, symbol: str, depth: int) -> Dict[str, Any]:
+        """Fetch an order book snapshot and analyze it."""
         try:
             if not self.connected:
                 await self.connect()
             
-            # Get order book
-            order_book = self.data_client.get_order_book(symbol=symbol, limit=depth)
-            
-            bids = order_book.get("bids", [])
-            asks = order_book.get("asks", [])
+            book = self._get_local_order_book(symbol)
+            if book is not None and book.synced:
+                # Answer from the diff-synced local book; no REST round trip
+                bids, asks = book.top(depth)
+            else:
+                # Get order book
+                order_book = await self._call(
+                    self.data_client.get_order_book,
+                    symbol=symbol,
+                    limit=depth,
+                    weight=_depth_weight(depth),
+                )
+                
+                # Parse each side once into an (N, 2) [price, volume] array
+                bids = np.array(order_book.get("bids", []), dtype=np.float64).reshape(-1, 2)
+                asks = np.array(order_book.get("asks", []), dtype=np.float64).reshape(-1, 2)
             
             # Calculate total bid and ask volume
-            total_bid_volume = sum(float(bid[1]) for bid in bids)
-            total_ask_volume = sum(float(ask[1]) for ask in asks)
+            total_bid_volume = float(bids[:, 1].sum())
+            total_ask_volume = float(asks[:, 1].sum())
             
             # Calculate imbalance
             total_volume = total_bid_volume + total_ask_volume
@@ -588,34 +1305,12 @@ class BinanceConnector:
             
             # Find significant walls (orders with > 5% of total volume)
             threshold = total_volume * 0.05
-            
-            bid_walls = []
-            for bid in bids:
-                price = float(bid[0])
-                volume = float(bid[1])
-                if volume > threshold:
-                    bid_walls.append({
-                        "price": price,
-                        "volume": volume,
-                        "percent_of_total": round((volume / total_volume) * 100, 2),
-                        "type": "support"
-                    })
-            
-            ask_walls = []
-            for ask in asks:
-                price = float(ask[0])
-                volume = float(ask[1])
-                if volume > threshold:
-                    ask_walls.append({
-                        "price": price,
-                        "volume": volume,
-                        "percent_of_total": round((volume / total_volume) * 100, 2),
-                        "type": "resistance"
-                    })
+            bid_walls = _find_walls(bids, threshold, total_volume, "support")
+            ask_walls = _find_walls(asks, threshold, total_volume, "resistance")
             
             # Get best bid/ask
-            best_bid = float(bids[0][0]) if bids else 0
-            best_ask = float(asks[0][0]) if asks else 0
+            best_bid = float(bids[0, 0]) if len(bids) else 0
+            best_ask = float(asks[0, 0]) if len(asks) else 0
             spread = best_ask - best_bid
             spread_percent = (spread / best_bid * 100) if best_bid > 0 else 0
             
@@ -662,7 +1357,12 @@ _binance_connector: Optional[BinanceConnector] = None
 
 
 def get_binance_connector() -> BinanceConnector:
-    """Get Binance connector instance."""
+    """
+    Get Binance connector instance.
+    
+    Construction is synchronous, so it cannot interleave with other coroutines;
+    connection races are handled by the lock inside BinanceConnector.connect().
+    """
     global _binance_connector
     if _binance_connector is None:
         _binance_connector = BinanceConnector()
@@ -0,0 +1,80 @@
+"""
+Caching primitives shared by the market data services.
+
+- single_flight(): coalesces concurrent identical requests onto one fetch
+- RedisBackoff: lazy Redis client that is bypassed for a while after an error
+"""
+from typing import Any, Awaitable, Callable, Dict, Optional
+import asyncio
+import time
+from config import get_settings
+import structlog
+
+logger = structlog.get_logger()
+settings = get_settings()
+
+REDIS_RETRY_DELAY = 30  # Seconds to bypass Redis after a failure
+
+
+async def single_flight(
+    inflight: Dict[str, asyncio.Future],
+    key: str,
+    fetch: Callable[[], Awaitable[Any]]
+) -> Any:
+    """
+    Coalesce concurrent identical requests.
+    
+    The first caller for a key starts fetch(); callers arriving while it is
+    in flight await the same task instead of issuing their own request.
+    
+    Args:
+        inflight: The owner's key -> task registry of requests in flight
+        key: Request identity
+        fetch: Coroutine factory performing the actual request
+    """
+    task = inflight.get(key)
+    if task is None:
+        task = asyncio.ensure_future(fetch())
+        inflight[key] = task
+        task.add_done_callback(lambda _: inflight.pop(key, None))
+    # Shield so one cancelled waiter doesn't cancel the shared fetch
+    return await asyncio.shield(task)
+
+
+class RedisBackoff:
+    """
+    Lazily created Redis client, skipped for a while after an error so an
+    outage doesn't add a timeout to every lookup.
+    
+    Works with both redis.Redis and redis.asyncio.Redis.
+    """
+    
+    def __init__(self, client_class: type, error_event: str):
+        """
+        Args:
+            client_class: redis.Redis or redis.asyncio.Redis
+            error_event: Log event emitted when a call fails
+        """
+        self._client_class = client_class
+        self._error_event = error_event
+        self._retry_at = 0.0
+        self.client: Optional[Any] = None
+    
+    def get(self) -> Optional[Any]:
+        """Return the client, creating it on first use; None while backing off."""
+        if time.monotonic() < self._retry_at:
+            return None
+        if self.client is None:
+            self.client = self._client_class(
+                host=settings.redis_host,
+                port=settings.redis_port,
+                password=settings.redis_password,
+                socket_timeout=0.25,
+                socket_connect_timeout=0.25,
+            )
+        return self.client
+    
+    def failed(self, error: Exception, **context: Any) -> None:
+        """Start backing off after a Redis error."""
+        self._retry_at = time.monotonic() + REDIS_RETRY_DELAY
+        logger.warning(self._error_event, error=str(error), **context)
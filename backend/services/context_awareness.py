@@ -3,14 +3,267 @@ Advanced Context Awareness System
 Provides real-time market context, correlation analysis, and portfolio impact assessment
 to help agents make contextually-aware decisions.
 """
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple, FrozenSet, NamedTuple, TypedDict, NotRequired
+from bisect import bisect_left, bisect_right
+from collections import Counter, defaultdict
 from datetime import datetime, timedelta
+from functools import lru_cache
+import heapq
+import threading
+import time
+import orjson
+import redis
 import structlog
+from config import get_settings
 from database import get_db
-from models.database import Trade, Portfolio
-import statistics
+from models.database import Trade, Portfolio, TradeOutcome
+from services.cache_utils import RedisBackoff
+from sqlalchemy import func
+from sqlalchemy.orm import Session
 
 logger = structlog.get_logger()
+settings = get_settings()
+
+# Bucket tables: label = LABELS[bisect(THRESHOLDS, value)]
+_ACTIVITY_THRESHOLDS = (7, 15)  # Trades in 7 days; lower bounds are inclusive
+_ACTIVITY_LABELS = ("LOW", "MODERATE", "HIGH")
+_CONCENTRATION_THRESHOLDS = (25, 40)  # Largest position %, must exceed the bound
+_CONCENTRATION_LABELS = ("LOW", "MODERATE", "HIGH")
+_CORRELATION_RISK_THRESHOLDS = (40, 70)  # Diversification score; inclusive
+_CORRELATION_RISK_LABELS = ("HIGH", "MODERATE", "LOW")
+
+# Contextual recommendations: (predicate(market, portfolio, conditions), message)
+_REC_CONDITIONS_NORMAL = "✅ Conditions normal - Trade according to your strategy"
+_RECOMMENDATION_RULES = (
+    # Activity-based
+    (lambda ms, pc, tc: ms["activity_level"] == "LOW",
+     "📉 Low trading activity - Be selective, wait for quality setups"),
+    (lambda ms, pc, tc: ms["activity_level"] == "HIGH",
+     "📈 High trading activity - Ensure you're not overtrading"),
+    # Portfolio-based
+    (lambda ms, pc, tc: pc["cash_percent"] < 20,
+     "💰 Low cash (<20%) - Consider taking profits or reducing positions"),
+    (lambda ms, pc, tc: pc["cash_percent"] > 80,
+     "💵 High cash (>80%) - Look for entry opportunities"),
+    (lambda ms, pc, tc: pc["concentration_risk"] == "HIGH",
+     "⚠️ High concentration risk - Diversify portfolio"),
+    # Conditions-based
+    (lambda ms, pc, tc: tc["risk_level"] == "HIGH",
+     "🔴 High risk environment - Reduce position sizes"),
+)
+
+# Simplified sector-based correlation groups
+_TECH = frozenset({"AAPL", "MSFT", "GOOGL", "META", "NVDA", "AMD", "TSLA"})
+_CRYPTO = frozenset({"BTCUSDT", "ETHUSDT", "BNBUSDT", "SOLUSDT"})
+_FINANCE = frozenset({"JPM", "BAC", "GS", "WFC", "C"})
+_SECTOR_ORDER = ("TECH", "CRYPTO", "FINANCE")
+_SECTOR_MAP = {
+    **{symbol: "TECH" for symbol in _TECH},
+    **{symbol: "CRYPTO" for symbol in _CRYPTO},
+    **{symbol: "FINANCE" for symbol in _FINANCE},
+}
+
+# A 7-day trade window and portfolio snapshot barely move between adjacent
+# agent turns, so results are reused for a short while
+CONTEXT_CACHE_TTL = 30  # Seconds, in process (only while Redis is unreachable)
+REDIS_CACHE_TTL = 30  # Seconds, shared across worker processes
+# Results are held as serialized JSON: decoding hands each caller a private copy
+_context_cache: Dict[str, Tuple[float, bytes]] = {}  # agent -> (expires_at, orjson bytes)
+_correlation_cache: Dict[Tuple[str, Optional[str]], Tuple[float, bytes]] = {}
+_cache_lock = threading.Lock()
+_redis = RedisBackoff(redis.Redis, "context_cache_redis_error")
+
+
+def _context_key(agent_name: str) -> str:
+    return f"ctx:{agent_name}"
+
+
+def _correlation_key(agent_name: str, new_symbol: Optional[str]) -> str:
+    return f"corr:{agent_name}:{new_symbol or ''}"
+
+
+def _correlation_index_key(agent_name: str) -> str:
+    """Redis set of the agent's correlation keys, so invalidate() needs no SCAN."""
+    return f"corr_keys:{agent_name}"
+
+
+def _cache_lookup(cache: Dict, key, redis_key: str) -> Optional[Dict[str, Any]]:
+    """
+    Return a private copy of a fresh cached result, or None.
+    
+    Redis, when reachable, is the only tier: a per-process copy could outlive
+    an invalidate() issued by another worker. The in-process dict is the fallback.
+    """
+    client = _redis.get()
+    if client is not None:
+        try:
+            raw = client.get(redis_key)
+        except redis.RedisError as e:
+            _redis.failed(e)
+        else:
+            return orjson.loads(raw) if raw is not None else None
+    
+    with _cache_lock:
+        entry = cache.get(key)
+    if entry is None or time.monotonic() >= entry[0]:
+        return None
+    return orjson.loads(entry[1])
+
+
+def _cache_store(
+    cache: Dict,
+    key,
+    redis_key: str,
+    value: Dict[str, Any],
+    index_key: Optional[str] = None
+) -> None:
+    """Store a result in Redis (registering it under `index_key`), else in process."""
+    payload = orjson.dumps(value)  # Serialize once, outside the lock
+    
+    client = _redis.get()
+    if client is not None:
+        try:
+            pipe = client.pipeline()
+            pipe.setex(redis_key, REDIS_CACHE_TTL, payload)
+            if index_key is not None:
+                pipe.sadd(index_key, redis_key)
+                pipe.expire(index_key, REDIS_CACHE_TTL)  # Outlives every member
+            pipe.execute()
+            return
+        except redis.RedisError as e:
+            _redis.failed(e)
+    
+    with _cache_lock:
+        cache[key] = (time.monotonic() + CONTEXT_CACHE_TTL, payload)
+
+
+# Result shapes. Plain dicts at runtime: they are cached as JSON, sent to
+# Redis and handed to agents as tool output
+
+class MarketSummary(TypedDict):
+    activity_level: str
+    most_active_symbols: List[str]
+    trade_count_7d: int
+    unique_symbols_traded: NotRequired[int]
+
+
+class PositionSummary(TypedDict):
+    symbol: str
+    value: float
+
+
+class PortfolioContext(TypedDict):
+    position_count: int
+    cash_percent: float
+    concentration_risk: str
+    total_value: NotRequired[float]
+    positions_summary: NotRequired[List[PositionSummary]]
+
+
+class TradingConditions(TypedDict):
+    recommended_action: str
+    risk_level: str
+    reasons: List[str]
+
+
+class MarketContext(TypedDict):
+    market_summary: MarketSummary
+    portfolio_context: PortfolioContext
+    trading_conditions: TradingConditions
+    recommendations: List[str]
+    timestamp: str
+
+
+class CorrelationGroup(TypedDict):
+    sector: str
+    symbols: List[str]
+    correlation: str
+
+
+class CorrelationAnalysis(TypedDict):
+    correlation_risk: str
+    correlated_positions: List[CorrelationGroup]
+    diversification_score: int
+    recommendation: str
+    current_symbols: NotRequired[List[str]]
+
+
+def _trade_stats_query(db: Session, now: datetime, *group_columns):
+    """
+    Per-symbol trade counts and realized P&L over the 7-day window.
+    
+    Realized P&L lives on the trade's outcome, when one has been recorded;
+    SUM/COUNT of it skip trades without one. Callers add the agent filter
+    and GROUP BY (Trade.symbol plus any extra group_columns).
+    """
+    return db.query(
+        *group_columns,
+        Trade.symbol,
+        func.count(Trade.id).label("n"),
+        func.sum(TradeOutcome.pnl_amount).label("pnl_sum"),
+        func.count(TradeOutcome.pnl_amount).label("pnl_count"),
+    ).outerjoin(
+        TradeOutcome, TradeOutcome.trade_id == Trade.id
+    ).filter(
+        Trade.created_at >= now - timedelta(days=7)
+    )
+
+
+def _load_portfolio(db: Session, agent_name: str):
+    """
+    Load an agent's (cash, positions) row once per session.
+    
+    The row is memoized in the session's info dict, so analyses sharing a
+    session (see get_full_context) issue a single portfolio query.
+    """
+    key = ("portfolio", agent_name)
+    if key not in db.info:
+        # Only the columns the analyzers read
+        db.info[key] = db.query(Portfolio).with_entities(
+            Portfolio.cash, Portfolio.positions
+        ).filter(
+            Portfolio.agent_name == agent_name
+        ).first()
+    return db.info[key]
+
+
+def _position_value(position: Dict[str, Any]) -> float:
+    """Value of a stored position: market value when recorded, else cost basis."""
+    value = position.get("current_value")
+    if value is None:
+        value = position.get("quantity", 0) * position.get("avg_price", 0)
+    return value
+
+
+class _PortfolioSnapshot(NamedTuple):
+    """Portfolio figures shared by the context builders."""
+    total_value: float
+    cash_percent: float
+    max_position_percent: float
+    symbols: List[str]
+    values: List[float]  # Parallel to symbols
+
+
+def _portfolio_snapshot(portfolio) -> Optional[_PortfolioSnapshot]:
+    """Compute totals and percentages for a (cash, positions) row, or None."""
+    if not portfolio:
+        return None
+    
+    positions = portfolio.positions or {}
+    
+    # Parallel symbol/value sequences; sum() and max() then reduce in C
+    symbols = list(positions)
+    values = [_position_value(position) for position in positions.values()]
+    total_value = portfolio.cash + sum(values)
+    
+    if total_value > 0:
+        cash_percent = portfolio.cash / total_value * 100
+        max_position_percent = max(values, default=0.0) / total_value * 100
+    else:
+        cash_percent = 100
+        max_position_percent = 0
+    
+    return _PortfolioSnapshot(total_value, cash_percent, max_position_percent, symbols, values)
 
 
 class MarketContextAnalyzer:
@@ -18,13 +271,40 @@ class MarketContextAnalyzer:
     Analyse le contexte global du marché pour informer les décisions.
     """
     
+    @classmethod
+    def invalidate(cls, agent_name: str) -> None:
+        """
+        Drop an agent's cached context and correlation results (call after trade writes).
+        
+        Blocking Redis round trips: call through asyncio.to_thread from async code.
+        """
+        with _cache_lock:
+            _context_cache.pop(agent_name, None)
+            for key in [k for k in _correlation_cache if k[0] == agent_name]:
+                del _correlation_cache[key]
+        
+        client = _redis.get()
+        if client is None:
+            return
+        try:
+            index_key = _correlation_index_key(agent_name)
+            stale = client.smembers(index_key)
+            client.delete(_context_key(agent_name), index_key, *stale)
+        except redis.RedisError as e:
+            _redis.failed(e)
+    
     def get_comprehensive_context(
         self,
-        agent_name: str
-    ) -> Dict[str, Any]:
+        agent_name: str,
+        db: Optional[Session] = None
+    ) -> MarketContext:
         """
         Retourne un contexte de marché complet et actionnable.
         
+        Args:
+            agent_name: Agent whose portfolio and trades are analysed
+            db: Session to reuse; a short-lived one is opened when omitted
+        
         Returns:
             {
                 "market_summary": {...},
@@ -33,63 +313,131 @@ class MarketContextAnalyzer:
                 "recommendations": [...]
             }
         """
-        db = next(get_db())
+        cached = _cache_lookup(_context_cache, agent_name, _context_key(agent_name))
+        if cached is not None:
+            return cached
         
-        try:
-            # Get portfolio
-            portfolio = db.query(Portfolio).filter(
-                Portfolio.agent_name == agent_name
-            ).first()
-            
-            # Analyze recent trading activity
-            recent_trades = db.query(Trade).filter(
-                Trade.agent_name == agent_name,
-                Trade.created_at >= datetime.utcnow() - timedelta(days=7)
-            ).all()
+        if db is None:
+            with get_db() as session:
+                context = self._build_context(agent_name, session)
+        else:
+            context = self._build_context(agent_name, db)
+        
+        _cache_store(_context_cache, agent_name, _context_key(agent_name), context)
+        return context
+    
+    def get_comprehensive_context_bulk(
+        self,
+        agent_names: List[str],
+        db: Optional[Session] = None
+    ) -> Dict[str, MarketContext]:
+        """
+        Contexte de marché pour plusieurs agents en un aller-retour.
+        
+        Agents not in the cache are served by one grouped trade query and one
+        portfolio query (WHERE agent_name IN ...) instead of two per agent.
+        
+        Returns:
+            {agent_name: context} with the same shape as get_comprehensive_context
+        """
+        contexts = {}
+        missing = []
+        for agent_name in agent_names:
+            cached = _cache_lookup(_context_cache, agent_name, _context_key(agent_name))
+            if cached is not None:
+                contexts[agent_name] = cached
+            else:
+                missing.append(agent_name)
+        
+        if missing:
+            if db is None:
+                with get_db() as session:
+                    built = self._build_contexts(missing, session)
+            else:
+                built = self._build_contexts(missing, db)
             
-            # Build context
-            market_summary = self._build_market_summary(recent_trades)
-            portfolio_context = self._build_portfolio_context(portfolio)
-            trading_conditions = self._assess_trading_conditions(recent_trades, portfolio)
-            recommendations = self._generate_contextual_recommendations(
-                market_summary, portfolio_context, trading_conditions
+            for agent_name, context in built.items():
+                _cache_store(_context_cache, agent_name, _context_key(agent_name), context)
+            contexts.update(built)
+        
+        return contexts
+    
+    def _build_context(self, agent_name: str, db: Session) -> MarketContext:
+        """Query the agent's portfolio and recent trades and assemble the context."""
+        now = datetime.utcnow()  # One clock read for the window and the timestamp
+        portfolio = _load_portfolio(db, agent_name)
+        symbol_stats = _trade_stats_query(db, now).filter(
+            Trade.agent_name == agent_name
+        ).group_by(Trade.symbol).all()
+        
+        return self._assemble_context(symbol_stats, portfolio, now)
+    
+    def _build_contexts(self, agent_names: List[str], db: Session) -> Dict[str, MarketContext]:
+        """Bulk variant of _build_context: two queries for any number of agents."""
+        now = datetime.utcnow()
+        portfolios = {
+            row.agent_name: row
+            for row in db.query(Portfolio).with_entities(
+                Portfolio.agent_name, Portfolio.cash, Portfolio.positions
+            ).filter(
+                Portfolio.agent_name.in_(agent_names)
             )
-            
-            return {
-                "market_summary": market_summary,
-                "portfolio_context": portfolio_context,
-                "trading_conditions": trading_conditions,
-                "recommendations": recommendations,
-                "timestamp": datetime.utcnow().isoformat()
-            }
-            
-        finally:
-            db.close()
+        }
+        
+        stats_by_agent = defaultdict(list)
+        for row in _trade_stats_query(db, now, Trade.agent_name).filter(
+            Trade.agent_name.in_(agent_names)
+        ).group_by(Trade.agent_name, Trade.symbol):
+            stats_by_agent[row.agent_name].append(row)
+        
+        return {
+            agent_name: self._assemble_context(
+                stats_by_agent.get(agent_name, []), portfolios.get(agent_name), now
+            )
+            for agent_name in agent_names
+        }
     
-    def _build_market_summary(self, recent_trades: List) -> Dict[str, Any]:
-        """Summarize recent market activity."""
-        if not recent_trades:
+    def _assemble_context(self, symbol_stats: List, portfolio, now: datetime) -> MarketContext:
+        """Turn per-symbol trade stats and a (cash, positions) row into the context."""
+        pnl_count = sum(row.pnl_count for row in symbol_stats)
+        avg_pnl = sum(row.pnl_sum or 0.0 for row in symbol_stats) / pnl_count if pnl_count else None
+        
+        # Build context (portfolio arithmetic is done once, in the snapshot)
+        snapshot = _portfolio_snapshot(portfolio)
+        market_summary = self._build_market_summary(symbol_stats)
+        portfolio_context = self._build_portfolio_context(snapshot)
+        trading_conditions = self._assess_trading_conditions(
+            avg_pnl, snapshot.cash_percent if snapshot else None
+        )
+        recommendations = self._generate_contextual_recommendations(
+            market_summary, portfolio_context, trading_conditions
+        )
+        
+        return {
+            "market_summary": market_summary,
+            "portfolio_context": portfolio_context,
+            "trading_conditions": trading_conditions,
+            "recommendations": recommendations,
+            "timestamp": now.isoformat()
+        }
+    
+    def _build_market_summary(self, symbol_stats: List) -> MarketSummary:
+        """Summarize recent market activity from per-symbol (symbol, n, ...) rows."""
+        if not symbol_stats:
             return {
                 "activity_level": "LOW",
                 "most_active_symbols": [],
                 "trade_count_7d": 0
             }
         
-        # Count trades by symbol
-        symbol_counts = {}
-        for trade in recent_trades:
-            symbol_counts[trade.symbol] = symbol_counts.get(trade.symbol, 0) + 1
+        # Trades by symbol; most_common(3) heap-selects instead of sorting everything
+        symbol_counts = Counter({row.symbol: row.n for row in symbol_stats})
         
-        most_active = sorted(symbol_counts.items(), key=lambda x: x[1], reverse=True)[:3]
+        most_active = symbol_counts.most_common(3)
         
         # Determine activity level
-        trade_count = len(recent_trades)
-        if trade_count >= 15:
-            activity_level = "HIGH"
-        elif trade_count >= 7:
-            activity_level = "MODERATE"
-        else:
-            activity_level = "LOW"
+        trade_count = sum(symbol_counts.values())
+        activity_level = _ACTIVITY_LABELS[bisect_right(_ACTIVITY_THRESHOLDS, trade_count)]
         
         return {
             "activity_level": activity_level,
@@ -98,81 +446,66 @@ class MarketContextAnalyzer:
             "unique_symbols_traded": len(symbol_counts)
         }
     
-    def _build_portfolio_context(self, portfolio) -> Dict[str, Any]:
+    def _build_portfolio_context(self, snapshot: Optional[_PortfolioSnapshot]) -> PortfolioContext:
         """Build portfolio context."""
-        if not portfolio:
+        if not snapshot:
             return {
                 "position_count": 0,
                 "cash_percent": 100,
                 "concentration_risk": "NONE"
             }
         
-        positions = portfolio.positions or []
-        total_value = portfolio.cash
-        
-        # Calculate position values
-        position_values = []
-        for pos in positions:
-            pos_value = pos.get("value", 0)
-            total_value += pos_value
-            position_values.append(pos_value)
-        
-        # Cash percentage
-        cash_percent = (portfolio.cash / total_value * 100) if total_value > 0 else 100
-        
         # Concentration risk
-        if position_values:
-            max_position_percent = (max(position_values) / total_value * 100) if total_value > 0 else 0
-            
-            if max_position_percent > 40:
-                concentration = "HIGH"
-            elif max_position_percent > 25:
-                concentration = "MODERATE"
-            else:
-                concentration = "LOW"
+        if snapshot.symbols:
+            concentration = _CONCENTRATION_LABELS[
+                bisect_left(_CONCENTRATION_THRESHOLDS, snapshot.max_position_percent)
+            ]
         else:
             concentration = "NONE"
         
         return {
-            "position_count": len(positions),
-            "cash_percent": round(cash_percent, 1),
+            "position_count": len(snapshot.symbols),
+            "cash_percent": round(snapshot.cash_percent, 1),
             "concentration_risk": concentration,
-            "total_value": round(total_value, 2),
+            "total_value": round(snapshot.total_value, 2),
+            # Largest five positions (was the first five in storage order)
             "positions_summary": [
-                {"symbol": p.get("symbol"), "value": p.get("value")}
-                for p in positions[:5]
+                {"symbol": symbol, "value": value}
+                for value, symbol in heapq.nlargest(5, zip(snapshot.values, snapshot.symbols))
             ]
         }
     
-    def _assess_trading_conditions(self, recent_trades: List, portfolio) -> Dict[str, Any]:
-        """Assess current trading conditions."""
+    def _assess_trading_conditions(
+        self,
+        avg_pnl: Optional[float],
+        cash_percent: Optional[float]
+    ) -> TradingConditions:
+        """
+        Assess current trading conditions.
+        
+        Args:
+            avg_pnl: Average realized P&L over the window, None if nothing realized
+            cash_percent: Cash share of the portfolio, None when there is no portfolio
+        """
         conditions = {
             "recommended_action": "HOLD",
             "risk_level": "MODERATE",
             "reasons": []
         }
         
-        # Check recent performance
-        if recent_trades:
-            recent_pnls = [t.pnl for t in recent_trades if t.pnl is not None]
-            if recent_pnls:
-                avg_pnl = statistics.mean(recent_pnls)
-                
-                if avg_pnl > 50:
-                    conditions["recommended_action"] = "CONTINUE"
-                    conditions["risk_level"] = "LOW"
-                    conditions["reasons"].append("Strong recent performance")
-                elif avg_pnl < -50:
-                    conditions["recommended_action"] = "REDUCE"
-                    conditions["risk_level"] = "HIGH"
-                    conditions["reasons"].append("Poor recent performance")
+        # Check recent performance (avg_pnl is None when no trade has a realized P&L)
+        if avg_pnl is not None:
+            if avg_pnl > 50:
+                conditions["recommended_action"] = "CONTINUE"
+                conditions["risk_level"] = "LOW"
+                conditions["reasons"].append("Strong recent performance")
+            elif avg_pnl < -50:
+                conditions["recommended_action"] = "REDUCE"
+                conditions["risk_level"] = "HIGH"
+                conditions["reasons"].append("Poor recent performance")
         
         # Check portfolio allocation
-        if portfolio:
-            positions = portfolio.positions or []
-            total_value = portfolio.cash + sum(p.get("value", 0) for p in positions)
-            cash_percent = (portfolio.cash / total_value * 100) if total_value > 0 else 100
-            
+        if cash_percent is not None:
             if cash_percent < 20:
                 conditions["reasons"].append("Low cash reserves (<20%)")
                 conditions["risk_level"] = "HIGH"
@@ -184,36 +517,65 @@ class MarketContextAnalyzer:
     
     def _generate_contextual_recommendations(
         self,
-        market_summary: Dict,
-        portfolio_context: Dict,
-        trading_conditions: Dict
+        market_summary: MarketSummary,
+        portfolio_context: PortfolioContext,
+        trading_conditions: TradingConditions
     ) -> List[str]:
         """Generate actionable recommendations based on context."""
-        recommendations = []
-        
-        # Activity-based recommendations
-        if market_summary["activity_level"] == "LOW":
-            recommendations.append("📉 Low trading activity - Be selective, wait for quality setups")
-        elif market_summary["activity_level"] == "HIGH":
-            recommendations.append("📈 High trading activity - Ensure you're not overtrading")
-        
-        # Portfolio-based recommendations
-        if portfolio_context["cash_percent"] < 20:
-            recommendations.append("💰 Low cash (<20%) - Consider taking profits or reducing positions")
-        elif portfolio_context["cash_percent"] > 80:
-            recommendations.append("💵 High cash (>80%) - Look for entry opportunities")
-        
-        if portfolio_context["concentration_risk"] == "HIGH":
-            recommendations.append("⚠️ High concentration risk - Diversify portfolio")
-        
-        # Conditions-based recommendations
-        if trading_conditions["risk_level"] == "HIGH":
-            recommendations.append("🔴 High risk environment - Reduce position sizes")
-        
-        if not recommendations:
-            recommendations.append("✅ Conditions normal - Trade according to your strategy")
-        
-        return recommendations
+        recommendations = [
+            message
+            for applies, message in _RECOMMENDATION_RULES
+            if applies(market_summary, portfolio_context, trading_conditions)
+        ]
+        return recommendations or [_REC_CONDITIONS_NORMAL]
+
+
+# Correlation groups and scores are pure functions of the holdings, so they
+# are memoized by symbol set; unchanged portfolios skip the work entirely
+
+@lru_cache(maxsize=2048)
+def _correlation_groups(
+    symbols: FrozenSet[str],
+    new_symbol: Optional[str] = None
+) -> Tuple[Tuple[str, Tuple[str, ...]], ...]:
+    """Sector groups of two or more symbols as (sector, symbols) pairs."""
+    # Sorted so the cached result doesn't depend on set iteration order;
+    # the candidate symbol always comes last, after existing positions
+    candidates = sorted(symbols)
+    if new_symbol:
+        candidates.append(new_symbol)
+    
+    # Single pass: bucket every symbol by its (simplified) sector
+    by_sector = defaultdict(list)
+    for symbol in candidates:
+        sector = _SECTOR_MAP.get(symbol)
+        if sector:
+            by_sector[sector].append(symbol)
+    
+    return tuple(
+        (sector, tuple(by_sector[sector]))
+        for sector in _SECTOR_ORDER
+        if len(by_sector[sector]) >= 2
+    )
+
+
+@lru_cache(maxsize=2048)
+def _diversification_score(symbols: FrozenSet[str], new_symbol: Optional[str] = None) -> int:
+    """Diversification score 0-100 for a set of holdings (plus a candidate)."""
+    if not symbols:
+        return 100
+    
+    # Penalty for correlation: 15 points per correlated pair, i.e. per
+    # grouped symbol beyond the first of each group
+    groups = _correlation_groups(symbols, new_symbol)
+    correlated_pairs = sum(len(members) for _, members in groups) - len(groups)
+    score = 100 - 15 * correlated_pairs
+    
+    # Bonus for variety
+    if len(symbols) >= 5:
+        score += 10
+    
+    return max(0, min(100, score))
 
 
 class PortfolioCorrelationDetector:
@@ -224,11 +586,13 @@ class PortfolioCorrelationDetector:
     def analyze_portfolio_correlation(
         self,
         agent_name: str,
-        new_symbol: str = None
-    ) -> Dict[str, Any]:
+        new_symbol: str = None,
+        db: Optional[Session] = None
+    ) -> CorrelationAnalysis:
         """
         Analyse les corrélations dans le portfolio.
         Si new_symbol fourni, évalue l'impact d'ajouter ce symbole.
+        Pass `db` to reuse an open session.
         
         Returns:
             {
@@ -238,140 +602,92 @@ class PortfolioCorrelationDetector:
                 "recommendation": str
             }
         """
-        db = next(get_db())
+        cache_key = (agent_name, new_symbol)
+        redis_key = _correlation_key(agent_name, new_symbol)
+        cached = _cache_lookup(_correlation_cache, cache_key, redis_key)
+        if cached is not None:
+            return cached
+        
+        if db is None:
+            with get_db() as session:
+                result = self._analyze(agent_name, new_symbol, session)
+        else:
+            result = self._analyze(agent_name, new_symbol, db)
         
-        try:
-            portfolio = db.query(Portfolio).filter(
-                Portfolio.agent_name == agent_name
-            ).first()
-            
-            if not portfolio or not portfolio.positions:
-                return {
-                    "correlation_risk": "NONE",
-                    "correlated_positions": [],
-                    "diversification_score": 100,
-                    "recommendation": "Empty portfolio - no correlation risk"
-                }
-            
-            # Get current symbols
-            current_symbols = [p.get("symbol") for p in portfolio.positions]
-            
-            # Analyze correlations (simplified - in reality would use price correlation)
-            correlated_groups = self._identify_correlation_groups(current_symbols, new_symbol)
-            
-            # Calculate diversification score
-            diversification_score = self._calculate_diversification_score(
-                current_symbols, correlated_groups
-            )
-            
-            # Determine risk level
-            if diversification_score >= 70:
-                risk_level = "LOW"
-            elif diversification_score >= 40:
-                risk_level = "MODERATE"
-            else:
-                risk_level = "HIGH"
-            
-            # Generate recommendation
-            if new_symbol:
-                recommendation = self._generate_correlation_recommendation(
-                    new_symbol, current_symbols, correlated_groups, risk_level
-                )
-            else:
-                recommendation = f"Portfolio diversification: {diversification_score}/100"
-            
+        _cache_store(
+            _correlation_cache, cache_key, redis_key, result,
+            index_key=_correlation_index_key(agent_name)
+        )
+        return result
+    
+    def _analyze(self, agent_name: str, new_symbol: Optional[str], db: Session) -> CorrelationAnalysis:
+        """Load the agent's holdings and score their correlation."""
+        portfolio = _load_portfolio(db, agent_name)
+        
+        if not portfolio or not portfolio.positions:
             return {
-                "correlation_risk": risk_level,
-                "correlated_positions": correlated_groups,
-                "diversification_score": diversification_score,
-                "recommendation": recommendation,
-                "current_symbols": current_symbols
+                "correlation_risk": "NONE",
+                "correlated_positions": [],
+                "diversification_score": 100,
+                "recommendation": "Empty portfolio - no correlation risk"
             }
-            
-        finally:
-            db.close()
+        
+        # Get current symbols (positions are keyed by symbol)
+        current_symbols = list(portfolio.positions)
+        
+        # Analyze correlations (simplified - in reality would use price correlation)
+        correlated_groups = self._identify_correlation_groups(current_symbols, new_symbol)
+        
+        # Calculate diversification score
+        diversification_score = self._calculate_diversification_score(
+            current_symbols, new_symbol
+        )
+        
+        # Determine risk level
+        risk_level = _CORRELATION_RISK_LABELS[
+            bisect_right(_CORRELATION_RISK_THRESHOLDS, diversification_score)
+        ]
+        
+        # Generate recommendation
+        if new_symbol:
+            recommendation = self._generate_correlation_recommendation(
+                new_symbol, current_symbols, correlated_groups, risk_level
+            )
+        else:
+            recommendation = f"Portfolio diversification: {diversification_score}/100"
+        
+        return {
+            "correlation_risk": risk_level,
+            "correlated_positions": correlated_groups,
+            "diversification_score": diversification_score,
+            "recommendation": recommendation,
+            "current_symbols": current_symbols
+        }
     
     def _identify_correlation_groups(
         self,
         symbols: List[str],
         new_symbol: str = None
-    ) -> List[Dict[str, Any]]:
+    ) -> List[CorrelationGroup]:
         """Identify groups of correlated symbols (simplified)."""
-        # Simplified sector-based correlation
-        tech_stocks = ["AAPL", "MSFT", "GOOGL", "META", "NVDA", "AMD", "TSLA"]
-        crypto = ["BTCUSDT", "ETHUSDT", "BNBUSDT", "SOLUSDT"]
-        finance = ["JPM", "BAC", "GS", "WFC", "C"]
-        
-        groups = []
-        
-        # Check tech concentration
-        tech_in_portfolio = [s for s in symbols if s in tech_stocks]
-        if new_symbol and new_symbol in tech_stocks:
-            tech_in_portfolio.append(new_symbol)
-        
-        if len(tech_in_portfolio) >= 2:
-            groups.append({
-                "sector": "TECH",
-                "symbols": tech_in_portfolio,
-                "correlation": "HIGH"
-            })
-        
-        # Check crypto concentration
-        crypto_in_portfolio = [s for s in symbols if s in crypto]
-        if new_symbol and new_symbol in crypto:
-            crypto_in_portfolio.append(new_symbol)
-        
-        if len(crypto_in_portfolio) >= 2:
-            groups.append({
-                "sector": "CRYPTO",
-                "symbols": crypto_in_portfolio,
-                "correlation": "HIGH"
-            })
-        
-        # Check finance concentration
-        finance_in_portfolio = [s for s in symbols if s in finance]
-        if new_symbol and new_symbol in finance:
-            finance_in_portfolio.append(new_symbol)
-        
-        if len(finance_in_portfolio) >= 2:
-            groups.append({
-                "sector": "FINANCE",
-                "symbols": finance_in_portfolio,
-                "correlation": "HIGH"
-            })
-        
-        return groups
+        return [
+            {"sector": sector, "symbols": list(members), "correlation": "HIGH"}
+            for sector, members in _correlation_groups(frozenset(symbols), new_symbol)
+        ]
     
     def _calculate_diversification_score(
         self,
         symbols: List[str],
-        correlated_groups: List[Dict]
+        new_symbol: str = None
     ) -> int:
         """Calculate diversification score 0-100."""
-        if not symbols:
-            return 100
-        
-        # Base score
-        score = 100
-        
-        # Penalty for correlation
-        for group in correlated_groups:
-            group_size = len(group["symbols"])
-            # Deduct 15 points per correlated pair
-            penalty = (group_size - 1) * 15
-            score -= penalty
-        
-        # Bonus for variety
-        if len(symbols) >= 5:
-            score += 10
-        
-        return max(0, min(100, score))
+        return _diversification_score(frozenset(symbols), new_symbol)
     
     def _generate_correlation_recommendation(
         self,
         new_symbol: str,
         current_symbols: List[str],
-        correlated_groups: List[Dict],
+        correlated_groups: List[CorrelationGroup],
         risk_level: str
     ) -> str:
         """Generate recommendation about adding new symbol."""
@@ -391,13 +707,24 @@ class PortfolioCorrelationDetector:
 
 # Tool functions
 
-def get_market_context(agent_name: str) -> Dict[str, Any]:
+def get_market_context(agent_name: str) -> MarketContext:
     """Tool: Get comprehensive market context."""
     analyzer = MarketContextAnalyzer()
     return analyzer.get_comprehensive_context(agent_name)
 
 
-def check_portfolio_correlation(agent_name: str, new_symbol: str = None) -> Dict[str, Any]:
+def check_portfolio_correlation(agent_name: str, new_symbol: str = None) -> CorrelationAnalysis:
     """Tool: Check portfolio correlation and diversification."""
     detector = PortfolioCorrelationDetector()
     return detector.analyze_portfolio_correlation(agent_name, new_symbol)
+
+
+def get_full_context(agent_name: str, new_symbol: str = None) -> Dict[str, Any]:
+    """Tool: Market context and portfolio correlation, read in one DB session."""
+    with get_db() as db:
+        return {
+            "market_context": MarketContextAnalyzer().get_comprehensive_context(agent_name, db),
+            "portfolio_correlation": PortfolioCorrelationDetector().analyze_portfolio_correlation(
+                agent_name, new_symbol, db
+            ),
+        }
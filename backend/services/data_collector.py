@@ -2,32 +2,282 @@
 Data collection service for market data, news, and social sentiment.
 Aggregates data from multiple sources with caching.
 """
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, NamedTuple
 from datetime import datetime, timedelta
 import httpx
 import asyncio
-import json
+import numpy as np
+import orjson
+import re
+import redis.asyncio as redis
+import time
+import zlib
+from functools import lru_cache
 from config import get_settings
 from models.database import MarketData
+from sqlalchemy.dialects.postgresql import insert
 from database import get_db
+from services.cache_utils import RedisBackoff, single_flight
 import structlog
 
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
 logger = structlog.get_logger()
 settings = get_settings()
 
 
+# Category membership for asset filtering (frozensets: O(1) lookups on ~10k assets)
+_CATEGORY_SYMBOLS = {
+    "tech": frozenset({"AAPL", "MSFT", "GOOGL", "AMZN", "META", "NVDA", "TSLA", "NFLX"}),
+    "finance": frozenset({"JPM", "BAC", "GS", "MS", "C", "WFC", "BLK"}),
+    "healthcare": frozenset({"JNJ", "PFE", "UNH", "ABBV", "TMO", "MRNA", "LLY"}),
+}
+
+# Mock assets, indexed by category once at import
+_MOCK_ASSETS = (
+    {"symbol": "AAPL", "name": "Apple Inc", "exchange": "NASDAQ", "category": "tech"},
+    {"symbol": "MSFT", "name": "Microsoft Corp", "exchange": "NASDAQ", "category": "tech"},
+    {"symbol": "GOOGL", "name": "Alphabet Inc", "exchange": "NASDAQ", "category": "tech"},
+    {"symbol": "AMZN", "name": "Amazon.com Inc", "exchange": "NASDAQ", "category": "tech"},
+    {"symbol": "NVDA", "name": "NVIDIA Corp", "exchange": "NASDAQ", "category": "tech"},
+    {"symbol": "TSLA", "name": "Tesla Inc", "exchange": "NASDAQ", "category": "tech"},
+    {"symbol": "META", "name": "Meta Platforms Inc", "exchange": "NASDAQ", "category": "tech"},
+    {"symbol": "JPM", "name": "JPMorgan Chase & Co", "exchange": "NYSE", "category": "finance"},
+    {"symbol": "BAC", "name": "Bank of America Corp", "exchange": "NYSE", "category": "finance"},
+    {"symbol": "JNJ", "name": "Johnson & Johnson", "exchange": "NYSE", "category": "healthcare"},
+    {"symbol": "PFE", "name": "Pfizer Inc", "exchange": "NYSE", "category": "healthcare"},
+)
+_MOCK_ASSETS_BY_CATEGORY = {
+    _category: tuple(a for a in _MOCK_ASSETS if a["category"] == _category)
+    for _category in {a["category"] for a in _MOCK_ASSETS}
+}
+
+# Base prices for common symbols (mock quotes)
+_BASE_PRICES: Dict[str, float] = {
+    "AAPL": 180.0,
+    "MSFT": 380.0,
+    "GOOGL": 140.0,
+    "AMZN": 170.0,
+    "NVDA": 500.0,
+    "TSLA": 250.0,
+    "META": 480.0,
+    "JPM": 180.0,
+    "BAC": 35.0,
+    "JNJ": 160.0,
+    "PFE": 30.0,
+    "MRNA": 100.0,
+}
+
+# Mock headlines, formatted with the symbol
+_NEWS_TEMPLATES = (
+    "{sym} announces quarterly earnings beat",
+    "Analysts upgrade {sym} to buy",
+    "{sym} launches new product line",
+    "Market volatility affects {sym} trading",
+    "{sym} CEO discusses growth strategy",
+)
+
+class Bars(NamedTuple):
+    """OHLCV history as parallel float64/int64 arrays, oldest bar first."""
+    date: np.ndarray
+    open: np.ndarray
+    high: np.ndarray
+    low: np.ndarray
+    close: np.ndarray
+    volume: np.ndarray
+
+
+def bars_from_dicts(historical: List[Dict[str, Any]]) -> Bars:
+    """Convert the list-of-dicts bars returned by the API into column arrays."""
+    return Bars(
+        date=np.array([bar["date"] for bar in historical]),
+        open=np.fromiter((bar["open"] for bar in historical), np.float64, len(historical)),
+        high=np.fromiter((bar["high"] for bar in historical), np.float64, len(historical)),
+        low=np.fromiter((bar["low"] for bar in historical), np.float64, len(historical)),
+        close=np.fromiter((bar["close"] for bar in historical), np.float64, len(historical)),
+        volume=np.fromiter((bar["volume"] for bar in historical), np.int64, len(historical)),
+    )
+
+
+def bars_to_dicts(bars: Bars) -> List[Dict[str, Any]]:
+    """Convert column arrays back to the list-of-dicts shape served by the API."""
+    return [
+        {"date": date, "open": o, "high": h, "low": l, "close": c, "volume": v}
+        for date, o, h, l, c, v in zip(
+            bars.date.tolist(), bars.open.tolist(), bars.high.tolist(),
+            bars.low.tolist(), bars.close.tolist(), bars.volume.tolist(),
+        )
+    ]
+
+
+# Random source for cache TTL jitter
+_rng = np.random.default_rng()
+
+
+def _ema_loop(closes: np.ndarray, period: int) -> float:
+    """EMA recurrence seeded with the first close, as a plain loop for numba."""
+    multiplier = 2.0 / (period + 1)
+    ema = closes[0]
+    for i in range(1, closes.size):
+        ema = closes[i] * multiplier + ema * (1.0 - multiplier)
+    return ema
+
+
+if NUMBA_AVAILABLE:
+    _ema_kernel = njit(cache=True, fastmath=True)(_ema_loop)
+    _ema_kernel(np.ones(2), 2)  # Compile at import, off the request path
+else:
+    _ema_kernel = None
+
+
+def _parse_articles(articles: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Keep the NewsAPI article fields we serve."""
+    return [
+        {
+            "title": article.get("title"),
+            "description": article.get("description"),
+            "source": (article.get("source") or {}).get("name"),
+            "url": article.get("url"),
+            "publishedAt": article.get("publishedAt"),
+        }
+        for article in articles
+    ]
+
+
+@lru_cache(maxsize=1024)
+def _mock_news(symbol: str, as_of: datetime) -> tuple:
+    """Mock headlines for a symbol, built once per (symbol, hour)."""
+    description = f"Latest update on {symbol} company developments."
+    return tuple(
+        {
+            "title": template.format(sym=symbol),
+            "description": description,
+            "source": "Mock News",
+            "url": "https://example.com",
+            "publishedAt": (as_of - timedelta(days=i)).isoformat(),
+            "is_mock": True,
+        }
+        for i, template in enumerate(_NEWS_TEMPLATES)
+    )
+
+
+@lru_cache(maxsize=1024)
+def _symbol_rng(symbol: str) -> np.random.Generator:
+    """
+    Per-symbol random source for mock data.
+    
+    Seeded with crc32 rather than hash(), which is salted per process, so a
+    symbol's mock stream is the same on every run.
+    """
+    return np.random.default_rng(zlib.crc32(symbol.encode()))
+
+
+def _split_cache_key(key: str) -> tuple:
+    """
+    Map a cache key to its (data_type, symbol) columns.
+    
+    Everything after the first underscore is the "symbol" column, so
+    "hist_AAPL_1w" -> ("hist", "AAPL_1w") and the period/days stay part of
+    the key. Reads and writes must agree on this split.
+    """
+    data_type, _, symbol = key.partition("_")
+    return data_type, symbol or key
+
+
+def _read_db_cache(key: str) -> Optional[tuple]:
+    """Blocking read of an unexpired market_data row as (data, expires_at)."""
+    data_type, symbol = _split_cache_key(key)
+    with get_db() as db:
+        return db.query(MarketData.data, MarketData.expires_at).filter(
+            MarketData.symbol == symbol,
+            MarketData.data_type == data_type,
+            MarketData.expires_at > datetime.utcnow(),
+        ).first()
+
+
+def _write_db_cache(stmt) -> None:
+    """Blocking execution of a market_data upsert."""
+    with get_db() as db:
+        db.execute(stmt)
+        db.commit()
+
+
 class DataCollector:
     """Collect and cache market data from multiple sources."""
     
+    # Shared HTTP connection pool (keep-alive avoids a TLS handshake per request)
+    HTTP_MAX_CONNECTIONS = 100
+    HTTP_MAX_KEEPALIVE = 40
+    HTTP_KEEPALIVE_EXPIRY = 30  # Seconds
+    PRICE_FETCH_CONCURRENCY = 10  # Max in-flight price lookups across all callers
+    MEMORY_CACHE_MAX_ENTRIES = 4096
+    REDIS_KEY_PREFIX = "md:"
+    CACHE_TTL_JITTER = 0.1  # +/-10% on every cache TTL
+    # Hours to cache daily bars per period. Longer windows move less when
+    # today's still-forming bar changes, so they can be reused for longer.
+    HISTORY_CACHE_HOURS = {"1d": 1, "1w": 2, "1m": 4, "3m": 6}
+    MOCK_CACHE_HOURS = 1  # Retry real sources soon after a fallback
+    NEWS_CACHE_HOURS = 6
+    NEWS_PAGE_SIZE = 100  # NewsAPI maximum results per request
+    NEWS_ARTICLES_PER_SYMBOL = 20
+    NEWS_BULK_MIN_ARTICLES = 1  # Fewer bulk matches than this: fetch the symbol on its own
+    
+    # Indicator windows
+    RSI_PERIOD = 14
+    BAND_PERIOD = 20  # Bollinger bands and SMA
+    
     def __init__(self):
-        self.timeout = 15.0
-        self._cache = {}  # In-memory cache
-        
+        # Fail fast per phase instead of one 15s budget, so a slow or
+        # saturated upstream falls back to mock data quickly
+        self.timeout = httpx.Timeout(connect=2.0, read=8.0, write=2.0, pool=1.0)
+        self._cache: Dict[str, tuple] = {}  # In-memory cache: key -> (expires_at, data)
+        self._bars: Dict[str, tuple] = {}  # Column form of cached history: key -> (source list, Bars)
+        self._http: Optional[httpx.AsyncClient] = None  # Created lazily by _client()
+        # Shared cache tier between workers: memory -> Redis -> market_data table
+        self._redis = RedisBackoff(redis.Redis, "cache_redis_failed")
+        self._inflight: Dict[str, asyncio.Future] = {}  # Single-flight request keys
+        # Process-wide cap so batch lookups don't trip Alpaca/Binance rate limits
+        self._price_semaphore = asyncio.Semaphore(self.PRICE_FETCH_CONCURRENCY)
+    
+    def _client(self) -> httpx.AsyncClient:
+        """Get the shared pooled HTTP client, creating it on first use."""
+        if self._http is None or self._http.is_closed:
+            # HTTP/2 multiplexes concurrent requests over one connection per host;
+            # compressed JSON bodies are decoded transparently by httpx
+            self._http = httpx.AsyncClient(
+                http2=True,
+                headers={"Accept-Encoding": "gzip, deflate"},
+                timeout=self.timeout,
+                limits=httpx.Limits(
+                    max_connections=self.HTTP_MAX_CONNECTIONS,
+                    max_keepalive_connections=self.HTTP_MAX_KEEPALIVE,
+                    keepalive_expiry=self.HTTP_KEEPALIVE_EXPIRY,
+                ),
+            )
+        return self._http
+    
+    async def aclose(self) -> None:
+        """Close the shared HTTP and Redis clients (called on application shutdown)."""
+        if self._http is not None:
+            await self._http.aclose()
+            self._http = None
+        if self._redis.client is not None:
+            await self._redis.client.aclose()
+            self._redis.client = None
+    
     async def get_current_price(self, symbol: str) -> Dict[str, Any]:
         """
         Get current price for stock or crypto.
         Routes crypto symbols to Binance, stocks to Alpaca.
         """
+        return await single_flight(self._inflight, f"price_{symbol}", lambda: self._fetch_current_price(symbol))
+    
+    async def _fetch_current_price(self, symbol: str) -> Dict[str, Any]:
+        """Fetch a current price from Binance/Alpaca, falling back to mock data."""
         # Detect crypto vs stock
         is_crypto = symbol.upper().endswith(('USDT', 'BUSD', 'USDC', 'BTC', 'ETH', 'BNB'))
         
@@ -55,39 +305,45 @@ class DataCollector:
         # Fallback to mock data
         return await self._get_mock_price(symbol)
     
-
+    async def get_current_prices(self, symbols: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Get current prices for many symbols concurrently.
+        
+        At most PRICE_FETCH_CONCURRENCY lookups run at once. Symbols whose
+        lookup raises are logged and left out of the result.
+        """
+        async def fetch(symbol: str) -> Dict[str, Any]:
+            async with self._price_semaphore:
+                return await self.get_current_price(symbol)
+        
+        results = await asyncio.gather(
+            *(fetch(symbol) for symbol in symbols),
+            return_exceptions=True
+        )
+        
+        prices = {}
+        for symbol, price_data in zip(symbols, results):
+            if isinstance(price_data, Exception):
+                logger.warning("price_fetch_failed", symbol=symbol, error=str(price_data))
+                continue
+            prices[symbol] = price_data
+        return prices
     
     def _get_mock_price_sync(self, symbol: str) -> Dict[str, Any]:
         """Generate mock price data for testing (synchronous)."""
-        import random
-        
-        # Base prices for common symbols
-        base_prices = {
-            "AAPL": 180.0,
-            "MSFT": 380.0,
-            "GOOGL": 140.0,
-            "AMZN": 170.0,
-            "NVDA": 500.0,
-            "TSLA": 250.0,
-            "META": 480.0,
-            "JPM": 180.0,
-            "BAC": 35.0,
-            "JNJ": 160.0,
-            "PFE": 30.0,
-            "MRNA": 100.0,
-        }
+        rng = _symbol_rng(symbol)
         
-        base_price = base_prices.get(symbol, 100.0)
+        base_price = _BASE_PRICES.get(symbol, 100.0)
         # Add random variation ±5%
-        price = base_price * (1 + random.uniform(-0.05, 0.05))
-        change = random.uniform(-5, 5)
+        price = base_price * (1 + rng.uniform(-0.05, 0.05))
+        change = rng.uniform(-5, 5)
         
         return {
             "symbol": symbol,
             "price": round(price, 2),
             "change": round(change, 2),
             "change_percent": f"{(change/price)*100:.2f}%",
-            "volume": random.randint(1000000, 50000000),
+            "volume": int(rng.integers(1000000, 50000000, endpoint=True)),
             "is_mock": True,
         }
     
@@ -113,6 +369,39 @@ class DataCollector:
         if cached:
             return cached
         
+        return await single_flight(
+            self._inflight, cache_key, lambda: self._fetch_historical_data(symbol, period, cache_key)
+        )
+    
+    async def get_historical_bars(self, symbol: str, period: str) -> Bars:
+        """
+        Get historical OHLCV data as column arrays for numeric work.
+        
+        The conversion runs once per cached history list and is reused until
+        that list is replaced in the cache.
+        """
+        historical = await self.get_historical_data(symbol, period)
+        cache_key = f"hist_{symbol}_{period}"
+        
+        entry = self._bars.get(cache_key)
+        if entry is not None and entry[0] is historical:
+            return entry[1]
+        
+        bars = bars_from_dicts(historical or [])
+        if len(self._bars) >= self.MEMORY_CACHE_MAX_ENTRIES:
+            self._bars.clear()
+        self._bars[cache_key] = (historical, bars)
+        return bars
+    
+    async def _fetch_historical_data(
+        self,
+        symbol: str,
+        period: str,
+        cache_key: str
+    ) -> List[Dict[str, Any]]:
+        """Fetch bars from Binance/Alpaca (mock on failure) and cache them."""
+        cache_hours = self.HISTORY_CACHE_HOURS.get(period, 1)
+        
         # Calculate date range
         days_map = {"1d": 1, "1w": 7, "1m": 30, "3m": 90}
         days = days_map.get(period, 30)
@@ -135,7 +424,7 @@ class DataCollector:
                         period=period,
                         bars=len(data)
                     )
-                    await self._save_to_cache(cache_key, data, hours=1)
+                    await self._save_to_cache(cache_key, data, hours=cache_hours)
                     return data
             except Exception as e:
                 logger.warning("binance_historical_fetch_failed", symbol=symbol, error=str(e))
@@ -146,7 +435,7 @@ class DataCollector:
                 alpaca = get_alpaca_connector()
                 data = await alpaca.get_historical_data(symbol, period)
                 if data:
-                    await self._save_to_cache(cache_key, data, hours=1)
+                    await self._save_to_cache(cache_key, data, hours=cache_hours)
                     return data
             except Exception as e:
                 logger.warning("alpaca_historical_fetch_failed", symbol=symbol, error=str(e))
@@ -155,7 +444,7 @@ class DataCollector:
         data = self._generate_mock_historical(symbol, days)
         
         # Cache result
-        await self._save_to_cache(cache_key, data, hours=1)
+        await self._save_to_cache(cache_key, data, hours=self.MOCK_CACHE_HOURS)
         return data
     
     def _generate_mock_historical(
@@ -163,50 +452,106 @@ class DataCollector:
         symbol: str, 
         days: int
     ) -> List[Dict[str, Any]]:
-        """Generate mock historical data."""
-        import random
-        from datetime import datetime, timedelta
-        
-        current_price = self._get_mock_price_sync(symbol)["price"]
-        data = []
-        
-        for i in range(days):
-            date = datetime.now() - timedelta(days=days-i)
-            # Random walk
-            change_pct = random.uniform(-0.03, 0.03)
-            open_price = current_price
-            high = open_price * (1 + abs(change_pct) + random.uniform(0, 0.02))
-            low = open_price * (1 - abs(change_pct) - random.uniform(0, 0.02))
-            close = open_price * (1 + change_pct)
-            current_price = close
-            
-            data.append({
-                "date": date.strftime("%Y-%m-%d"),
-                "open": round(open_price, 2),
-                "high": round(high, 2),
-                "low": round(low, 2),
-                "close": round(close, 2),
-                "volume": random.randint(10000000, 100000000),
-            })
-        
-        return data
+        """Generate mock historical data (vectorized random walk)."""
+        start_price = self._get_mock_price_sync(symbol)["price"]
+        rng = _symbol_rng(symbol)
+        
+        # Daily moves; each day opens at the previous close
+        change_pct = rng.uniform(-0.03, 0.03, days)
+        closes = start_price * np.cumprod(1 + change_pct)
+        opens = np.concatenate(([start_price], closes[:-1]))
+        spread = np.abs(change_pct)
+        highs = opens * (1 + spread + rng.uniform(0, 0.02, days))
+        lows = opens * (1 - spread - rng.uniform(0, 0.02, days))
+        volumes = rng.integers(10000000, 100000000, days, endpoint=True)
+        
+        # Calendar days ending yesterday, oldest first
+        today = np.datetime64(datetime.now().date(), "D")
+        dates = np.datetime_as_string(today - np.arange(days, 0, -1), unit="D")
+        
+        return bars_to_dicts(Bars(
+            date=dates,
+            open=np.round(opens, 2),
+            high=np.round(highs, 2),
+            low=np.round(lows, 2),
+            close=np.round(closes, 2),
+            volume=volumes,
+        ))
     
 
     
     async def get_news(self, symbol: str, days: int = 7) -> List[Dict[str, Any]]:
         """Get recent news for a symbol."""
         cache_key = f"news_{symbol}_{days}"
-        cached = await self._get_from_cache(cache_key, hours=6)
+        cached = await self._get_from_cache(cache_key, hours=self.NEWS_CACHE_HOURS)
         if cached:
             return cached
         
+        return await single_flight(
+            self._inflight, cache_key, lambda: self._fetch_news(symbol, days, cache_key)
+        )
+    
+    async def get_news_bulk(
+        self,
+        symbols: List[str],
+        days: int = 7
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Get recent news for many symbols with a single NewsAPI request.
+        
+        Cached symbols are served from cache; the rest are queried together
+        with "AAPL OR MSFT OR ..." and articles are assigned to every symbol
+        named in their title or description. Symbols the page barely mentions
+        (the busiest tickers crowd out the rest) fall back to one get_news
+        call each.
+        """
+        cached = await asyncio.gather(*(
+            self._get_from_cache(f"news_{symbol}_{days}", hours=self.NEWS_CACHE_HOURS)
+            for symbol in symbols
+        ))
+        result = {symbol: news for symbol, news in zip(symbols, cached) if news}
+        missing = [symbol for symbol in dict.fromkeys(symbols) if symbol not in result]
+        
+        if not missing:
+            return result
+        
+        if not settings.news_api_key:
+            fetched = {symbol: self._generate_mock_news(symbol) for symbol in missing}
+        else:
+            fetched = await self._fetch_news_api_bulk(missing, days)
+            sparse = [
+                symbol for symbol, news in fetched.items()
+                if len(news) < self.NEWS_BULK_MIN_ARTICLES
+            ]
+            if sparse:
+                # Per-symbol requests, each cached on its own
+                news = await asyncio.gather(*(self.get_news(symbol, days) for symbol in sparse))
+                result.update(zip(sparse, news))
+                for symbol in sparse:
+                    del fetched[symbol]
+        
+        await asyncio.gather(*(
+            self._save_to_cache(f"news_{symbol}_{days}", news, hours=self._news_cache_hours(news))
+            for symbol, news in fetched.items()
+        ))
+        result.update(fetched)
+        return result
+    
+    def _news_cache_hours(self, news: List[Dict[str, Any]]) -> int:
+        """Cache lifetime for a news list: mock fallbacks are never pinned for hours."""
+        if news and news[0].get("is_mock"):
+            return self.MOCK_CACHE_HOURS
+        return self.NEWS_CACHE_HOURS
+    
+    async def _fetch_news(self, symbol: str, days: int, cache_key: str) -> List[Dict[str, Any]]:
+        """Fetch news (NewsAPI or mock) and cache it."""
         if not settings.news_api_key:
             # Return mock news
             news = self._generate_mock_news(symbol)
         else:
             news = await self._fetch_news_api(symbol, days)
         
-        await self._save_to_cache(cache_key, news, hours=6)
+        await self._save_to_cache(cache_key, news, hours=self._news_cache_hours(news))
         return news
     
     async def _fetch_news_api(self, symbol: str, days: int) -> List[Dict[str, Any]]:
@@ -223,48 +568,72 @@ class DataCollector:
                 "apiKey": settings.news_api_key,
             }
             
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.get(url, params=params)
-                response.raise_for_status()
-                data = response.json()
-                
-                articles = []
-                for article in data.get("articles", [])[:20]:
-                    articles.append({
-                        "title": article.get("title"),
-                        "description": article.get("description"),
-                        "source": article.get("source", {}).get("name"),
-                        "url": article.get("url"),
-                        "publishedAt": article.get("publishedAt"),
-                    })
-                
-                return articles
+            response = await self._client().get(url, params=params)
+            response.raise_for_status()
+            data = orjson.loads(response.content)
+            
+            return _parse_articles(data.get("articles", [])[:self.NEWS_ARTICLES_PER_SYMBOL])
+        except httpx.PoolTimeout:
+            # Every pooled connection is busy: serve mock news now, no retry
+            logger.warning("news_pool_timeout", symbol=symbol)
+            return self._generate_mock_news(symbol)
         except Exception as e:
             logger.error("news_fetch_error", symbol=symbol, error=str(e))
             return self._generate_mock_news(symbol)
     
+    async def _fetch_news_api_bulk(
+        self,
+        symbols: List[str],
+        days: int
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Fetch news for several symbols in one NewsAPI request.
+        
+        Only the first page is read, so symbols may come back with few or no
+        articles when the query matches more than NEWS_PAGE_SIZE results.
+        """
+        try:
+            from_date = (datetime.now() - timedelta(days=days)).strftime("%Y-%m-%d")
+            
+            url = "https://newsapi.org/v2/everything"
+            params = {
+                "q": " OR ".join(symbols),
+                "from": from_date,
+                "sortBy": "publishedAt",
+                "language": "en",
+                "pageSize": self.NEWS_PAGE_SIZE,
+                "apiKey": settings.news_api_key,
+            }
+            
+            response = await self._client().get(url, params=params)
+            response.raise_for_status()
+            data = orjson.loads(response.content)
+        except httpx.PoolTimeout:
+            logger.warning("news_pool_timeout", symbols=symbols)
+            return {symbol: self._generate_mock_news(symbol) for symbol in symbols}
+        except Exception as e:
+            logger.error("news_bulk_fetch_error", symbols=symbols, error=str(e))
+            return {symbol: self._generate_mock_news(symbol) for symbol in symbols}
+        
+        articles = data.get("articles", [])
+        
+        # Whole-token match: a bare substring test files "said" under AI and most headlines under C
+        mentions = re.compile(
+            r"\b(?:" + "|".join(map(re.escape, sorted(symbols, key=len, reverse=True))) + r")\b"
+        )
+        by_symbol: Dict[str, List[Dict[str, Any]]] = {symbol: [] for symbol in symbols}
+        for article, parsed in zip(articles, _parse_articles(articles)):
+            text = f"{article.get('title') or ''} {article.get('description') or ''}"
+            for symbol in set(mentions.findall(text)):
+                if len(by_symbol[symbol]) < self.NEWS_ARTICLES_PER_SYMBOL:
+                    by_symbol[symbol].append(parsed)
+        
+        return by_symbol
+    
     def _generate_mock_news(self, symbol: str) -> List[Dict[str, Any]]:
         """Generate mock news for testing."""
-        templates = [
-            f"{symbol} announces quarterly earnings beat",
-            f"Analysts upgrade {symbol} to buy",
-            f"{symbol} launches new product line",
-            f"Market volatility affects {symbol} trading",
-            f"{symbol} CEO discusses growth strategy",
-        ]
-        
-        news = []
-        for i, title in enumerate(templates):
-            news.append({
-                "title": title,
-                "description": f"Latest update on {symbol} company developments.",
-                "source": "Mock News",
-                "url": "https://example.com",
-                "publishedAt": (datetime.now() - timedelta(days=i)).isoformat(),
-                "is_mock": True,
-            })
-        
-        return news
+        as_of = datetime.now().replace(minute=0, second=0, microsecond=0)
+        return list(_mock_news(symbol, as_of))
     
     async def search_twitter(self, query: str) -> List[Dict[str, Any]]:
         """Search Twitter/X (requires X API credentials)."""
@@ -281,54 +650,98 @@ class DataCollector:
         key: str, 
         hours: int
     ) -> Optional[Any]:
-        """Get data from cache if not expired."""
+        """Get data from cache if not expired (memory first, then the database)."""
+        entry = self._cache.get(key)
+        if entry is not None:
+            if entry[0] > time.monotonic():
+                return entry[1]
+            del self._cache[key]
+        
+        client = self._redis.get()
+        if client is not None:
+            try:
+                async with client.pipeline(transaction=False) as pipe:
+                    raw, ttl = await pipe.get(self.REDIS_KEY_PREFIX + key).ttl(
+                        self.REDIS_KEY_PREFIX + key
+                    ).execute()
+                if raw is not None:
+                    data = orjson.loads(raw)
+                    self._remember(key, data, max(ttl, 0))
+                    return data
+            except redis.RedisError as e:
+                self._redis.failed(e, key=key)
+        
+        # Only a miss in both faster tiers pays for a pooled DB session,
+        # and that blocking round trip runs off the event loop
         try:
-            with get_db() as db:
-                cached = db.query(MarketData).filter(
-                    MarketData.symbol == key.split("_")[1] if "_" in key else key,
-                    MarketData.data_type == key.split("_")[0] if "_" in key else key,
-                    MarketData.expires_at > datetime.utcnow(),
-                ).first()
-                
-                if cached:
-                    return cached.data
+            cached = await asyncio.to_thread(_read_db_cache, key)
         except Exception as e:
             logger.warning("cache_read_failed", key=key, error=str(e))
+            return None
+        
+        if cached is None:
+            return None
         
-        return None
+        # Keep it in memory for the rest of its database lifetime
+        data, expires_at = cached
+        self._remember(key, data, (expires_at - datetime.utcnow()).total_seconds())
+        return data
     
     async def _save_to_cache(
         self, 
         key: str, 
         data: Any, 
-        hours: int
+        hours: float
     ) -> None:
-        """Save data to cache with expiration."""
+        """
+        Save data to cache with expiration.
+        
+        The TTL is jittered by CACHE_TTL_JITTER so entries seeded together
+        don't all expire, and get refetched, at the same moment.
+        """
+        ttl_seconds = hours * 3600 * _rng.uniform(1 - self.CACHE_TTL_JITTER, 1 + self.CACHE_TTL_JITTER)
+        self._remember(key, data, ttl_seconds)
+        
+        client = self._redis.get()
+        if client is not None:
+            try:
+                await client.set(self.REDIS_KEY_PREFIX + key, orjson.dumps(data), ex=int(ttl_seconds))
+            except redis.RedisError as e:
+                self._redis.failed(e, key=key)
+        
         try:
-            parts = key.split("_", 1)
-            data_type = parts[0]
-            symbol = parts[1] if len(parts) > 1 else key
+            data_type, symbol = _split_cache_key(key)
+            now = datetime.utcnow()
+            expires_at = now + timedelta(seconds=ttl_seconds)
+            
+            # Single upsert on the (symbol, data_type) unique constraint
+            stmt = insert(MarketData).values(
+                symbol=symbol,
+                data_type=data_type,
+                data=data,
+                created_at=now,
+                expires_at=expires_at,
+            ).on_conflict_do_update(
+                constraint="uq_symbol_data_type",
+                set_={"data": data, "created_at": now, "expires_at": expires_at},
+            )
             
-            with get_db() as db:
-                # Delete existing
-                db.query(MarketData).filter(
-                    MarketData.symbol == symbol,
-                    MarketData.data_type == data_type,
-                ).delete()
-                
-                # Insert new
-                cache_entry = MarketData(
-                    symbol=symbol,
-                    data_type=data_type,
-                    data=data,
-                    expires_at=datetime.utcnow() + timedelta(hours=hours),
-                )
-                db.add(cache_entry)
-                db.commit()
+            await asyncio.to_thread(_write_db_cache, stmt)
         except Exception as e:
             logger.warning("cache_write_failed", key=key, error=str(e))
 
     
+    def _remember(self, key: str, data: Any, ttl_seconds: float) -> None:
+        """Store data in the in-memory cache for ttl_seconds."""
+        if len(self._cache) >= self.MEMORY_CACHE_MAX_ENTRIES:
+            # Drop expired entries first, then the oldest insert if still full
+            now = time.monotonic()
+            for stale_key in [k for k, (expires_at, _) in self._cache.items() if expires_at <= now]:
+                del self._cache[stale_key]
+            if len(self._cache) >= self.MEMORY_CACHE_MAX_ENTRIES:
+                del self._cache[next(iter(self._cache))]
+        self._cache[key] = (time.monotonic() + ttl_seconds, data)
+    
     async def get_all_tradable_assets(
         self,
         category: Optional[str] = None
@@ -348,13 +761,7 @@ class DataCollector:
             
             # Simple category filtering based on exchanges and common patterns
             if category:
-                category_filters = {
-                    "tech": ["AAPL", "MSFT", "GOOGL", "AMZN", "META", "NVDA", "TSLA", "NFLX"],
-                    "finance": ["JPM", "BAC", "GS", "MS", "C", "WFC", "BLK"],
-                    "healthcare": ["JNJ", "PFE", "UNH", "ABBV", "TMO", "MRNA", "LLY"],
-                }
-                
-                filter_symbols = category_filters.get(category.lower(), [])
+                filter_symbols = _CATEGORY_SYMBOLS.get(category.lower())
                 if filter_symbols:
                     assets = [a for a in assets if a["symbol"] in filter_symbols]
             
@@ -367,23 +774,9 @@ class DataCollector:
     
     def _generate_mock_assets(self, category: Optional[str] = None) -> List[Dict[str, Any]]:
         """Generate mock asset data for testing."""
-        all_assets = [
-            {"symbol": "AAPL", "name": "Apple Inc", "exchange": "NASDAQ", "category": "tech"},
-            {"symbol": "MSFT", "name": "Microsoft Corp", "exchange": "NASDAQ", "category": "tech"},
-            {"symbol": "GOOGL", "name": "Alphabet Inc", "exchange": "NASDAQ", "category": "tech"},
-            {"symbol": "AMZN", "name": "Amazon.com Inc", "exchange": "NASDAQ", "category": "tech"},
-            {"symbol": "NVDA", "name": "NVIDIA Corp", "exchange": "NASDAQ", "category": "tech"},
-            {"symbol": "TSLA", "name": "Tesla Inc", "exchange": "NASDAQ", "category": "tech"},
-            {"symbol": "META", "name": "Meta Platforms Inc", "exchange": "NASDAQ", "category": "tech"},
-            {"symbol": "JPM", "name": "JPMorgan Chase & Co", "exchange": "NYSE", "category": "finance"},
-            {"symbol": "BAC", "name": "Bank of America Corp", "exchange": "NYSE", "category": "finance"},
-            {"symbol": "JNJ", "name": "Johnson & Johnson", "exchange": "NYSE", "category": "healthcare"},
-            {"symbol": "PFE", "name": "Pfizer Inc", "exchange": "NYSE", "category": "healthcare"},
-        ]
-        
         if category:
-            return [a for a in all_assets if a.get("category") == category.lower()]
-        return all_assets
+            return list(_MOCK_ASSETS_BY_CATEGORY.get(category.lower(), ()))
+        return list(_MOCK_ASSETS)
     
     async def get_index_prices(self) -> Dict[str, Any]:
         """Get prices for major market indices via ETFs."""
@@ -393,9 +786,14 @@ class DataCollector:
             "DIA": "Dow Jones",
         }
         
+        # Fetched concurrently: wall time is the slowest lookup, not the sum
+        prices = await self.get_current_prices(list(indices))
+        
         result = {}
         for symbol, name in indices.items():
-            price_data = await self.get_current_price(symbol)
+            price_data = prices.get(symbol)
+            if price_data is None:
+                continue
             result[symbol] = {
                 "name": name,
                 "price": price_data.get("price"),
@@ -418,44 +816,40 @@ class DataCollector:
             indicators: List of indicators to calculate (RSI, MACD, BOLLINGER)
         """
         # Get historical data (need at least 30 days for RSI)
-        historical = await self.get_historical_data(symbol, "3m")
+        bars = await self.get_historical_bars(symbol, "3m")
         
-        if not historical or len(historical) < 14:
+        if len(bars.close) < 14:
             return {"error": "Insufficient data for technical indicators"}
         
-        # Extract close prices
-        closes = [bar["close"] for bar in historical]
+        # The windows the indicators read are sliced once here and shared between them
+        closes = bars.close
+        ctx = {
+            "closes": closes,
+            "deltas": np.diff(closes[-(self.RSI_PERIOD + 1):]),
+            "recent20": closes[-self.BAND_PERIOD:],
+        }
         
         result = {}
         
         for indicator in indicators:
-            indicator_upper = indicator.upper()
+            entry = _INDICATORS.get(indicator.lower())
+            if entry is None:
+                continue
             
-            if indicator_upper == "RSI":
-                result["RSI"] = self._calculate_rsi(closes)
-            elif indicator_upper == "MACD":
-                result["MACD"] = self._calculate_macd(closes)
-            elif indicator_upper == "BOLLINGER":
-                result["BOLLINGER"] = self._calculate_bollinger_bands(closes)
-            elif indicator_upper == "SMA":
-                result["SMA"] = self._calculate_sma(closes, 20)
+            name, calculate = entry
+            if name not in result:
+                result[name] = calculate(self, ctx)
         
         return {"symbol": symbol, "indicators": result}
     
-    def _calculate_rsi(self, closes: List[float], period: int = 14) -> Dict[str, Any]:
-        """Calculate Relative Strength Index."""
-        if len(closes) < period + 1:
+    def _calculate_rsi(self, deltas: np.ndarray, period: int = 14) -> Dict[str, Any]:
+        """Calculate Relative Strength Index from the last `period` price changes."""
+        if len(deltas) < period:
             return {"value": None, "signal": "neutral"}
         
-        # Calculate price changes
-        deltas = [closes[i] - closes[i-1] for i in range(1, len(closes))]
-        
         # Separate gains and losses
-        gains = [d if d > 0 else 0 for d in deltas[-period:]]
-        losses = [-d if d < 0 else 0 for d in deltas[-period:]]
-        
-        avg_gain = sum(gains) / period
-        avg_loss = sum(losses) / period
+        avg_gain = float(np.clip(deltas, 0, None).mean())
+        avg_loss = float(-np.clip(deltas, None, 0).mean())
         
         if avg_loss == 0:
             rsi = 100
@@ -468,7 +862,7 @@ class DataCollector:
         
         return {"value": round(rsi, 2), "signal": signal}
     
-    def _calculate_macd(self, closes: List[float]) -> Dict[str, Any]:
+    def _calculate_macd(self, closes: np.ndarray) -> Dict[str, Any]:
         """Calculate MACD (Moving Average Convergence Divergence)."""
         if len(closes) < 26:
             return {"macd": None, "signal": None, "histogram": None}
@@ -494,32 +888,35 @@ class DataCollector:
             "trend": trend
         }
     
-    def _calculate_ema(self, closes: List[float], period: int) -> float:
-        """Calculate Exponential Moving Average."""
-        multiplier = 2 / (period + 1)
-        ema = closes[0]
+    def _calculate_ema(self, closes: np.ndarray, period: int) -> float:
+        """
+        Calculate Exponential Moving Average (seeded with the first close).
         
-        for price in closes[1:]:
-            ema = (price * multiplier) + (ema * (1 - multiplier))
+        Runs the recurrence ema = price * k + ema * (1 - k) as a compiled loop
+        when numba is installed. Otherwise it is unrolled into one weighted sum:
+        the i-th of n later closes carries k * (1 - k)^(n - i), the seed (1 - k)^n.
+        """
+        if _ema_kernel is not None:
+            return float(_ema_kernel(closes, period))
         
-        return ema
+        multiplier = 2 / (period + 1)
+        decay = 1 - multiplier
+        n = len(closes) - 1
+        weights = multiplier * decay ** np.arange(n - 1, -1, -1, dtype=np.float64)
+        return float(closes[0] * decay ** n + np.dot(weights, closes[1:]))
     
-    def _calculate_bollinger_bands(self, closes: List[float], period: int = 20) -> Dict[str, Any]:
-        """Calculate Bollinger Bands."""
-        if len(closes) < period:
+    def _calculate_bollinger_bands(self, recent: np.ndarray, period: int = 20) -> Dict[str, Any]:
+        """Calculate Bollinger Bands over the last `period` closes."""
+        if len(recent) < period:
             return {"upper": None, "middle": None, "lower": None}
         
-        recent = closes[-period:]
-        sma = sum(recent) / period
-        
-        # Calculate standard deviation
-        variance = sum((x - sma) ** 2 for x in recent) / period
-        std_dev = variance ** 0.5
+        sma = float(recent.mean())
+        std_dev = float(recent.std())  # Population std (ddof=0)
         
         upper = sma + (2 * std_dev)
         lower = sma - (2 * std_dev)
         
-        current_price = closes[-1]
+        current_price = float(recent[-1])
         
         # Determine position
         if current_price > upper:
@@ -537,13 +934,21 @@ class DataCollector:
             "position": position
         }
     
-    def _calculate_sma(self, closes: List[float], period: int) -> float:
-        """Calculate Simple Moving Average."""
-        if len(closes) < period:
-            return closes[-1]
+    def _calculate_sma(self, recent: np.ndarray, period: int) -> float:
+        """Calculate Simple Moving Average over the last `period` closes."""
+        if len(recent) < period:
+            return float(recent[-1])
         
-        recent = closes[-period:]
-        return round(sum(recent) / period, 2)
+        return round(float(recent.mean()), 2)
+
+
+# Indicator dispatch: lowercase name -> (result key, calculator over the shared windows)
+_INDICATORS = {
+    "rsi": ("RSI", lambda c, ctx: c._calculate_rsi(ctx["deltas"], c.RSI_PERIOD)),
+    "macd": ("MACD", lambda c, ctx: c._calculate_macd(ctx["closes"])),
+    "bollinger": ("BOLLINGER", lambda c, ctx: c._calculate_bollinger_bands(ctx["recent20"], c.BAND_PERIOD)),
+    "sma": ("SMA", lambda c, ctx: c._calculate_sma(ctx["recent20"], c.BAND_PERIOD)),
+}
 
 
 # Singleton
@@ -2,15 +2,297 @@
 Advanced Multi-Factor Decision Engine
 Combines technical indicators, sentiment, market conditions into sophisticated scoring.
 """
-from typing import Dict, Any, List, Optional, Tuple
+from typing import Dict, Any, List, Optional, Tuple, Mapping, Sequence, Iterator
 from datetime import datetime, timedelta
+import numpy as np
 import structlog
+import time
+from sqlalchemy import func, case
+from sqlalchemy.orm import Session
+from config import get_settings
 from database import get_db
-from models.database import Trade, TradeStatus, Decision
-import statistics
-import math
+from models.database import Trade, TradeStatus, TradeAction, TradeOutcome, Decision
+from services.scoring_kernels import (
+    technical_kernel,
+    momentum_kernel,
+    sentiment_kernel,
+    risk_reward_kernel,
+    confluence_kernel,
+    REGIME_BONUS,
+    ECONOMIC_IMPACT_PENALTY,
+)
 
 logger = structlog.get_logger()
+settings = get_settings()
+
+# Resolved once: structlog isn't level-filtered here, so debug events are
+# only built (and emitted) when the configured log level asks for them
+_LOG_DEBUG = settings.log_level == "DEBUG"
+
+
+# Similar-trade statistics per (agent, symbol, action): (expires_at, (total, successful))
+SIMILAR_STATS_TTL = 3600  # Seconds
+SIMILAR_STATS_MAX_ENTRIES = 4096
+_similar_stats_cache: Dict[Tuple[str, str, str], Tuple[float, Tuple[int, int]]] = {}
+
+
+# Posterior thresholds (lower bound inclusive) and the recommendation for each bin
+_EDGE_BINS = np.array([0.45, 0.55, 0.65])
+_EDGE_RECOMMENDATIONS = (
+    "Negative historical edge - avoid or reduce size",
+    "Neutral - no clear edge",
+    "Slight positive edge - acceptable risk",
+    "Strong historical edge - favorable setup",
+)
+
+
+def _cached_stats(key: Tuple[str, str, str]) -> Optional[Tuple[int, int]]:
+    entry = _similar_stats_cache.get(key)
+    if entry is not None and time.monotonic() < entry[0]:
+        return entry[1]
+    return None
+
+
+def _store_stats(key: Tuple[str, str, str], stats: Tuple[int, int]) -> None:
+    if len(_similar_stats_cache) >= SIMILAR_STATS_MAX_ENTRIES:
+        _similar_stats_cache.clear()
+    _similar_stats_cache[key] = (time.monotonic() + SIMILAR_STATS_TTL, stats)
+
+
+def _num(value: Any) -> float:
+    """Scalar kernel input: None -> NaN (missing)."""
+    return np.nan if value is None else float(value)
+
+
+def _present(value: float) -> bool:
+    """Scalar equivalent of the `if value:` checks on state fields (NaN and 0 are missing)."""
+    return value == value and value != 0  # NaN != NaN
+
+
+def _or(value: float, default: float) -> float:
+    return value if value == value else default
+
+
+def _extract_indicator_state(
+    data: Dict[str, Any],
+    context: Optional[Dict[str, Any]] = None
+) -> Dict[str, Any]:
+    """
+    Read every scoring input once, flattening the nested macd/bollinger dicts.
+    
+    Sub-scores, the signal narrative and the confluence detector all work from
+    this state (missing values are NaN) instead of re-walking the raw dicts.
+    Keys match the calculate_scores_batch column names.
+    """
+    macd = data.get("macd") or {}
+    bollinger = data.get("bollinger") or {}
+    context = context or {}
+    return {
+        "current_price": _num(data.get("current_price")),
+        "rsi": _num(data.get("rsi")),
+        "macd": _num(macd.get("macd")),
+        "macd_signal": _num(macd.get("signal")),
+        "has_bands": bool(bollinger),
+        "bb_lower": _num(bollinger.get("lower")),
+        "bb_upper": _num(bollinger.get("upper")),
+        "bb_middle": _num(bollinger.get("middle")),
+        "sma_50": _num(data.get("sma_50")),
+        "sma_200": _num(data.get("sma_200")),
+        "change_1d": _num(data.get("change_1d", 0)),
+        "change_7d": _num(data.get("change_7d", 0)),
+        "volume_ratio": _num(data.get("volume_ratio", 1.0)),
+        "adx": _num(data.get("adx")),
+        "atr_percent": _num(data.get("atr_percent")),
+        "nearest_support": _num(data.get("nearest_support")),
+        "nearest_resistance": _num(data.get("nearest_resistance")),
+        "fear_greed_index": _num(context.get("fear_greed_index")),
+        "regime_bonus": REGIME_BONUS.get(context.get("market_regime"), 0.0),
+        "news_sentiment": _num(context.get("news_sentiment")),
+        "eco_penalty": ECONOMIC_IMPACT_PENALTY.get(context.get("economic_impact", "LOW"), 0.0),
+    }
+
+
+# ========== Batch scoring kernels (one array op per rule, all symbols at once) ==========
+
+def _column(table: Mapping[str, Any], name: str, n: int, default: float = np.nan) -> np.ndarray:
+    """Column `name` as a float array of length n (scalars broadcast, None -> NaN)."""
+    return np.broadcast_to(np.asarray(table.get(name, default), dtype=np.float64), (n,))
+
+
+def _lookup(table: Mapping[str, Any], name: str, n: int, values: Dict[str, float]) -> np.ndarray:
+    """Map the string category column `name` through `values` (unknown -> 0)."""
+    labels = table.get(name)
+    if labels is None or isinstance(labels, str):
+        return np.full(n, values.get(labels, 0.0))
+    return np.fromiter((values.get(label, 0.0) for label in labels), dtype=np.float64, count=n)
+
+
+def _given(values: np.ndarray) -> np.ndarray:
+    """Batch equivalent of the scalar `if value:` checks (missing and 0 are skipped)."""
+    return ~np.isnan(values) & (values != 0)
+
+
+def _technical_scores(t: Mapping[str, Any], n: int) -> np.ndarray:
+    rsi = _column(t, "rsi", n)
+    macd = _column(t, "macd", n)
+    signal = _column(t, "macd_signal", n)
+    price = _column(t, "current_price", n)
+    lower = _column(t, "bb_lower", n)
+    upper = _column(t, "bb_upper", n)
+    middle = _column(t, "bb_middle", n)
+    sma_50 = _column(t, "sma_50", n)
+    sma_200 = _column(t, "sma_200", n)
+    
+    score = np.full(n, 50.0)
+    score += np.where(
+        _given(rsi),
+        np.select([rsi < 30, rsi < 40, rsi > 70, rsi > 60], [15, 10, -15, -10], 0),
+        0,
+    )
+    score += np.where(_given(macd) & _given(signal), np.where(macd > signal, 10, -10), 0)
+    score += np.where(
+        _given(price) & _given(lower) & _given(upper) & _given(middle),
+        np.select([price <= lower * 1.02, price >= upper * 0.98, price > middle], [12, -12, 5], -5),
+        0,
+    )
+    score += np.where(_given(sma_50) & _given(sma_200), np.where(sma_50 > sma_200, 8, -8), 0)
+    return np.clip(score, 0, 100)
+
+
+def _momentum_scores(t: Mapping[str, Any], n: int) -> np.ndarray:
+    change_1d = np.nan_to_num(_column(t, "change_1d", n, 0))
+    change_7d = np.nan_to_num(_column(t, "change_7d", n, 0))
+    volume_ratio = np.nan_to_num(_column(t, "volume_ratio", n, 1.0), nan=1.0)
+    adx = _column(t, "adx", n)
+    rising = np.where(change_1d > 0, 1, -1)
+    
+    score = np.full(n, 50.0)
+    score += np.select(
+        [
+            (change_1d > 3) & (change_7d > 10),
+            (change_1d > 1) & (change_7d > 5),
+            (change_1d < -3) & (change_7d < -10),
+            (change_1d < -1) & (change_7d < -5),
+        ],
+        [20, 10, -20, -10],
+        0,
+    )
+    score += np.where(volume_ratio > 1.5, 15 * rising, 0)
+    score += np.where(_given(adx) & (adx > 25), 10 * rising, 0)
+    return np.clip(score, 0, 100)
+
+
+def _sentiment_scores(c: Mapping[str, Any], n: int) -> np.ndarray:
+    fear_greed = _column(c, "fear_greed_index", n)
+    regime_bonus = _lookup(c, "market_regime", n, REGIME_BONUS)
+    news = _column(c, "news_sentiment", n)
+    eco_penalty = _lookup(c, "economic_impact", n, ECONOMIC_IMPACT_PENALTY)
+    
+    score = np.full(n, 50.0)
+    score += np.where(
+        _given(fear_greed),
+        np.select([fear_greed < 25, fear_greed < 45, fear_greed > 75, fear_greed > 55], [20, 10, -20, -10], 0),
+        0,
+    )
+    score += regime_bonus
+    score += np.where(_given(news), np.select([news > 0.3, news < -0.3], [10, -10], 0), 0)
+    score -= eco_penalty
+    return np.clip(score, 0, 100)
+
+
+def _risk_reward_scores(t: Mapping[str, Any], n: int) -> np.ndarray:
+    support = _column(t, "nearest_support", n)
+    resistance = _column(t, "nearest_resistance", n)
+    price = _column(t, "current_price", n)
+    atr = _column(t, "atr_percent", n)
+    
+    with np.errstate(divide="ignore", invalid="ignore"):
+        downside = (price - support) / price * 100
+        upside = (resistance - price) / price * 100
+        rr_ratio = upside / downside
+    
+    score = np.full(n, 50.0)
+    score += np.where(
+        _given(support) & _given(resistance) & _given(price) & (downside > 0),
+        np.select([rr_ratio > 3, rr_ratio > 2, rr_ratio > 1.5, rr_ratio < 1], [25, 15, 5, -20], 0),
+        0,
+    )
+    score += np.where(_given(atr), np.select([(atr > 1) & (atr < 3), atr > 5], [10, -15], 0), 0)
+    return np.clip(score, 0, 100)
+
+
+def _confluence_scores(t: Mapping[str, Any], n: int) -> np.ndarray:
+    rsi = _column(t, "rsi", n)
+    macd = np.nan_to_num(_column(t, "macd", n, 0))
+    signal = np.nan_to_num(_column(t, "macd_signal", n, 0))
+    price = _column(t, "current_price", n)
+    sma_50 = _column(t, "sma_50", n)
+    lower = _column(t, "bb_lower", n)
+    upper = _column(t, "bb_upper", n)
+    has_bands = ~(np.isnan(lower) & np.isnan(upper) & np.isnan(_column(t, "bb_middle", n)))
+    change_1d = np.nan_to_num(_column(t, "change_1d", n, 0))
+    
+    # MACD and daily change always vote; the others only when their inputs exist
+    bullish = (macd > signal).astype(np.int64) + (change_1d > 0)
+    bearish = (macd <= signal).astype(np.int64) + (change_1d <= 0)
+    
+    has_rsi = _given(rsi)
+    bullish += has_rsi & (rsi < 40)
+    bearish += has_rsi & (rsi > 60)
+    
+    has_sma = _given(price) & _given(sma_50)
+    bullish += has_sma & (price > sma_50)
+    bearish += has_sma & (price <= sma_50)
+    
+    in_bands = has_bands & _given(price)
+    bullish += in_bands & (price < np.nan_to_num(lower, nan=np.inf))
+    bearish += in_bands & ~(price < np.nan_to_num(lower, nan=np.inf)) & (price > np.nan_to_num(upper, nan=0))
+    
+    ratio = np.maximum(bullish, bearish) / (bullish + bearish)
+    return np.select([ratio >= 0.8, ratio >= 0.6], [100.0, 60.0], 20.0)
+
+
+# Sub-score -> (batch kernel, input table)
+_BATCH_KERNELS = {
+    "technical": (_technical_scores, "technical"),
+    "momentum": (_momentum_scores, "technical"),
+    "sentiment": (_sentiment_scores, "context"),
+    "risk_reward": (_risk_reward_scores, "technical"),
+    "confluence": (_confluence_scores, "technical"),
+}
+
+# Sub-scores and their weights in the total
+_SCORE_KEYS = ("technical", "momentum", "sentiment", "risk_reward", "confluence")
+_WEIGHTS = (
+    0.35,   # 35% - indicateurs techniques
+    0.25,   # 25% - momentum et tendance
+    0.20,   # 20% - sentiment de marché
+    0.15,   # 15% - ratio risque/rendement
+    0.05,   # 5% - bonus de confluence
+)
+
+# Human-readable text for each signal code, formatted with the signal's value
+SIGNAL_TEMPLATES = {
+    "RSI_OVERSOLD": "RSI oversold ({:.1f}) - bullish signal",
+    "RSI_OVERBOUGHT": "RSI overbought ({:.1f}) - bearish signal",
+    "MACD_BULL": "MACD bullish crossover",
+    "MACD_BEAR": "MACD bearish crossover",
+    "MOMENTUM_POSITIVE": "Strong positive momentum",
+    "MOMENTUM_NEGATIVE": "Strong negative momentum",
+    "SENTIMENT_BULLISH": "Bullish market sentiment",
+    "SENTIMENT_BEARISH": "Bearish market sentiment",
+    "HIGH_CONFLUENCE": "⭐ High signal confluence - strong setup",
+}
+
+
+def format_signals(signals: Sequence[Tuple[str, float]]) -> List[str]:
+    """Render (code, value) signals from MultiFactorScorer as text."""
+    return [SIGNAL_TEMPLATES[code].format(value) for code, value in signals]
+
+
+# Score thresholds (lower bound inclusive) and the recommendation for each bin
+_RECOMMENDATION_BINS = np.array([25, 40, 60, 75])
+_RECOMMENDATION_LABELS = np.array(["STRONG_SELL", "SELL", "NEUTRAL", "BUY", "STRONG_BUY"], dtype=object)
 
 
 class MultiFactorScorer:
@@ -19,24 +301,25 @@ class MultiFactorScorer:
     Score final: 0-100 (plus élevé = meilleur setup)
     """
     
+    __slots__ = ("_weight_vec",)
+    
     def __init__(self):
-        self.weights = {
-            "technical": 0.35,      # 35% - indicateurs techniques
-            "momentum": 0.25,       # 25% - momentum et tendance
-            "sentiment": 0.20,      # 20% - sentiment de marché
-            "risk_reward": 0.15,    # 15% - ratio risque/rendement
-            "confluence": 0.05,     # 5% - bonus de confluence
-        }
+        # Weights as a vector, so totals are a single dot product
+        self._weight_vec = np.array(_WEIGHTS, dtype=np.float64)
     
     def calculate_score(
         self,
         symbol: str,
         technical_data: Dict[str, Any],
-        market_context: Dict[str, Any]
+        market_context: Dict[str, Any],
+        render_signals: bool = True
     ) -> Dict[str, Any]:
         """
         Calcule le score multi-facteurs complet.
         
+        With render_signals=False, "signals" holds (code, value) pairs; callers
+        ranking many symbols can format only the ones they show via format_signals().
+        
         Returns:
             {
                 "total_score": 0-100,
@@ -45,34 +328,45 @@ class MultiFactorScorer:
                 "recommendation": "STRONG_BUY" | "BUY" | "NEUTRAL" | "SELL" | "STRONG_SELL"
             }
         """
+        # Un seul passage sur les indicateurs, partagé par tous les sous-scores
+        state = _extract_indicator_state(technical_data, market_context)
         scores = {}
         
         # 1. Score technique (RSI, MACD, Bollinger, etc.)
-        scores["technical"] = self._calculate_technical_score(technical_data)
+        scores["technical"] = self._calculate_technical_score(state)
         
         # 2. Score de momentum et tendance
-        scores["momentum"] = self._calculate_momentum_score(technical_data)
+        scores["momentum"] = self._calculate_momentum_score(state)
         
         # 3. Score de sentiment
-        scores["sentiment"] = self._calculate_sentiment_score(market_context)
+        scores["sentiment"] = self._calculate_sentiment_score(state)
         
         # 4. Score risque/rendement
-        scores["risk_reward"] = self._calculate_risk_reward_score(technical_data)
+        scores["risk_reward"] = self._calculate_risk_reward_score(state)
         
         # 5. Bonus de confluence (signaux alignés)
-        scores["confluence"] = self._calculate_confluence_bonus(technical_data)
+        scores["confluence"] = self._calculate_confluence_bonus(state)
         
         # Score total pondéré
-        total_score = sum(
-            scores[key] * self.weights[key] 
-            for key in scores.keys()
-        )
+        score_vec = np.fromiter((scores[key] for key in _SCORE_KEYS), dtype=np.float64, count=len(_SCORE_KEYS))
+        total_score = float(score_vec @ self._weight_vec)
         
         # Recommandation basée sur le score
         recommendation = self._get_recommendation(total_score)
         
         # Liste des signaux détectés
-        signals = self._extract_signals(technical_data, scores)
+        signals = self._extract_signals(state, scores)
+        if render_signals:
+            signals = format_signals(signals)
+        
+        if _LOG_DEBUG:
+            logger.debug(
+                "decision_score_computed",
+                symbol=symbol,
+                total_score=round(total_score, 2),
+                breakdown={k: round(v, 2) for k, v in scores.items()},
+                recommendation=recommendation
+            )
         
         return {
             "total_score": round(total_score, 2),
@@ -82,293 +376,142 @@ class MultiFactorScorer:
             "timestamp": datetime.utcnow().isoformat()
         }
     
-    def _calculate_technical_score(self, data: Dict[str, Any]) -> float:
+    def calculate_scores_batch(
+        self,
+        symbols: Sequence[str],
+        technical: Mapping[str, Any],
+        market_context: Mapping[str, Any]
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Calcule le score multi-facteurs de plusieurs symboles en une passe vectorisée.
+        
+        `technical` maps flat column names to one value per symbol (a dict of
+        lists/arrays or a pandas DataFrame): current_price, rsi, macd,
+        macd_signal, bb_lower, bb_upper, bb_middle, sma_50, sma_200,
+        change_1d, change_7d, volume_ratio, adx, atr_percent,
+        nearest_support, nearest_resistance. `market_context` uses the
+        calculate_score keys, each a scalar shared by all symbols or a column.
+        Missing values are None/NaN. Same scores as calculate_score, without
+        the per-symbol "signals" narrative.
+        """
+        n = len(symbols)
+        tables = {"technical": technical, "context": market_context}
+        matrix = np.column_stack([
+            kernel(tables[source], n)
+            for kernel, source in (_BATCH_KERNELS[key] for key in _SCORE_KEYS)
+        ])
+        totals = matrix @ self._weight_vec
+        recommendations = _RECOMMENDATION_LABELS[np.searchsorted(_RECOMMENDATION_BINS, totals, side="right")]
+        
+        timestamp = datetime.utcnow().isoformat()
+        return {
+            symbol: {
+                "total_score": round(total, 2),
+                "breakdown": {key: round(value, 2) for key, value in zip(_SCORE_KEYS, row)},
+                "recommendation": recommendation,
+                "timestamp": timestamp,
+            }
+            for symbol, total, row, recommendation in zip(
+                symbols, totals.tolist(), matrix.tolist(), recommendations.tolist()
+            )
+        }
+    
+    def _calculate_technical_score(self, state: Dict[str, Any]) -> float:
         """Score basé sur les indicateurs techniques (0-100)"""
-        score = 50.0  # neutral par défaut
-        
-        # RSI analysis
-        rsi = data.get("rsi")
-        if rsi:
-            if rsi < 30:  # Oversold - bullish
-                score += 15
-            elif rsi < 40:
-                score += 10
-            elif rsi > 70:  # Overbought - bearish
-                score -= 15
-            elif rsi > 60:
-                score -= 10
-        
-        # MACD analysis
-        macd = data.get("macd", {})
-        if macd:
-            macd_line = macd.get("macd")
-            signal_line = macd.get("signal")
-            if macd_line and signal_line:
-                if macd_line > signal_line:  # Bullish
-                    score += 10
-                else:  # Bearish
-                    score -= 10
-        
-        # Bollinger Bands
-        bollinger = data.get("bollinger", {})
-        if bollinger:
-            price = data.get("current_price")
-            lower = bollinger.get("lower")
-            upper = bollinger.get("upper")
-            middle = bollinger.get("middle")
-            
-            if price and lower and upper and middle:
-                # Prix près de la bande inférieure = bullish
-                if price <= lower * 1.02:
-                    score += 12
-                # Prix près de la bande supérieure = bearish
-                elif price >= upper * 0.98:
-                    score -= 12
-                # Prix au-dessus de la moyenne = légèrement bullish
-                elif price > middle:
-                    score += 5
-                else:
-                    score -= 5
-        
-        # SMA analysis (50 vs 200)
-        sma_50 = data.get("sma_50")
-        sma_200 = data.get("sma_200")
-        if sma_50 and sma_200:
-            if sma_50 > sma_200:  # Golden cross territory
-                score += 8
-            else:  # Death cross territory
-                score -= 8
-        
-        return max(0, min(100, score))
-    
-    def _calculate_momentum_score(self, data: Dict[str, Any]) -> float:
+        return technical_kernel(
+            state["rsi"],
+            state["macd"],
+            state["macd_signal"],
+            state["current_price"],
+            state["bb_lower"],
+            state["bb_upper"],
+            state["bb_middle"],
+            state["sma_50"],
+            state["sma_200"],
+        )
+    
+    def _calculate_momentum_score(self, state: Dict[str, Any]) -> float:
         """Score basé sur le momentum et la tendance (0-100)"""
-        score = 50.0
-        
-        # Price change (daily, weekly)
-        change_1d = data.get("change_1d", 0)
-        change_7d = data.get("change_7d", 0)
-        
-        # Momentum positif fort
-        if change_1d > 3 and change_7d > 10:
-            score += 20
-        elif change_1d > 1 and change_7d > 5:
-            score += 10
-        # Momentum négatif fort
-        elif change_1d < -3 and change_7d < -10:
-            score -= 20
-        elif change_1d < -1 and change_7d < -5:
-            score -= 10
-        
-        # Volume analysis
-        volume_ratio = data.get("volume_ratio", 1.0)  # vs average
-        if volume_ratio > 1.5:  # Volume élevé
-            # Volume élevé + momentum positif = très bullish
-            if change_1d > 0:
-                score += 15
-            # Volume élevé + momentum négatif = très bearish
-            else:
-                score -= 15
-        
-        # ADX (trend strength)
-        adx = data.get("adx")
-        if adx:
-            if adx > 25:  # Tendance forte
-                # Si price monte avec tendance forte = bullish
-                if change_1d > 0:
-                    score += 10
-                else:
-                    score -= 10
-        
-        return max(0, min(100, score))
+        return momentum_kernel(
+            state["change_1d"],
+            state["change_7d"],
+            state["volume_ratio"],
+            state["adx"],
+        )
     
-    def _calculate_sentiment_score(self, context: Dict[str, Any]) -> float:
+    def _calculate_sentiment_score(self, state: Dict[str, Any]) -> float:
         """Score basé sur le sentiment de marché (0-100)"""
-        score = 50.0
-        
-        # Fear & Greed Index
-        fear_greed = context.get("fear_greed_index")
-        if fear_greed:
-            if fear_greed < 25:  # Extreme fear = contrarian buy
-                score += 20
-            elif fear_greed < 45:  # Fear
-                score += 10
-            elif fear_greed > 75:  # Extreme greed = contrarian sell
-                score -= 20
-            elif fear_greed > 55:  # Greed
-                score -= 10
-        
-        # Market regime
-        market_regime = context.get("market_regime")
-        if market_regime:
-            if market_regime == "BULL_MARKET":
-                score += 15
-            elif market_regime == "BEAR_MARKET":
-                score -= 15
-            # SIDEWAYS = neutral, no change
-        
-        # News sentiment
-        news_sentiment = context.get("news_sentiment")
-        if news_sentiment:
-            if news_sentiment > 0.3:  # Positive
-                score += 10
-            elif news_sentiment < -0.3:  # Negative
-                score -= 10
-        
-        # Economic events impact
-        eco_impact = context.get("economic_impact", "LOW")
-        if eco_impact == "HIGH":
-            # High impact events = reduce score (caution)
-            score -= 15
-        
-        return max(0, min(100, score))
-    
-    def _calculate_risk_reward_score(self, data: Dict[str, Any]) -> float:
+        return sentiment_kernel(
+            state["fear_greed_index"],
+            state["regime_bonus"],
+            state["news_sentiment"],
+            state["eco_penalty"],
+        )
+    
+    def _calculate_risk_reward_score(self, state: Dict[str, Any]) -> float:
         """Score basé sur le ratio risque/rendement (0-100)"""
-        score = 50.0
-        
-        # Support/Resistance levels
-        support = data.get("nearest_support")
-        resistance = data.get("nearest_resistance")
-        current_price = data.get("current_price")
-        
-        if support and resistance and current_price:
-            # Distance to support (risk)
-            downside_risk = (current_price - support) / current_price * 100
-            # Distance to resistance (reward)
-            upside_potential = (resistance - current_price) / current_price * 100
-            
-            # Risk/Reward ratio
-            if downside_risk > 0:
-                rr_ratio = upside_potential / downside_risk
-                
-                if rr_ratio > 3:  # Excellent R:R (1:3+)
-                    score += 25
-                elif rr_ratio > 2:  # Good R:R (1:2)
-                    score += 15
-                elif rr_ratio > 1.5:  # Acceptable R:R
-                    score += 5
-                elif rr_ratio < 1:  # Poor R:R
-                    score -= 20
-        
-        # Volatility (ATR)
-        atr_percent = data.get("atr_percent")
-        if atr_percent:
-            # Volatilité modérée = meilleur score
-            if 1 < atr_percent < 3:
-                score += 10
-            # Volatilité extrême = risqué
-            elif atr_percent > 5:
-                score -= 15
-        
-        return max(0, min(100, score))
-    
-    def _calculate_confluence_bonus(self, data: Dict[str, Any]) -> float:
+        return risk_reward_kernel(
+            state["nearest_support"],
+            state["nearest_resistance"],
+            state["current_price"],
+            state["atr_percent"],
+        )
+    
+    def _calculate_confluence_bonus(self, state: Dict[str, Any]) -> float:
         """Bonus quand plusieurs signaux sont alignés (0-100)"""
-        bullish_signals = 0
-        bearish_signals = 0
-        
-        # Check RSI
-        rsi = data.get("rsi")
-        if rsi:
-            if rsi < 40:
-                bullish_signals += 1
-            elif rsi > 60:
-                bearish_signals += 1
-        
-        # Check MACD
-        macd = data.get("macd", {})
-        if macd.get("macd", 0) > macd.get("signal", 0):
-            bullish_signals += 1
-        else:
-            bearish_signals += 1
-        
-        # Check price vs SMA
-        current_price = data.get("current_price")
-        sma_50 = data.get("sma_50")
-        if current_price and sma_50:
-            if current_price > sma_50:
-                bullish_signals += 1
-            else:
-                bearish_signals += 1
-        
-        # Check Bollinger position
-        bollinger = data.get("bollinger", {})
-        if bollinger and current_price:
-            if current_price < bollinger.get("lower", float('inf')):
-                bullish_signals += 1
-            elif current_price > bollinger.get("upper", 0):
-                bearish_signals += 1
-        
-        # Check price change
-        if data.get("change_1d", 0) > 0:
-            bullish_signals += 1
-        else:
-            bearish_signals += 1
-        
-        # Confluence score based on agreement
-        total_signals = bullish_signals + bearish_signals
-        if total_signals > 0:
-            # Strong confluence = beaucoup de signaux dans la même direction
-            max_direction = max(bullish_signals, bearish_signals)
-            confluence_ratio = max_direction / total_signals
-            
-            if confluence_ratio >= 0.8:  # 80%+ agreement
-                return 100
-            elif confluence_ratio >= 0.6:  # 60%+ agreement
-                return 60
-            else:
-                return 20
-        
-        return 50
+        return confluence_kernel(
+            state["rsi"],
+            _or(state["macd"], 0.0),
+            _or(state["macd_signal"], 0.0),
+            state["current_price"],
+            state["sma_50"],
+            state["has_bands"],
+            _or(state["bb_lower"], np.inf),
+            _or(state["bb_upper"], 0.0),
+            state["change_1d"],
+        )
     
     def _get_recommendation(self, score: float) -> str:
         """Convertit le score en recommandation"""
-        if score >= 75:
-            return "STRONG_BUY"
-        elif score >= 60:
-            return "BUY"
-        elif score >= 40:
-            return "NEUTRAL"
-        elif score >= 25:
-            return "SELL"
-        else:
-            return "STRONG_SELL"
+        return _RECOMMENDATION_LABELS[int(np.searchsorted(_RECOMMENDATION_BINS, score, side="right"))]
     
-    def _extract_signals(self, data: Dict[str, Any], scores: Dict[str, float]) -> List[str]:
-        """Extract human-readable signals from the analysis"""
+    def _extract_signals(self, state: Dict[str, Any], scores: Dict[str, float]) -> List[Tuple[str, float]]:
+        """Extract the detected signals as (code, value) pairs (see SIGNAL_TEMPLATES)"""
         signals = []
         
         # Technical signals
-        rsi = data.get("rsi")
-        if rsi:
+        rsi = state["rsi"]
+        if _present(rsi):
             if rsi < 30:
-                signals.append(f"RSI oversold ({rsi:.1f}) - bullish signal")
+                signals.append(("RSI_OVERSOLD", rsi))
             elif rsi > 70:
-                signals.append(f"RSI overbought ({rsi:.1f}) - bearish signal")
+                signals.append(("RSI_OVERBOUGHT", rsi))
         
         # MACD signals
-        macd = data.get("macd", {})
-        if macd.get("macd", 0) > macd.get("signal", 0):
-            signals.append("MACD bullish crossover")
+        macd = _or(state["macd"], 0.0)
+        if macd > _or(state["macd_signal"], 0.0):
+            signals.append(("MACD_BULL", macd))
         else:
-            signals.append("MACD bearish crossover")
+            signals.append(("MACD_BEAR", macd))
         
         # Trend signals
-        if scores.get("momentum", 50) > 60:
-            signals.append("Strong positive momentum")
-        elif scores.get("momentum", 50) < 40:
-            signals.append("Strong negative momentum")
+        momentum = scores.get("momentum", 50)
+        if momentum > 60:
+            signals.append(("MOMENTUM_POSITIVE", momentum))
+        elif momentum < 40:
+            signals.append(("MOMENTUM_NEGATIVE", momentum))
         
         # Sentiment signals
-        if scores.get("sentiment", 50) > 65:
-            signals.append("Bullish market sentiment")
-        elif scores.get("sentiment", 50) < 35:
-            signals.append("Bearish market sentiment")
+        sentiment = scores.get("sentiment", 50)
+        if sentiment > 65:
+            signals.append(("SENTIMENT_BULLISH", sentiment))
+        elif sentiment < 35:
+            signals.append(("SENTIMENT_BEARISH", sentiment))
         
         # Confluence
-        if scores.get("confluence", 50) > 80:
-            signals.append("⭐ High signal confluence - strong setup")
+        confluence = scores.get("confluence", 50)
+        if confluence > 80:
+            signals.append(("HIGH_CONFLUENCE", confluence))
         
         return signals
 
@@ -379,8 +522,8 @@ class SignalConfluenceDetector:
     Plus de confluence = plus de fiabilité.
     """
     
+    @staticmethod
     def analyze_confluence(
-        self,
         technical_data: Dict[str, Any],
         market_context: Dict[str, Any]
     ) -> Dict[str, Any]:
@@ -396,16 +539,9 @@ class SignalConfluenceDetector:
                 "reliability": "HIGH" | "MEDIUM" | "LOW"
             }
         """
-        bullish_indicators = []
-        bearish_indicators = []
-        
-        # Analyze each indicator
-        self._check_rsi(technical_data, bullish_indicators, bearish_indicators)
-        self._check_macd(technical_data, bullish_indicators, bearish_indicators)
-        self._check_bollinger(technical_data, bullish_indicators, bearish_indicators)
-        self._check_sma(technical_data, bullish_indicators, bearish_indicators)
-        self._check_momentum(technical_data, bullish_indicators, bearish_indicators)
-        self._check_sentiment(market_context, bullish_indicators, bearish_indicators)
+        # Analyze each indicator from a single read of the inputs
+        state = _extract_indicator_state(technical_data, market_context)
+        bullish_indicators, bearish_indicators = SignalConfluenceDetector._classify_indicators(state)
         
         total_indicators = len(bullish_indicators) + len(bearish_indicators)
         
@@ -459,66 +595,60 @@ class SignalConfluenceDetector:
             }
         }
     
-    def _check_rsi(self, data: Dict, bullish: List, bearish: List):
-        rsi = data.get("rsi")
-        if rsi:
+    @staticmethod
+    def _classify_indicators(state: Dict[str, Any]) -> Tuple[List[str], List[str]]:
+        """Sort the indicators into bullish and bearish votes."""
+        bullish = []
+        bearish = []
+        
+        # RSI
+        rsi = state["rsi"]
+        if _present(rsi):
             if rsi < 40:
                 bullish.append(f"RSI({rsi:.1f})")
             elif rsi > 60:
                 bearish.append(f"RSI({rsi:.1f})")
-    
-    def _check_macd(self, data: Dict, bullish: List, bearish: List):
-        macd = data.get("macd", {})
-        if macd.get("macd") and macd.get("signal"):
-            if macd["macd"] > macd["signal"]:
-                bullish.append("MACD")
-            else:
-                bearish.append("MACD")
-    
-    def _check_bollinger(self, data: Dict, bullish: List, bearish: List):
-        bollinger = data.get("bollinger", {})
-        price = data.get("current_price")
-        if bollinger and price:
-            lower = bollinger.get("lower")
-            upper = bollinger.get("upper")
-            if lower and price <= lower * 1.02:
+        
+        # MACD
+        macd, signal = state["macd"], state["macd_signal"]
+        if _present(macd) and _present(signal):
+            (bullish if macd > signal else bearish).append("MACD")
+        
+        # Bollinger
+        price = state["current_price"]
+        if state["has_bands"] and _present(price):
+            lower, upper = state["bb_lower"], state["bb_upper"]
+            if _present(lower) and price <= lower * 1.02:
                 bullish.append("Bollinger")
-            elif upper and price >= upper * 0.98:
+            elif _present(upper) and price >= upper * 0.98:
                 bearish.append("Bollinger")
-    
-    def _check_sma(self, data: Dict, bullish: List, bearish: List):
-        price = data.get("current_price")
-        sma_50 = data.get("sma_50")
-        sma_200 = data.get("sma_200")
-        
-        if price and sma_50:
-            if price > sma_50:
-                bullish.append("SMA50")
-            else:
-                bearish.append("SMA50")
         
-        if sma_50 and sma_200:
+        # SMA
+        sma_50, sma_200 = state["sma_50"], state["sma_200"]
+        if _present(price) and _present(sma_50):
+            (bullish if price > sma_50 else bearish).append("SMA50")
+        if _present(sma_50) and _present(sma_200):
             if sma_50 > sma_200:
                 bullish.append("Golden Cross")
             else:
                 bearish.append("Death Cross")
-    
-    def _check_momentum(self, data: Dict, bullish: List, bearish: List):
-        change = data.get("change_1d", 0)
-        volume_ratio = data.get("volume_ratio", 1.0)
         
+        # Momentum + volume
+        change, volume_ratio = state["change_1d"], state["volume_ratio"]
         if change > 1 and volume_ratio > 1.2:
             bullish.append("Momentum+Volume")
         elif change < -1 and volume_ratio > 1.2:
             bearish.append("Momentum+Volume")
-    
-    def _check_sentiment(self, context: Dict, bullish: List, bearish: List):
-        fear_greed = context.get("fear_greed_index")
-        if fear_greed:
+        
+        # Sentiment
+        fear_greed = state["fear_greed_index"]
+        if _present(fear_greed):
             if fear_greed < 30:
                 bullish.append("Extreme Fear")
             elif fear_greed > 70:
                 bearish.append("Extreme Greed")
+        
+        return bullish, bearish
 
 
 class BayesianDecisionTree:
@@ -535,11 +665,15 @@ class BayesianDecisionTree:
         agent_key: str,
         symbol: str,
         action: str,
-        market_conditions: Dict[str, Any]
+        market_conditions: Dict[str, Any],
+        db: Optional[Session] = None
     ) -> Dict[str, Any]:
         """
         Calcule la probabilité de succès d'un trade basé sur l'historique.
         
+        Pass the caller's session as `db` to reuse it; otherwise one is
+        checked out from the pool only when the stats aren't cached.
+        
         Returns:
             {
                 "success_probability": 0.0-1.0,
@@ -548,131 +682,321 @@ class BayesianDecisionTree:
                 "recommendation": str
             }
         """
-        db = next(get_db())
-        
-        try:
-            # Get historical trades for this agent and similar conditions
-            historical_trades = self._get_similar_trades(
-                db, agent_key, symbol, action, market_conditions
+        # Closed trades for this agent and similar conditions
+        total_trades, successful_trades = self._get_similar_stats(agent_key, symbol, action, db)
+        
+        if _LOG_DEBUG:
+            logger.debug(
+                "similar_trade_stats",
+                agent=agent_key,
+                symbol=symbol,
+                action=action,
+                total_trades=total_trades,
+                successful_trades=successful_trades
             )
-            
-            if len(historical_trades) < 5:
-                # Not enough data, use prior
-                return {
-                    "success_probability": self.prior_success_rate,
-                    "confidence_level": "LOW",
-                    "sample_size": len(historical_trades),
-                    "recommendation": "Insufficient historical data - proceed with caution",
-                    "method": "prior"
-                }
-            
-            # Calculate success rate from history
-            successful_trades = sum(
-                1 for trade in historical_trades
-                if trade.pnl and trade.pnl > 0
-            )
-            
-            success_rate = successful_trades / len(historical_trades)
-            
-            # Bayesian update: combine prior with observed data
-            # Using Beta distribution: posterior mean = (α + successes) / (α + β + total)
-            # where α and β are prior parameters (we use α=β=1 for uniform prior)
-            alpha = beta = 1
-            posterior_probability = (alpha + successful_trades) / (
-                alpha + beta + len(historical_trades)
-            )
-            
-            # Confidence level based on sample size
-            if len(historical_trades) >= 30:
-                confidence = "HIGH"
-            elif len(historical_trades) >= 15:
-                confidence = "MEDIUM"
+        
+        return self._probability_from_stats(total_trades, successful_trades)
+    
+    def calculate_success_probabilities_batch(
+        self,
+        agent_key: str,
+        pairs: Sequence[Tuple[str, str]],
+        db: Optional[Session] = None
+    ) -> Dict[Tuple[str, str], Dict[str, Any]]:
+        """
+        Success probabilities for many (symbol, action) pairs of one agent.
+        
+        Pairs without fresh cached stats are answered by a single grouped
+        query. Results are keyed by the pairs as given.
+        """
+        stats = {}
+        missing = []
+        for symbol, action in dict.fromkeys(pairs):
+            cached = _cached_stats((agent_key, symbol, action.lower()))
+            if cached is None:
+                missing.append((symbol, action))
             else:
-                confidence = "LOW"
-            
-            # Recommendation
-            if posterior_probability >= 0.65 and confidence in ["HIGH", "MEDIUM"]:
-                recommendation = "Strong historical edge - favorable setup"
-            elif posterior_probability >= 0.55:
-                recommendation = "Slight positive edge - acceptable risk"
-            elif posterior_probability >= 0.45:
-                recommendation = "Neutral - no clear edge"
+                stats[(symbol, action)] = cached
+        
+        if missing:
+            if db is None:
+                with get_db() as session:
+                    fetched = self._query_similar_stats_grouped(session, agent_key, missing)
             else:
-                recommendation = "Negative historical edge - avoid or reduce size"
+                fetched = self._query_similar_stats_grouped(db, agent_key, missing)
             
-            return {
-                "success_probability": round(posterior_probability, 3),
-                "raw_success_rate": round(success_rate, 3),
+            for (symbol, action), pair_stats in zip(missing, fetched):
+                _store_stats((agent_key, symbol, action.lower()), pair_stats)
+                stats[(symbol, action)] = pair_stats
+        
+        return dict(zip(pairs, self._probabilities_from_stats([stats[pair] for pair in pairs])))
+    
+    def _probability_from_stats(self, total_trades: int, successful_trades: int) -> Dict[str, Any]:
+        """Beta posterior, confidence and recommendation from (total, successful) closed trades."""
+        if total_trades < 5:
+            return self._prior_result(total_trades)
+        
+        # Bayesian update with a uniform Beta(1, 1) prior:
+        # posterior mean = (1 + successes) / (2 + total)
+        posterior_probability = (successful_trades + 1.0) / (total_trades + 2.0)
+        
+        # Confidence level based on sample size
+        if total_trades >= 30:
+            confidence = "HIGH"
+        elif total_trades >= 15:
+            confidence = "MEDIUM"
+        else:
+            confidence = "LOW"
+        
+        # Recommendation: a strong edge also needs at least MEDIUM confidence
+        edge = (posterior_probability >= 0.45) + (posterior_probability >= 0.55) + (posterior_probability >= 0.65)
+        if edge == 3 and confidence == "LOW":
+            edge = 2
+        
+        return {
+            "success_probability": round(posterior_probability, 3),
+            "raw_success_rate": round(successful_trades / total_trades, 3),
+            "confidence_level": confidence,
+            "sample_size": total_trades,
+            "successful_trades": successful_trades,
+            "recommendation": _EDGE_RECOMMENDATIONS[edge],
+            "method": "bayesian"
+        }
+    
+    def _probabilities_from_stats(self, stats: Sequence[Tuple[int, int]]) -> List[Dict[str, Any]]:
+        """_probability_from_stats for many (total, successful) pairs as array ops."""
+        if not stats:
+            return []
+        
+        totals, successes = np.array(stats, dtype=np.int64).T
+        posteriors = (successes + 1.0) / (totals + 2.0)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            raw_rates = successes / totals
+        confidences = np.select([totals >= 30, totals >= 15], ["HIGH", "MEDIUM"], "LOW")
+        edges = np.searchsorted(_EDGE_BINS, posteriors, side="right")
+        edges = np.where((edges == 3) & (totals < 15), 2, edges)
+        
+        results = []
+        for total, successful, posterior, raw_rate, confidence, edge in zip(
+            totals.tolist(), successes.tolist(), posteriors.tolist(),
+            raw_rates.tolist(), confidences.tolist(), edges.tolist()
+        ):
+            if total < 5:
+                results.append(self._prior_result(total))
+                continue
+            results.append({
+                "success_probability": round(posterior, 3),
+                "raw_success_rate": round(raw_rate, 3),
                 "confidence_level": confidence,
-                "sample_size": len(historical_trades),
-                "successful_trades": successful_trades,
-                "recommendation": recommendation,
+                "sample_size": total,
+                "successful_trades": successful,
+                "recommendation": _EDGE_RECOMMENDATIONS[edge],
                 "method": "bayesian"
-            }
-            
-        finally:
-            db.close()
+            })
+        return results
+    
+    def _prior_result(self, total_trades: int) -> Dict[str, Any]:
+        """Not enough data, use prior"""
+        return {
+            "success_probability": self.prior_success_rate,
+            "confidence_level": "LOW",
+            "sample_size": total_trades,
+            "recommendation": "Insufficient historical data - proceed with caution",
+            "method": "prior"
+        }
+    
+    def _get_similar_stats(
+        self,
+        agent_key: str,
+        symbol: str,
+        action: str,
+        db: Optional[Session] = None
+    ) -> Tuple[int, int]:
+        """
+        (total, successful) closed trades similar to this one, cached for SIMILAR_STATS_TTL.
+        
+        The 90-day window moves slowly, so repeated calls within the TTL skip the database.
+        """
+        key = (agent_key, symbol, action.lower())
+        cached = _cached_stats(key)
+        if cached is not None:
+            return cached
+        
+        if db is None:
+            with get_db() as session:
+                stats = self._query_similar_stats(session, agent_key, symbol, action)
+        else:
+            stats = self._query_similar_stats(db, agent_key, symbol, action)
+        
+        _store_stats(key, stats)
+        return stats
+    
+    def _query_similar_stats(
+        self,
+        db: Session,
+        agent_key: str,
+        symbol: str,
+        action: str
+    ) -> Tuple[int, int]:
+        """Count similar closed trades and the profitable ones in a single aggregate query."""
+        query = self._similar_trades_query(
+            db.query(
+                func.count(TradeOutcome.id),
+                func.count(case((TradeOutcome.pnl_amount > 0, 1))),
+            ),
+            agent_key, symbol, action
+        )
+        total, successful = query.one()
+        return total, successful
     
-    def _get_similar_trades(
+    def iter_similar_trades(
         self,
-        db,
+        db: Session,
         agent_key: str,
         symbol: str,
         action: str,
-        market_conditions: Dict[str, Any]
-    ) -> List[Trade]:
-        """Get similar historical trades"""
+        chunk_size: int = 1000
+    ) -> Iterator[Tuple[str, float]]:
+        """
+        Stream (symbol, pnl_amount) for each similar closed trade.
+        
+        For consumers that need the raw history (e.g. P&L percentiles) rather
+        than counts: rows are fetched in chunks of chunk_size on a server-side
+        cursor, so memory stays bounded however long the history is.
+        """
+        query = self._similar_trades_query(
+            db.query(Trade.symbol, TradeOutcome.pnl_amount),
+            agent_key, symbol, action
+        )
+        yield from query.yield_per(chunk_size)
+    
+    def _similar_trades_query(self, query, agent_key: str, symbol: str, action: str):
+        """Restrict a TradeOutcome-based query to this agent's similar closed trades."""
         
         # Get trades from the last 90 days for this agent
         cutoff_date = datetime.utcnow() - timedelta(days=90)
         
-        query = db.query(Trade).filter(
-            Trade.agent_key == agent_key,
+        # A trade is closed once its outcome (realized P&L) has been recorded
+        query = query.select_from(TradeOutcome).join(
+            Trade, TradeOutcome.trade_id == Trade.id
+        ).filter(
+            Trade.agent_name == agent_key,
             Trade.created_at >= cutoff_date,
-            Trade.status.in_([TradeStatus.CLOSED, TradeStatus.FILLED])
+            Trade.status == TradeStatus.EXECUTED,
+            Trade.action == TradeAction(action.lower()),
         )
         
         # Filter by symbol if specific symbol (not searching for similar)
         if symbol and symbol != "ANY":
             query = query.filter(Trade.symbol == symbol)
         
-        # Filter by action
-        query = query.filter(Trade.action == action.upper())
-        
-        trades = query.all()
-        
         # TODO: Could add filtering by similar market conditions
         # (e.g., similar RSI, similar market regime, etc.)
         
-        return trades
+        return query
+    
+    def _query_similar_stats_grouped(
+        self,
+        db: Session,
+        agent_key: str,
+        pairs: Sequence[Tuple[str, str]]
+    ) -> List[Tuple[int, int]]:
+        """(total, successful) for each (symbol, action) pair from one GROUP BY query."""
+        cutoff_date = datetime.utcnow() - timedelta(days=90)
+        actions = {TradeAction(action.lower()) for _, action in pairs}
+        symbols = {symbol for symbol, _ in pairs if symbol and symbol != "ANY"}
+        
+        query = db.query(
+            Trade.symbol,
+            Trade.action,
+            func.count(TradeOutcome.id),
+            func.count(case((TradeOutcome.pnl_amount > 0, 1))),
+        ).join(
+            Trade, TradeOutcome.trade_id == Trade.id
+        ).filter(
+            Trade.agent_name == agent_key,
+            Trade.created_at >= cutoff_date,
+            Trade.status == TradeStatus.EXECUTED,
+            Trade.action.in_(actions),
+        )
+        
+        # "ANY" pairs aggregate over every symbol, so only narrow when there are none
+        if all(symbol and symbol != "ANY" for symbol, _ in pairs):
+            query = query.filter(Trade.symbol.in_(symbols))
+        
+        by_pair = {}
+        by_action = {}
+        for symbol, action, total, successful in query.group_by(Trade.symbol, Trade.action):
+            by_pair[(symbol, action)] = (total, successful)
+            action_total, action_successful = by_action.get(action, (0, 0))
+            by_action[action] = (action_total + total, action_successful + successful)
+        
+        results = []
+        for symbol, action in pairs:
+            action = TradeAction(action.lower())
+            if symbol and symbol != "ANY":
+                results.append(by_pair.get((symbol, action), (0, 0)))
+            else:
+                results.append(by_action.get(action, (0, 0)))
+        return results
+
+
+# Singletons
+_scorer: Optional[MultiFactorScorer] = None
+_bayesian_tree: Optional[BayesianDecisionTree] = None
+
+
+def get_decision_scorer() -> MultiFactorScorer:
+    """Get multi-factor scorer instance."""
+    global _scorer
+    if _scorer is None:
+        _scorer = MultiFactorScorer()
+    return _scorer
+
+
+def get_bayesian_tree() -> BayesianDecisionTree:
+    """Get Bayesian decision tree instance."""
+    global _bayesian_tree
+    if _bayesian_tree is None:
+        _bayesian_tree = BayesianDecisionTree()
+    return _bayesian_tree
 
 
 def get_decision_score(symbol: str, technical_data: Dict[str, Any], market_context: Dict[str, Any]) -> Dict[str, Any]:
     """
     Tool function: Get comprehensive decision score for a symbol.
     """
-    scorer = MultiFactorScorer()
-    return scorer.calculate_score(symbol, technical_data, market_context)
+    return get_decision_scorer().calculate_score(symbol, technical_data, market_context)
 
 
 def get_signal_confluence(technical_data: Dict[str, Any], market_context: Dict[str, Any]) -> Dict[str, Any]:
     """
     Tool function: Analyze signal confluence.
     """
-    detector = SignalConfluenceDetector()
-    return detector.analyze_confluence(technical_data, market_context)
+    return SignalConfluenceDetector.analyze_confluence(technical_data, market_context)
 
 
 def get_success_probability(
     agent_key: str,
     symbol: str,
     action: str,
-    market_conditions: Dict[str, Any]
+    market_conditions: Dict[str, Any],
+    db: Optional[Session] = None
 ) -> Dict[str, Any]:
     """
     Tool function: Calculate Bayesian success probability.
     """
-    bayesian_tree = BayesianDecisionTree()
-    return bayesian_tree.calculate_success_probability(
-        agent_key, symbol, action, market_conditions
+    return get_bayesian_tree().calculate_success_probability(
+        agent_key, symbol, action, market_conditions, db
     )
+
+
+def get_success_probabilities_batch(
+    agent_key: str,
+    pairs: List[Tuple[str, str]],
+    db: Optional[Session] = None
+) -> Dict[Tuple[str, str], Dict[str, Any]]:
+    """
+    Tool function: Bayesian success probabilities for many (symbol, action) pairs at once.
+    """
+    return get_bayesian_tree().calculate_success_probabilities_batch(agent_key, pairs, db)
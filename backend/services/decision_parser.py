@@ -2,7 +2,8 @@
 Intelligent decision parsing service using Claude 4.5 Sonnet.
 Provides robust extraction of trading decisions, votes, and agent responses.
 """
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Sequence, Tuple
+import asyncio
 import re
 import json
 import structlog
@@ -14,6 +15,53 @@ from config import get_settings
 logger = structlog.get_logger()
 settings = get_settings()
 
+# Compiled once at import instead of going through the re module cache on every parse
+_RE_FENCE_OPEN = re.compile(r'^```(?:json)?\n?')
+_RE_FENCE_CLOSE = re.compile(r'\n?```$')
+# ASCII word boundaries: tickers are ASCII, and the Unicode-aware \b is about twice as slow
+_RE_SYMBOL = re.compile(r'\b([A-Z]{2,5})\b', re.ASCII)
+_RE_CONF = re.compile(r'(\d+)%')
+
+# Message-type cues, one named group per MessageType, classified in a single scan.
+# Several cues can appear in one message; the earliest type in _CUE_PRIORITY wins.
+_RE_MESSAGE_CUE = re.compile(
+    r'(?P<REBUTTAL>disagree|counter|however)'
+    r'|(?P<AGREEMENT>agree|support)'
+    r'|(?P<COMPROMISE>compromise|middle)'
+    r'|(?P<QUESTION>question|\?)',
+    re.IGNORECASE,
+)
+_CUE_PRIORITY = (
+    MessageType.AGREEMENT,
+    MessageType.REBUTTAL,
+    MessageType.COMPROMISE,
+    MessageType.QUESTION,
+)
+
+# Fixed preamble of the batched vote extraction, sent as the system instruction.
+# (At ~200 tokens it is below Gemini's implicit-caching minimum; no cache hit expected.)
+_VOTE_BATCH_INSTRUCTIONS = """You are a precise data extraction system for trading decisions.
+
+You will receive several numbered agent votes, each introduced by a line like "[1] AgentName".
+Extract the following information from every vote and return ONLY a JSON array with
+exactly one object per vote, in the same order as the votes:
+[
+  {
+    "action": "buy" | "sell" | "hold",
+    "symbol": "STOCK_SYMBOL" or null,
+    "confidence": 0-100 (number),
+    "reasoning": "brief explanation or quote from vote"
+  }
+]
+
+Rules:
+- action must be lowercase: "buy", "sell", or "hold"
+- symbol should be uppercase ticker (e.g., "AAPL", "BTCUSDT") or null if not specified
+- confidence should be a number between 0-100
+- reasoning should be concise (max 200 characters)
+
+Return ONLY valid JSON, no markdown or explanation."""
+
 
 class DecisionParser:
     """
@@ -27,12 +75,68 @@ class DecisionParser:
         self.cache = get_parsing_cache() if settings.parsing_cache_enabled else None
         self.model = settings.claude_parsing_model
         self.enabled = settings.enable_intelligent_parsing
+        # Bounds concurrent parsing requests to the LLM provider
+        self._llm_slots = asyncio.Semaphore(settings.parsing_max_concurrent_llm)
         
         logger.info(
             "decision_parser_initialized",
             intelligent_parsing=self.enabled,
             cache_enabled=settings.parsing_cache_enabled,
             model=self.model,
+            max_concurrent_llm=settings.parsing_max_concurrent_llm,
+        )
+    
+    async def _call_llm(
+        self,
+        messages: List[Dict[str, str]],
+        temperature: float,
+        timeout: Optional[float] = None
+    ) -> str:
+        """
+        Send one extraction request to the parsing model.
+        
+        Bounded by `parsing_llm_timeout_s` so one stuck request can't stall a
+        deliberation; the resulting TimeoutError sends the caller to its regex fallback.
+        
+        Args:
+            messages: Chat messages
+            temperature: Sampling temperature
+            timeout: Seconds before giving up (default: parsing_llm_timeout_s)
+            
+        Returns:
+            Raw text of the model's answer
+        """
+        if timeout is None:
+            timeout = settings.parsing_llm_timeout_s
+        
+        async with self._llm_slots:
+            try:
+                response = await asyncio.wait_for(
+                    self.llm_client.call_agent(
+                        model=self.model,
+                        messages=messages,
+                        temperature=temperature,
+                    ),
+                    timeout=timeout,
+                )
+            except asyncio.TimeoutError:
+                logger.warning("parsing_llm_timeout", timeout=timeout)
+                raise
+        
+        return self.llm_client.get_message_content(response)
+    
+    async def parse_agent_votes_parallel(self, items: Sequence[Tuple[str, str]]) -> List[Dict[str, Any]]:
+        """
+        Parse several agents' votes concurrently, one request per vote.
+        
+        Args:
+            items: (content, agent_name) pairs
+            
+        Returns:
+            Parsed votes, in the same order as `items`
+        """
+        return await asyncio.gather(
+            *(self.parse_agent_vote(content, agent_name) for content, agent_name in items)
         )
     
     async def parse_agent_vote(self, content: str, agent_name: str = "") -> Dict[str, Any]:
@@ -52,9 +156,10 @@ class DecisionParser:
         Returns:
             Dictionary with parsed vote information
         """
-        # Check cache first
+        # Check cache first, hashing the content once for lookup and store
+        digest = self.cache.digest(content) if self.cache else None
         if self.cache:
-            cached = self.cache.get(content, "vote")
+            cached = self.cache.get_by_digest(digest, "vote")
             if cached:
                 logger.debug("vote_parse_cache_hit", agent=agent_name)
                 return cached
@@ -66,7 +171,7 @@ class DecisionParser:
                 
                 # Cache the result
                 if self.cache:
-                    self.cache.set(content, "vote", result)
+                    self.cache.set_by_digest(digest, "vote", result)
                 
                 return result
             except Exception as e:
@@ -82,7 +187,7 @@ class DecisionParser:
         
         # Cache even regex results
         if self.cache:
-            self.cache.set(content, "vote", result)
+            self.cache.set_by_digest(digest, "vote", result)
         
         return result
     
@@ -120,24 +225,42 @@ Rules:
 
 Return ONLY valid JSON, no markdown or explanation."""
 
-        response = await self.llm_client.call_agent(
-            model=self.model,
-            messages=[{"role": "user", "content": prompt}],
+        result_text = await self._call_llm(
+            [{"role": "user", "content": prompt}],
             temperature=0.1,  # Low temperature for consistent extraction
         )
         
-        result_text = self.llm_client.get_message_content(response)
-        
         # Parse JSON from response
         # Remove markdown code blocks if present
         result_text = result_text.strip()
         if result_text.startswith("```"):
-            result_text = re.sub(r'^```(?:json)?\n?', '', result_text)
-            result_text = re.sub(r'\n?```$', '', result_text)
+            result_text = _RE_FENCE_OPEN.sub('', result_text)
+            result_text = _RE_FENCE_CLOSE.sub('', result_text)
         
-        parsed = json.loads(result_text)
+        result = self._normalize_vote(json.loads(result_text), content)
+        
+        logger.info(
+            "claude_vote_parsed",
+            agent=agent_name,
+            action=result["action"],
+            symbol=result["symbol"],
+            confidence=result["confidence"],
+        )
+        
+        return result
+    
+    @staticmethod
+    def _normalize_vote(parsed: Dict[str, Any], content: str) -> Dict[str, Any]:
+        """
+        Validate and normalize a vote object extracted by the LLM.
         
-        # Validate and normalize
+        Args:
+            parsed: JSON object returned by the model
+            content: Original vote text (reasoning fallback)
+            
+        Returns:
+            Structured vote data
+        """
         result = {
             "action": str(parsed.get("action", "hold")).lower(),
             "symbol": parsed.get("symbol"),
@@ -152,15 +275,118 @@ Return ONLY valid JSON, no markdown or explanation."""
         # Ensure confidence is in range
         result["confidence"] = max(0, min(100, result["confidence"]))
         
+        return result
+    
+    async def parse_agent_votes_batch(self, items: Sequence[Tuple[str, str]]) -> List[Dict[str, Any]]:
+        """
+        Parse several agents' final votes with a single LLM request.
+        
+        Cached votes are answered locally; the remaining ones are packed into
+        one prompt whose fixed instructions go in the system message. If the
+        batched call fails, the remaining votes are parsed one request each
+        (parse_agent_votes_parallel), which keeps the per-vote regex fallback.
+        
+        Args:
+            items: (content, agent_name) pairs
+            
+        Returns:
+            Parsed votes, in the same order as `items`
+        """
+        results: List[Optional[Dict[str, Any]]] = [None] * len(items)
+        digests: List[Optional[str]] = [None] * len(items)
+        pending = []
+        
+        for i, (content, agent_name) in enumerate(items):
+            if self.cache:
+                digests[i] = self.cache.digest(content)
+                cached = self.cache.get_by_digest(digests[i], "vote")
+                if cached:
+                    logger.debug("vote_parse_cache_hit", agent=agent_name)
+                    results[i] = cached
+                    continue
+            pending.append(i)
+        
+        if not pending:
+            return results
+        
+        if not self.enabled:
+            # Regex parsing only; cache even regex results
+            for i in pending:
+                results[i] = self._parse_vote_with_regex(items[i][0])
+                if self.cache:
+                    self.cache.set_by_digest(digests[i], "vote", results[i])
+            return results
+        
+        try:
+            parsed_votes = await self._parse_votes_with_claude([items[i] for i in pending])
+        except Exception as e:
+            logger.warning(
+                "claude_parse_votes_batch_failed",
+                votes=len(pending),
+                error=str(e),
+                fallback="per_vote",
+            )
+            # One request per vote; each caches its own result
+            fallback = await self.parse_agent_votes_parallel([items[i] for i in pending])
+            for i, result in zip(pending, fallback):
+                results[i] = result
+            return results
+        
+        for i, result in zip(pending, parsed_votes):
+            results[i] = result
+            if self.cache:
+                self.cache.set_by_digest(digests[i], "vote", result)
+        
+        return results
+    
+    async def _parse_votes_with_claude(self, items: Sequence[Tuple[str, str]]) -> List[Dict[str, Any]]:
+        """
+        Extract N votes from one LLM call returning a JSON array.
+        
+        Args:
+            items: (content, agent_name) pairs
+            
+        Returns:
+            Structured vote data, one per item
+        """
+        votes = "\n\n".join(
+            f"[{n}] {agent_name or 'Agent'}\n{content}"
+            for n, (content, agent_name) in enumerate(items, start=1)
+        )
+        
+        result_text = await self._call_llm(
+            [
+                {"role": "system", "content": _VOTE_BATCH_INSTRUCTIONS},
+                {"role": "user", "content": f"AGENT VOTES ({len(items)}):\n\n{votes}"},
+            ],
+            temperature=0.1,  # Low temperature for consistent extraction
+            # Longer answer than a single vote, but capped so a stuck batch plus the
+            # per-vote fallback can't stall the round for N timeouts
+            timeout=settings.parsing_llm_timeout_s * min(len(items), 2),
+        )
+        
+        # Remove markdown code blocks if present
+        result_text = result_text.strip()
+        if result_text.startswith("```"):
+            result_text = _RE_FENCE_OPEN.sub('', result_text)
+            result_text = _RE_FENCE_CLOSE.sub('', result_text)
+        
+        parsed = json.loads(result_text)
+        if not isinstance(parsed, list) or len(parsed) != len(items):
+            raise ValueError(f"expected a JSON array of {len(items)} votes")
+        
+        results = [
+            self._normalize_vote(vote, content)
+            for vote, (content, _) in zip(parsed, items)
+        ]
+        
         logger.info(
-            "claude_vote_parsed",
-            agent=agent_name,
-            action=result["action"],
-            symbol=result["symbol"],
-            confidence=result["confidence"],
+            "claude_votes_parsed",
+            votes=len(results),
+            actions=[result["action"] for result in results],
         )
         
-        return result
+        return results
     
     def _parse_vote_with_regex(self, content: str) -> Dict[str, Any]:
         """
@@ -183,12 +409,12 @@ Return ONLY valid JSON, no markdown or explanation."""
             action = "sell"
         
         # Extract symbol (2-5 uppercase letters)
-        symbol_match = re.search(r'\b([A-Z]{2,5})\b', content)
+        symbol_match = _RE_SYMBOL.search(content)
         if symbol_match:
             symbol = symbol_match.group(1)
         
         # Extract confidence percentage
-        conf_match = re.search(r'(\d+)%', content)
+        conf_match = _RE_CONF.search(content)
         if conf_match:
             confidence = int(conf_match.group(1))
             confidence = max(0, min(100, confidence))
@@ -226,9 +452,10 @@ Return ONLY valid JSON, no markdown or explanation."""
         Returns:
             Dictionary with parsed response information
         """
-        # Check cache
+        # Check cache, hashing the content once for lookup and store
+        digest = self.cache.digest(content) if self.cache else None
         if self.cache:
-            cached = self.cache.get(content, "response")
+            cached = self.cache.get_by_digest(digest, "response")
             if cached:
                 logger.debug("response_parse_cache_hit", agent=agent_name)
                 return cached
@@ -239,7 +466,7 @@ Return ONLY valid JSON, no markdown or explanation."""
                 result = await self._parse_response_with_claude(content, agent_name)
                 
                 if self.cache:
-                    self.cache.set(content, "response", result)
+                    self.cache.set_by_digest(digest, "response", result)
                 
                 return result
             except Exception as e:
@@ -254,7 +481,7 @@ Return ONLY valid JSON, no markdown or explanation."""
         result = self._parse_response_with_regex(content)
         
         if self.cache:
-            self.cache.set(content, "response", result)
+            self.cache.set_by_digest(digest, "response", result)
         
         return result
     
@@ -296,19 +523,16 @@ Message type definitions:
 
 Return ONLY valid JSON."""
 
-        response = await self.llm_client.call_agent(
-            model=self.model,
-            messages=[{"role": "user", "content": prompt}],
+        result_text = await self._call_llm(
+            [{"role": "user", "content": prompt}],
             temperature=0.2,
         )
         
-        result_text = self.llm_client.get_message_content(response)
-        
         # Clean and parse JSON
         result_text = result_text.strip()
         if result_text.startswith("```"):
-            result_text = re.sub(r'^```(?:json)?\n?', '', result_text)
-            result_text = re.sub(r'\n?```$', '', result_text)
+            result_text = _RE_FENCE_OPEN.sub('', result_text)
+            result_text = _RE_FENCE_CLOSE.sub('', result_text)
         
         parsed = json.loads(result_text)
         
@@ -346,18 +570,17 @@ Return ONLY valid JSON."""
         Returns:
             Structured response data
         """
-        # Detect message type
-        message_type = MessageType.POSITION
-        content_lower = content.lower()
-        
-        if "agree" in content_lower or "support" in content_lower:
-            message_type = MessageType.AGREEMENT
-        elif "disagree" in content_lower or "counter" in content_lower or "however" in content_lower:
-            message_type = MessageType.REBUTTAL
-        elif "compromise" in content_lower or "middle" in content_lower:
-            message_type = MessageType.COMPROMISE
-        elif "?" in content or "question" in content_lower:
-            message_type = MessageType.QUESTION
+        # Detect message type in one pass over the text
+        cues = set()
+        for match in _RE_MESSAGE_CUE.finditer(content):
+            cues.add(match.lastgroup)
+            if match.lastgroup == "AGREEMENT":
+                break  # Highest priority, nothing can override it
+        
+        message_type = next(
+            (cue for cue in _CUE_PRIORITY if cue.name in cues),
+            MessageType.POSITION,
+        )
         
         return {
             "content": content,
@@ -380,9 +603,10 @@ Return ONLY valid JSON."""
         Returns:
             Dictionary with decision and reasoning
         """
-        # Check cache
+        # Check cache, hashing the content once for lookup and store
+        digest = self.cache.digest(content) if self.cache else None
         if self.cache:
-            cached = self.cache.get(content, "mediator")
+            cached = self.cache.get_by_digest(digest, "mediator")
             if cached:
                 logger.debug("mediator_parse_cache_hit")
                 return cached
@@ -393,7 +617,7 @@ Return ONLY valid JSON."""
                 result = await self._parse_mediator_with_claude(content)
                 
                 if self.cache:
-                    self.cache.set(content, "mediator", result)
+                    self.cache.set_by_digest(digest, "mediator", result)
                 
                 return result
             except Exception as e:
@@ -407,7 +631,7 @@ Return ONLY valid JSON."""
         result = self._parse_mediator_with_regex(content)
         
         if self.cache:
-            self.cache.set(content, "mediator", result)
+            self.cache.set_by_digest(digest, "mediator", result)
         
         return result
     
@@ -427,19 +651,16 @@ Return ONLY a JSON object:
 
 Return ONLY valid JSON."""
 
-        response = await self.llm_client.call_agent(
-            model=self.model,
-            messages=[{"role": "user", "content": prompt}],
+        result_text = await self._call_llm(
+            [{"role": "user", "content": prompt}],
             temperature=0.1,
         )
         
-        result_text = self.llm_client.get_message_content(response)
-        
         # Clean and parse
         result_text = result_text.strip()
         if result_text.startswith("```"):
-            result_text = re.sub(r'^```(?:json)?\n?', '', result_text)
-            result_text = re.sub(r'\n?```$', '', result_text)
+            result_text = _RE_FENCE_OPEN.sub('', result_text)
+            result_text = _RE_FENCE_CLOSE.sub('', result_text)
         
         parsed = json.loads(result_text)
         
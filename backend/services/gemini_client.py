@@ -230,6 +230,7 @@ class GeminiClient:
                     model=model,
                     input_tokens=usage.get("promptTokenCount", 0),
                     output_tokens=usage.get("candidatesTokenCount", 0),
+                    cached_tokens=usage.get("cachedContentTokenCount", 0),
                 )
                 
                 return simulated_response
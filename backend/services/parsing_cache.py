@@ -32,20 +32,31 @@ class ParsingCache:
             "total_requests": 0,
         }
     
-    def _generate_key(self, content: str, parsing_type: str) -> str:
+    @staticmethod
+    def digest(content: str) -> str:
         """
-        Generate cache key from content and parsing type.
+        Hash the content once so a lookup and the matching store share it.
         
         Args:
             content: The content to parse
+            
+        Returns:
+            Hex SHA-256 digest of the content
+        """
+        return hashlib.sha256(content.encode()).hexdigest()
+    
+    def _generate_key(self, digest: str, parsing_type: str) -> str:
+        """
+        Generate cache key from content digest and parsing type.
+        
+        Args:
+            digest: Digest of the content, see `digest()`
             parsing_type: Type of parsing (vote, response, mediator, etc.)
             
         Returns:
-            Hash key for caching
+            Key for caching
         """
-        # Create a hash of the content + type
-        combined = f"{parsing_type}:{content}"
-        return hashlib.sha256(combined.encode()).hexdigest()
+        return f"{digest}:{parsing_type}"
     
     def get(self, content: str, parsing_type: str) -> Optional[Dict[str, Any]]:
         """
@@ -55,12 +66,25 @@ class ParsingCache:
             content: The content that was parsed
             parsing_type: Type of parsing
             
+        Returns:
+            Cached result or None if not found/expired
+        """
+        return self.get_by_digest(self.digest(content), parsing_type)
+    
+    def get_by_digest(self, digest: str, parsing_type: str) -> Optional[Dict[str, Any]]:
+        """
+        Same as `get()` for content already hashed with `digest()`.
+        
+        Args:
+            digest: Digest of the content that was parsed
+            parsing_type: Type of parsing
+            
         Returns:
             Cached result or None if not found/expired
         """
         self._stats["total_requests"] += 1
         
-        key = self._generate_key(content, parsing_type)
+        key = self._generate_key(digest, parsing_type)
         
         if key not in self._cache:
             self._stats["misses"] += 1
@@ -88,7 +112,18 @@ class ParsingCache:
             parsing_type: Type of parsing
             result: Parsed result to cache
         """
-        key = self._generate_key(content, parsing_type)
+        self.set_by_digest(self.digest(content), parsing_type, result)
+    
+    def set_by_digest(self, digest: str, parsing_type: str, result: Dict[str, Any]):
+        """
+        Same as `set()` for content already hashed with `digest()`.
+        
+        Args:
+            digest: Digest of the content that was parsed
+            parsing_type: Type of parsing
+            result: Parsed result to cache
+        """
+        key = self._generate_key(digest, parsing_type)
         
         # Evict oldest entry if cache is full
         if len(self._cache) >= self.max_size:
@@ -0,0 +1,231 @@
+"""
+Compiled scoring kernels for the multi-factor decision engine.
+Scalar versions of the MultiFactorScorer rule ladders, JIT-compiled with numba when available.
+
+Kernels take plain floats; NaN marks a missing input. Like the original
+`if value:` checks, a zero input counts as missing.
+"""
+import math
+import structlog
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+    
+    def njit(*args, **kwargs):
+        """No-op stand-in: kernels run as plain Python."""
+        return lambda f: f
+
+logger = structlog.get_logger()
+
+# Sentiment adjustments resolved once per call from the context labels,
+# so the kernel adds constants instead of comparing strings
+REGIME_BONUS = {"BULL_MARKET": 15.0, "BEAR_MARKET": -15.0}  # SIDEWAYS = neutral
+ECONOMIC_IMPACT_PENALTY = {"HIGH": 15.0}  # High impact events = caution
+
+
+@njit(cache=True)
+def _given(value: float) -> bool:
+    return not math.isnan(value) and value != 0.0
+
+
+@njit(cache=True)
+def _clip100(score: float) -> float:
+    return 0.0 if score < 0.0 else (100.0 if score > 100.0 else score)
+
+
+@njit(cache=True)
+def technical_kernel(
+    rsi: float,
+    macd: float,
+    signal: float,
+    price: float,
+    lower: float,
+    upper: float,
+    middle: float,
+    sma_50: float,
+    sma_200: float,
+) -> float:
+    """Score technique: RSI, MACD, Bollinger, SMA 50/200 (0-100)."""
+    score = 50.0
+    
+    if _given(rsi):
+        if rsi < 30:
+            score += 15
+        elif rsi < 40:
+            score += 10
+        elif rsi > 70:
+            score -= 15
+        elif rsi > 60:
+            score -= 10
+    
+    if _given(macd) and _given(signal):
+        score += 10 if macd > signal else -10
+    
+    if _given(price) and _given(lower) and _given(upper) and _given(middle):
+        if price <= lower * 1.02:
+            score += 12
+        elif price >= upper * 0.98:
+            score -= 12
+        elif price > middle:
+            score += 5
+        else:
+            score -= 5
+    
+    if _given(sma_50) and _given(sma_200):
+        score += 8 if sma_50 > sma_200 else -8
+    
+    return _clip100(score)
+
+
+@njit(cache=True)
+def momentum_kernel(change_1d: float, change_7d: float, volume_ratio: float, adx: float) -> float:
+    """Score de momentum: variations 1j/7j, volume, ADX (0-100)."""
+    score = 50.0
+    
+    if change_1d > 3 and change_7d > 10:
+        score += 20
+    elif change_1d > 1 and change_7d > 5:
+        score += 10
+    elif change_1d < -3 and change_7d < -10:
+        score -= 20
+    elif change_1d < -1 and change_7d < -5:
+        score -= 10
+    
+    if volume_ratio > 1.5:
+        score += 15 if change_1d > 0 else -15
+    
+    if _given(adx) and adx > 25:
+        score += 10 if change_1d > 0 else -10
+    
+    return _clip100(score)
+
+
+@njit(cache=True)
+def sentiment_kernel(fear_greed: float, regime_bonus: float, news: float, eco_penalty: float) -> float:
+    """Score de sentiment: Fear & Greed, bonus de régime, news, pénalité éco (0-100)."""
+    score = 50.0
+    
+    if _given(fear_greed):
+        if fear_greed < 25:
+            score += 20
+        elif fear_greed < 45:
+            score += 10
+        elif fear_greed > 75:
+            score -= 20
+        elif fear_greed > 55:
+            score -= 10
+    
+    score += regime_bonus
+    
+    if _given(news):
+        if news > 0.3:
+            score += 10
+        elif news < -0.3:
+            score -= 10
+    
+    score -= eco_penalty
+    
+    return _clip100(score)
+
+
+@njit(cache=True)
+def risk_reward_kernel(support: float, resistance: float, price: float, atr_percent: float) -> float:
+    """Score risque/rendement: supports/résistances et ATR (0-100)."""
+    score = 50.0
+    
+    if _given(support) and _given(resistance) and _given(price):
+        downside_risk = (price - support) / price * 100
+        upside_potential = (resistance - price) / price * 100
+        
+        if downside_risk > 0:
+            rr_ratio = upside_potential / downside_risk
+            if rr_ratio > 3:
+                score += 25
+            elif rr_ratio > 2:
+                score += 15
+            elif rr_ratio > 1.5:
+                score += 5
+            elif rr_ratio < 1:
+                score -= 20
+    
+    if _given(atr_percent):
+        if 1 < atr_percent < 3:
+            score += 10
+        elif atr_percent > 5:
+            score -= 15
+    
+    return _clip100(score)
+
+
+@njit(cache=True)
+def confluence_kernel(
+    rsi: float,
+    macd: float,
+    signal: float,
+    price: float,
+    sma_50: float,
+    has_bands: bool,
+    lower: float,
+    upper: float,
+    change_1d: float,
+) -> float:
+    """
+    Bonus de confluence (0-100).
+    
+    Missing macd/signal count as 0; missing lower/upper bands as +inf/0.
+    """
+    bullish = 0
+    bearish = 0
+    
+    if _given(rsi):
+        if rsi < 40:
+            bullish += 1
+        elif rsi > 60:
+            bearish += 1
+    
+    if macd > signal:
+        bullish += 1
+    else:
+        bearish += 1
+    
+    if _given(price) and _given(sma_50):
+        if price > sma_50:
+            bullish += 1
+        else:
+            bearish += 1
+    
+    if has_bands and _given(price):
+        if price < lower:
+            bullish += 1
+        elif price > upper:
+            bearish += 1
+    
+    if change_1d > 0:
+        bullish += 1
+    else:
+        bearish += 1
+    
+    confluence_ratio = max(bullish, bearish) / (bullish + bearish)
+    if confluence_ratio >= 0.8:
+        return 100.0
+    elif confluence_ratio >= 0.6:
+        return 60.0
+    return 20.0
+
+
+def _warm_up() -> None:
+    """Compile every kernel at import so the first scoring call doesn't pay the JIT cost."""
+    nan = math.nan
+    technical_kernel(nan, nan, nan, nan, nan, nan, nan, nan, nan)
+    momentum_kernel(0.0, 0.0, 1.0, nan)
+    sentiment_kernel(nan, 0.0, nan, 0.0)
+    risk_reward_kernel(nan, nan, nan, nan)
+    confluence_kernel(nan, 0.0, 0.0, nan, nan, False, math.inf, 0.0, 0.0)
+
+
+if NUMBA_AVAILABLE:
+    _warm_up()
+    logger.info("scoring_kernels_compiled")
@@ -4,10 +4,12 @@ Implements get_stock_price, buy_stock, sell_stock, etc.
 """
 from typing import Dict, Any, List, Optional
 from datetime import datetime, timedelta
+import asyncio
 import structlog
 from config import get_settings
 from models.database import Trade, TradeAction, TradeStatus, Portfolio
 from database import get_db
+from services.context_awareness import MarketContextAnalyzer
 
 logger = structlog.get_logger()
 settings = get_settings()
@@ -1663,6 +1665,7 @@ class TradingTools:
                 )
                 db.add(trade)
                 db.commit()
+                await asyncio.to_thread(MarketContextAnalyzer.invalidate, self.agent_name)
                 
                 logger.info(
                     "trade_executed",
@@ -1766,6 +1769,7 @@ class TradingTools:
                 )
                 db.add(trade)
                 db.commit()
+                await asyncio.to_thread(MarketContextAnalyzer.invalidate, self.agent_name)
                 
                 logger.info(
                     "trade_executed",
@@ -2117,6 +2121,7 @@ class TradingTools:
                 )
                 db.add(trade)
                 db.commit()
+                await asyncio.to_thread(MarketContextAnalyzer.invalidate, self.agent_name)
                 
                 logger.info(
                     "crypto_trade_executed",
@@ -2224,6 +2229,7 @@ class TradingTools:
                 )
                 db.add(trade)
                 db.commit()
+                await asyncio.to_thread(MarketContextAnalyzer.invalidate, self.agent_name)
                 
                 logger.info(
                     "crypto_trade_executed",
@@ -3440,7 +3446,7 @@ class TradingTools:
     
     async def get_decision_score(self, symbol: str) -> Dict[str, Any]:
         """Get comprehensive multi-factor decision score for a symbol."""
-        from services.decision_engine import MultiFactorScorer
+        from services.decision_engine import get_decision_scorer
         from services.data_collector import get_data_collector
         from services.advanced_indicators import get_advanced_indicators
         
@@ -3478,8 +3484,7 @@ class TradingTools:
             }
             
             # Calculate decision score
-            scorer = MultiFactorScorer()
-            result = scorer.calculate_score(symbol, technical_data, market_context)
+            result = get_decision_scorer().calculate_score(symbol, technical_data, market_context)
             
             logger.info(
                 "decision_score_calculated",
@@ -3525,8 +3530,7 @@ class TradingTools:
             }
             
             # Analyze confluence
-            detector = SignalConfluenceDetector()
-            result = detector.analyze_confluence(technical_data, market_context)
+            result = SignalConfluenceDetector.analyze_confluence(technical_data, market_context)
             
             logger.info(
                 "signal_confluence_analyzed",
@@ -3545,7 +3549,7 @@ class TradingTools:
     
     async def get_success_probability(self, symbol: str, action: str) -> Dict[str, Any]:
         """Calculate Bayesian probability of trade success."""
-        from services.decision_engine import BayesianDecisionTree
+        from services.decision_engine import get_bayesian_tree
         
         symbol = symbol.upper()
         action = action.lower()
@@ -3555,8 +3559,7 @@ class TradingTools:
             market_conditions = await self._get_market_conditions_for_bayesian(symbol)
             
             # Calculate success probability
-            bayesian_tree = BayesianDecisionTree()
-            result = bayesian_tree.calculate_success_probability(
+            result = get_bayesian_tree().calculate_success_probability(
                 self.agent_name,
                 symbol,
                 action,
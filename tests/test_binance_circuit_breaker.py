@@ -0,0 +1,94 @@
+import asyncio
+import os
+import sys
+import time
+
+import pytest
+
+# Add backend to path; settings need their required fields to import the connector
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "backend"))
+for name in ("ALPACA_API_KEY", "ALPACA_API_SECRET", "DATABASE_URL", "SECRET_KEY"):
+    os.environ.setdefault(name, "test")
+
+from services.binance_connector import BinanceConnector
+
+
+class ClientError(Exception):
+    """Exchange rejection, shaped like BinanceAPIException for a 4xx."""
+    
+    def __init__(self):
+        super().__init__("Invalid symbol.")
+        self.status_code = 400
+        self.code = -1121
+
+
+def half_open_connector() -> BinanceConnector:
+    """Connector whose breaker is open and past its reset timeout."""
+    connector = BinanceConnector()
+    breaker = connector._breaker
+    breaker.failures = breaker.failure_threshold
+    breaker.opened_at = time.monotonic() - breaker.reset_timeout - 1
+    return connector
+
+
+def test_half_open_probe_client_error_closes_breaker():
+    connector = half_open_connector()
+    
+    def bad_request():
+        raise ClientError()
+    
+    async def run():
+        with pytest.raises(ClientError):
+            await connector._call(bad_request)
+        return await connector._call(lambda: "pong")
+    
+    assert asyncio.run(run()) == "pong"
+    assert connector._breaker.opened_at is None
+    assert not connector._breaker.trial_in_flight
+
+
+def test_cancelled_half_open_probe_releases_trial():
+    connector = half_open_connector()
+    
+    async def run():
+        probe = asyncio.create_task(connector._call(time.sleep, 0.2))
+        await asyncio.sleep(0.05)
+        probe.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await probe
+        
+        assert not connector._breaker.trial_in_flight
+        return await connector._call(lambda: "pong")
+    
+    assert asyncio.run(run()) == "pong"
+    assert connector._breaker.opened_at is None
+
+
+def test_call_admitted_before_opening_does_not_free_probe_slot():
+    connector = BinanceConnector()
+    breaker = connector._breaker
+    
+    def outage():
+        time.sleep(0.2)
+        raise OSError("connection reset")
+    
+    async def run():
+        old_call = asyncio.create_task(connector._call(outage))
+        await asyncio.sleep(0.05)
+        
+        # Breaker opens and goes half-open while the old call is still running
+        breaker.failures = breaker.failure_threshold
+        breaker.opened_at = time.monotonic() - breaker.reset_timeout - 1
+        probe = asyncio.create_task(connector._call(time.sleep, 0.4))
+        await asyncio.sleep(0.05)
+        
+        with pytest.raises(OSError):
+            await old_call
+        assert breaker.trial_in_flight
+        assert breaker.allow() == (False, False)
+        
+        await probe
+    
+    asyncio.run(run())
+    assert breaker.opened_at is None
+    assert not breaker.trial_in_flight